@@ -0,0 +1,225 @@
+import os
+import subprocess
+import sys
+import time
+
+from engine.markdown_parser import MarkdownParser
+
+PROSE_LINE = "The quick brown fox jumps over the lazy dog, and then it runs away into the forest. " * 12
+MARKUP_LINE = ("Some **bold**, *italic*, ~~struck~~ and `code` text with a [link](https://example.com). " * 6)
+
+def best_of(runs, func):
+    best = float('inf')
+    for _ in range(runs):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def bench_parser(lines=2000, runs=5):
+    parser = MarkdownParser()
+    documents = {
+        'plain prose': (PROSE_LINE + "\n") * lines,
+        'markup heavy': (MARKUP_LINE + "\n") * lines,
+        'lists and quotes': ("- item with **bold**\n1. numbered item\n> quoted *line*\n") * lines,
+    }
+    for name, text in documents.items():
+        elapsed = best_of(runs, lambda: parser.parse(text))
+        print(f"parse {name:18s} {len(text) / 1e6:6.2f} MB  {len(text) / elapsed / 1e6:7.2f} MB/s")
+    text = documents['plain prose']
+    elapsed = best_of(runs, lambda: parser.is_plain(text))
+    print(f"plain detection          {len(text) / 1e6:6.2f} MB  {len(text) / elapsed / 1e6:7.2f} MB/s")
+    from fuzz_parser import SIZES, family_text, growth_exponent, load_cases
+    for family, recorded in load_cases().items():
+        exponent = growth_exponent(parser.parse, family)
+        elapsed = best_of(runs, lambda: parser.parse(family_text(family, SIZES[-1])))
+        print(f"case {family!r:30s} exponent {exponent:4.2f} (recorded {recorded:4.2f})  "
+              f"{elapsed * 1e3:7.2f} ms at {SIZES[-1]} chars")
+
+def bench_documents(megabytes=100):
+    import tempfile
+    import tracemalloc
+    from engine.typer import Typer
+    from engine.backends import CountingBackend
+    from engine.planner import MODE_CHUNKED, CHUNK_LINE
+    line = PROSE_LINE + "\n"
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "large.md")
+        with open(path, "w", encoding="utf-8") as f:
+            for _ in range(megabytes * 1024 * 1024 // len(line)):
+                f.write(line)
+        size = os.path.getsize(path)
+        typer = Typer(backend=CountingBackend(), mode=MODE_CHUNKED, chunk=CHUNK_LINE)
+        tracemalloc.start()
+        started = time.perf_counter()
+        typer.type_document(path, sleep=lambda seconds: None)
+        elapsed = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    print(f"windowed document {size / 1e6:7.1f} MB  peak {peak / 1e6:6.2f} MB  "
+          f"{elapsed:6.1f} s  ({typer.backend.events} events)")
+
+def keystroke_lateness(plan, events):
+    times = [event[2] for event in events]
+    return sorted(abs(times[i] - times[i - 1] - plan.delays[i]) for i in range(1, len(times)))
+
+def gui_load(until):
+    while not until():
+        sum(range(20000))
+
+def bench_isolation(chars=400):
+    import threading
+    from engine.typer import Typer
+    from engine.backends import RecordingBackend
+    from engine.profiles import Profile
+    from engine.worker import ProcessTyper, BACKEND_RECORDING
+    text = (PROSE_LINE * 10)[:chars]
+    profile = Profile("bench", typer={'wpm': 400, 'error_rate': 0.0}, seed=11)
+    reference = Typer(backend=RecordingBackend())
+    reference.apply_profile(profile)
+    plan = reference.plan(text)
+
+    def report(name, lateness):
+        mean = sum(lateness) / len(lateness)
+        p99 = lateness[int(len(lateness) * 0.99)]
+        print(f"{name:26s} mean {mean * 1000:6.2f} ms  p99 {p99 * 1000:6.2f} ms  max {lateness[-1] * 1000:6.2f} ms")
+
+    for loaded in (False, True):
+        typer = Typer(backend=RecordingBackend())
+        typer.apply_profile(profile)
+        thread = threading.Thread(target=typer.execute, args=(typer.plan(text),))
+        thread.start()
+        gui_load(lambda: not thread.is_alive()) if loaded else thread.join()
+        report(f"thread{', GUI load' if loaded else ''}", keystroke_lateness(plan, typer.backend.events))
+
+    worker = ProcessTyper(backend=BACKEND_RECORDING, rate_control=False)
+    try:
+        worker.apply_profile(profile)
+        worker.type_markdown("warm up")
+        thread = threading.Thread(target=worker.type_markdown, args=(text,))
+        thread.start()
+        gui_load(lambda: not thread.is_alive())
+        report("child process, GUI load", keystroke_lateness(plan, worker.events))
+    finally:
+        worker.close()
+
+def bench_plan_cache(lines=2000):
+    import tempfile
+    from engine.typer import Typer
+    from engine.backends import CountingBackend
+    from engine.plancache import PlanCache
+    text = (MARKUP_LINE + "\n") * lines
+    with tempfile.TemporaryDirectory() as directory:
+        typer = Typer(backend=CountingBackend(), seed=1, plan_cache=PlanCache(directory))
+        started = time.perf_counter()
+        plan = typer.plan(text)
+        cold = time.perf_counter() - started
+        warm = best_of(5, lambda: typer.plan(text))
+        size = sum(size for _, size, _ in typer.plan_cache.entries())
+    print(f"plan {len(plan)} ops  planned+stored {cold * 1000:7.1f} ms  "
+          f"mapped from cache {warm * 1000:7.1f} ms  ({size / 1e6:.1f} MB on disk)")
+
+UNICODE_LINE = "Crème brûlée, naïve façade — “smart quotes”, Ωμέγα, Straße, 東京, ½ € … " * 12
+
+def bench_injection(chars=20000, runs=5):
+    from pynput.keyboard import KeyCode
+    from pynput.keyboard._base import Controller
+    from engine.backends import PynputBackend
+
+    class NullController(Controller):
+        def _handle(self, key, is_press):
+            pass
+
+    for name, line in (('ASCII', PROSE_LINE), ('Unicode-heavy', UNICODE_LINE)):
+        text = (line * (chars // len(line) + 1))[:chars]
+        controller = NullController()
+        uncached = best_of(runs, lambda: controller.type(text))
+        backend = PynputBackend(NullController())
+        backend.prepare(set(text))
+        cached = best_of(runs, lambda: backend.type(text))
+        print(f"inject {name:14s} controller.type {uncached / chars * 1e6:6.2f} us/key  "
+              f"cached {cached / chars * 1e6:6.2f} us/key")
+    try:
+        from pynput.keyboard import Controller as PlatformController
+        platform = PlatformController()
+    except Exception:
+        platform = None
+    if not hasattr(platform, '_key_to_keysym'):
+        print("keysym lookup: needs the X11 keyboard backend, skipped")
+        return
+    keys = [KeyCode.from_char(char) for char in (UNICODE_LINE * (chars // len(UNICODE_LINE) + 1))[:chars]]
+    uncached = best_of(runs, lambda: [platform._key_to_keysym(key) for key in keys])
+    backend = PynputBackend(platform)
+    backend.prepare(set(UNICODE_LINE))
+    cached = best_of(runs, lambda: [platform._key_to_keysym(key) for key in keys])
+    print(f"keysym lookup  uncached {uncached / chars * 1e6:6.2f} us/key  cached {cached / chars * 1e6:6.2f} us/key")
+
+def bench_rng(draws=1000000, runs=5):
+    import random
+    from array import array
+    from itertools import chain, repeat
+    from engine.rngpool import PooledRandom
+    rng = PooledRandom(1)
+    block = rng.block
+
+    def list_blocks():
+        draw = rng.random
+        while True:
+            yield [draw() for _ in repeat(None, block)]
+
+    def bit_blocks():
+        while True:
+            words = array('Q', rng.getrandbits(64 * block).to_bytes(8 * block, 'little'))
+            yield [(word >> 11) * 2.0 ** -53 for word in words]
+
+    draws_of = {
+        'uniform random()': random.Random(1).random,
+        'uniform next_uniform': rng.next_uniform,
+        'uniform list pool': chain.from_iterable(list_blocks()).__next__,
+        'uniform getrandbits pool': chain.from_iterable(bit_blocks()).__next__,
+        'normal gauss()': random.Random(1).gauss,
+        'normal next_normal': rng.next_normal,
+        'loop overhead': int,
+    }
+    for name, draw in draws_of.items():
+        elapsed = best_of(runs, lambda: [draw() for _ in repeat(None, draws)])
+        print(f"rng {name:26s} {elapsed / draws * 1e9:6.1f} ns/draw")
+
+STARTUP_MODULE = 'main'
+STARTUP_DEFERRED = ('pynput', 'pyperclip', 'ApplicationServices', 'Quartz',
+                    'engine.typer', 'engine.planner', 'engine.backends', 'engine.rate')
+
+def import_times(module=STARTUP_MODULE):
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    times = {}
+    for line in result.stderr.splitlines():
+        fields = line.split('|')
+        if len(fields) == 3 and fields[1].strip().isdigit():
+            times[fields[2].strip()] = int(fields[1]) / 1e6
+    return times
+
+def bench_startup(runs=5):
+    totals = [import_times() for _ in range(runs)]
+    best = min(totals, key=lambda times: times[STARTUP_MODULE])
+    print(f"time to first window (imports) {best[STARTUP_MODULE] * 1000:7.1f} ms")
+    top = sorted((name for name in best if '.' not in name and name != STARTUP_MODULE),
+                 key=best.get, reverse=True)[:5]
+    for name in top:
+        print(f"  {name:28s} {best[name] * 1000:7.1f} ms")
+
+BENCHMARKS = {
+    'parser': bench_parser,
+    'startup': bench_startup,
+    'documents': bench_documents,
+    'isolation': bench_isolation,
+    'injection': bench_injection,
+    'plancache': bench_plan_cache,
+    'rng': bench_rng,
+}
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        BENCHMARKS[name]()
@@ -1,3 +1,4 @@
+import os
 import platform
 
 IS_MAC = platform.system() == "Darwin"
@@ -22,20 +23,43 @@ COMMON_BIGRAMS = {
     "ra", "ce", "li", "ch", "ll", "be", "ma", "si", "om", "ur"
 }
 
-KEYBOARD_ADJACENT = {
-    'q': ['w', 'a'], 'w': ['q', 'e', 's', 'a'], 'e': ['w', 'r', 'd', 's'],
-    'r': ['e', 't', 'f', 'd'], 't': ['r', 'y', 'g', 'f'], 'y': ['t', 'u', 'h', 'g'],
-    'u': ['y', 'i', 'j', 'h'], 'i': ['u', 'o', 'k', 'j'], 'o': ['i', 'p', 'l', 'k'],
-    'p': ['o', 'l'],
-    'a': ['q', 'w', 's', 'z'], 's': ['a', 'w', 'e', 'd', 'z', 'x'],
-    'd': ['s', 'e', 'r', 'f', 'x', 'c'], 'f': ['d', 'r', 't', 'g', 'c', 'v'],
-    'g': ['f', 't', 'y', 'h', 'v', 'b'], 'h': ['g', 'y', 'u', 'j', 'b', 'n'],
-    'j': ['h', 'u', 'i', 'k', 'n', 'm'], 'k': ['j', 'i', 'o', 'l', 'm'],
-    'l': ['k', 'o', 'p'],
-    'z': ['a', 's', 'x'], 'x': ['z', 's', 'd', 'c'], 'c': ['x', 'd', 'f', 'v'],
-    'v': ['c', 'f', 'g', 'b'], 'b': ['v', 'g', 'h', 'n'], 'n': ['b', 'h', 'j', 'm'],
-    'm': ['n', 'j', 'k']
+KEYBOARD_LAYOUT = "qwerty"
+ERROR_KIND_WEIGHTS = {
+    "adjacent": 0.75,
+    "double": 0.12,
+    "transpose": 0.13
 }
+ERROR_OVERRUN_WEIGHTS = [0.55, 0.25, 0.12, 0.08]
+NOTICE_DELAY_MEDIAN = 0.35
+NOTICE_DELAY_SIGMA = 0.45
+
+CLAUSE_PAUSE_MIN = 0.1
+CLAUSE_PAUSE_MAX = 0.3
+ABBREVIATIONS = {
+    "mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "vs", "no", "fig", "vol", "approx",
+    "jan", "feb", "mar", "apr", "jun", "jul", "aug", "sep", "sept", "oct", "nov", "dec",
+}
+
+CHORD_BATCH_GAP = 0.04
+
+NAVIGATION_KEY_GAP = 0.03
+DOCUMENT_END_KEYS = ("cmd", "down") if IS_MAC else ("ctrl", "end")
+PARAGRAPH_UP_KEYS = ("alt", "up") if IS_MAC else ("ctrl", "up")
+SELECT_ALL_KEYS = (MODIFIER_KEY, "a")
+
+DEFAULT_TARGET = "gdocs"
+
+DEFAULT_CHUNK_UNIT = "word"
+DEFAULT_MAX_EVENTS_PER_SECOND = 400
+
+RATE_TARGET_LATENCY = 0.01
+RATE_TARGET_BACKLOG = 0.1
+RATE_MAX_SLOWDOWN = 8.0
+RATE_EWMA_ALPHA = 0.2
+RATE_BACKOFF = 1.25
+RATE_RECOVERY = 0.97
+RATE_SETTLE_PAUSE = 0.05
+RATE_MAX_SLOWED_GAP = 0.5
 
 WINDOW_WIDTH = 600
 WINDOW_HEIGHT = 500
@@ -44,3 +68,40 @@ OVERLAY_HEIGHT = 120
 
 COUNTDOWN_SECONDS = 3
 
+KEYLOG_CHUNK_RECORDS = 65536
+TRAIN_PAUSE_THRESHOLD = 0.75
+TRAIN_IDLE_THRESHOLD = 30.0
+TRAIN_MIN_BIGRAM_COUNT = 20
+TRAIN_SENTENCE_CHARS = 80
+
+PROFILES_PATH = os.path.expanduser("~/.texttyper/profiles.json")
+DEFAULT_PROFILE_NAME = "default"
+
+DAEMON_SOCKET_PATH = os.path.expanduser("~/.texttyper/daemon.sock")
+DAEMON_TCP_HOST = "127.0.0.1"
+DAEMON_TCP_PORT = 47615
+DAEMON_MAX_REQUEST_BYTES = 16 * 1024 * 1024
+DAEMON_MAX_FINISHED_JOBS = 100
+DAEMON_TOKEN_PATH = os.path.expanduser("~/.texttyper/daemon.token")
+
+DOCUMENT_WINDOW_CHARS = 64 * 1024
+
+PAUSE_GC_WHILE_TYPING = True
+GC_RELEASE_DELAY = 0.5
+GC_REARM_MARGIN = 0.1
+
+CALIBRATION_PATH = os.path.expanduser("~/.texttyper/calibration.json")
+CALIBRATION_MAX_AGE = 7 * 24 * 3600
+CALIBRATION_SAMPLES = 40
+CALIBRATION_REQUESTS = (0.001, 0.004, 0.012)
+SPIN_MAX_THRESHOLD = 0.002
+
+RNG_POOL_BLOCK = 4096
+
+METRICS_HOST = "127.0.0.1"
+METRICS_PORT = 9464
+METRICS_FILE_INTERVAL = 5.0
+LATENESS_BUCKETS = (0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.25, 1.0)
+
+PLAN_CACHE_PATH = os.path.expanduser("~/.texttyper/plans")
+PLAN_CACHE_MAX_BYTES = 256 * 1024 * 1024
@@ -1,4 +1,14 @@
-from .typer import Typer
-from .markdown_parser import MarkdownParser
-from .timing import TimingEngine
+from importlib import import_module
 
+_EXPORTS = {
+    'Typer': '.typer',
+    'MarkdownParser': '.markdown_parser',
+    'TimingEngine': '.timing',
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(_EXPORTS[name], __name__), name)
@@ -0,0 +1,153 @@
+import time
+
+class PynputBackend:
+    def __init__(self, controller=None):
+        from pynput.keyboard import Key, KeyCode, Controller
+        self._keys = Key
+        self._key_code = KeyCode
+        self.controller = controller if controller is not None else Controller()
+        self._handle = self.controller._handle
+        self._chars = {'\n': Key.enter.value, '\r': Key.enter.value, '\t': Key.tab.value}
+        self._keysyms = {}
+        self._key_to_keysym = getattr(self.controller, '_key_to_keysym', None)
+        if self._key_to_keysym is not None:
+            self.controller._key_to_keysym = self._cached_keysym
+
+    def _cached_keysym(self, key):
+        if key.vk is not None:
+            return key.vk
+        try:
+            return self._keysyms[key.char]
+        except KeyError:
+            keysym = self._keysyms[key.char] = self._key_to_keysym(key)
+            return keysym
+
+    def _resolve(self, key):
+        return getattr(self._keys, key) if len(key) > 1 else key
+
+    def _resolve_char(self, char):
+        key = self._chars[char] = self._key_code.from_char(char)
+        return key
+
+    def prepare(self, chars):
+        for char in chars:
+            if char not in self._chars:
+                self._resolve_char(char)
+            if self._key_to_keysym is not None:
+                self._cached_keysym(self._chars[char])
+
+    def type(self, text):
+        if getattr(self.controller, '_dead_key', None) is not None:
+            self.controller.type(text)
+            return
+        chars, handle = self._chars, self._handle
+        for index, char in enumerate(text):
+            key = chars.get(char) or self._resolve_char(char)
+            try:
+                handle(key, True)
+                handle(key, False)
+            except self.controller.InvalidKeyException:
+                raise self.controller.InvalidCharacterException(index, char)
+
+    def tap(self, key):
+        resolved = self._resolve(key)
+        self.controller.press(resolved)
+        self.controller.release(resolved)
+
+    def chord(self, keys):
+        resolved = [self._resolve(key) for key in keys]
+        for key in resolved:
+            self.controller.press(key)
+        for key in reversed(resolved):
+            self.controller.release(key)
+
+class RecordingBackend:
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.events = []
+        self._buffer = []
+
+    @property
+    def text(self):
+        return ''.join(self._buffer)
+
+    def type(self, text):
+        self.events.append(('type', text, self.clock()))
+        self._buffer.extend(text)
+
+    def tap(self, key):
+        self.events.append(('tap', key, self.clock()))
+        if key == 'backspace':
+            if self._buffer:
+                self._buffer.pop()
+        elif key == 'enter':
+            self._buffer.append('\n')
+
+    def chord(self, keys):
+        self.events.append(('chord', tuple(keys), self.clock()))
+
+class CountingBackend:
+    def __init__(self):
+        self.events = 0
+
+    def type(self, text):
+        self.events += 1
+
+    def tap(self, key):
+        self.events += 1
+
+    def chord(self, keys):
+        self.events += 1
+
+class VirtualClock:
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            self.now += seconds
+
+class SlowConsumerBackend(RecordingBackend):
+    def __init__(self, service_rate=200.0, capacity=20, clock=time.perf_counter, sleep=time.sleep):
+        super().__init__(clock)
+        self.service_rate = service_rate
+        self.capacity = capacity
+        self.sleep = sleep
+        self.depth = 0.0
+        self.misplaced_chords = 0
+        self._drained_at = clock()
+
+    def _drain(self):
+        now = self.clock()
+        self.depth = max(0.0, self.depth - (now - self._drained_at) * self.service_rate)
+        self._drained_at = now
+
+    def _submit(self, events):
+        self._drain()
+        overflow = self.depth + events - self.capacity
+        if overflow > 0:
+            self.sleep(overflow / self.service_rate)
+            self._drain()
+        self.depth += events
+
+    def backlog_seconds(self):
+        self._drain()
+        return self.depth / self.service_rate
+
+    def type(self, text):
+        self._submit(len(text))
+        super().type(text)
+
+    def tap(self, key):
+        self._submit(1)
+        super().tap(key)
+
+    def chord(self, keys):
+        self._drain()
+        if self.depth >= 1:
+            self.misplaced_chords += 1
+        self._submit(len(keys))
+        super().chord(keys)
@@ -0,0 +1,97 @@
+import re
+
+from config import ABBREVIATIONS
+from engine.markdown_parser import InstructionType
+
+BOUNDARY_CLAUSE = 1
+BOUNDARY_SENTENCE = 2
+BOUNDARY_PARAGRAPH = 3
+
+TOKEN_PATTERN = re.compile(r'\n(?:[^\S\n]*\n)*|[^\S\n]+|\S+')
+TAIL_PATTERN = re.compile(r'(?:\n[^\S\n]*)+\Z|\S+\Z')
+OPENERS = '"\'([{«“‘*_`'
+CLOSERS = '"\')]}»”’*_`'
+SENTENCE_ENDERS = '!?'
+CLAUSE_ENDERS = ',;:'
+ELLIPSIS = '…'
+
+def _is_abbreviation(word):
+    core = word.rstrip('.')
+    if core.lower() in ABBREVIATIONS:
+        return True
+    parts = core.split('.')
+    return (len(parts) > 1 or len(core) == 1) and all(part.isalpha() and len(part) <= 2 for part in parts)
+
+class BoundaryIndex:
+    def __init__(self):
+        self.offset = 0
+        self.settled = 0
+        self._carry = ''
+        self._unsettled = {}
+        self._pending = None
+        self._last_word = None
+        self._started = False
+
+    def feed(self, text, final=True):
+        start = self.offset - len(self._carry)
+        text = self._carry + text
+        self.offset = start + len(text)
+        tail = None if final else TAIL_PATTERN.search(text)
+        cut = tail.start() if tail else len(text)
+        boundaries = self._unsettled
+        pending = self._pending
+        last_word = self._last_word
+        for match in TOKEN_PATTERN.finditer(text, 0, cut):
+            token = match.group()
+            if token[0] == '\n':
+                end = start + match.start() + token.rindex('\n')
+                if token.count('\n') > 1:
+                    if self._started:
+                        boundaries.pop(last_word, None)
+                        boundaries[end] = BOUNDARY_PARAGRAPH
+                elif pending is not None:
+                    boundaries[pending[0]] = pending[1]
+                elif last_word is not None and last_word not in boundaries:
+                    boundaries[end] = BOUNDARY_CLAUSE
+                pending = last_word = None
+                continue
+            if token[0].isspace():
+                continue
+            self._started = True
+            word = token.lstrip(OPENERS)
+            if pending is not None:
+                kind = pending[2] if word[:1].islower() else pending[1]
+                if kind:
+                    boundaries[pending[0]] = kind
+                pending = None
+            last_word = start + match.end() - 1
+            word = word.rstrip(CLOSERS)
+            if not word:
+                continue
+            if word[-1] in SENTENCE_ENDERS:
+                boundaries[last_word] = BOUNDARY_SENTENCE
+            elif word[-1] in CLAUSE_ENDERS:
+                boundaries[last_word] = BOUNDARY_CLAUSE
+            elif word[-1] == ELLIPSIS or word.endswith('..'):
+                pending = (last_word, BOUNDARY_SENTENCE, BOUNDARY_CLAUSE)
+            elif word[-1] == '.' and not _is_abbreviation(word):
+                pending = (last_word, BOUNDARY_SENTENCE, None)
+        if final and pending is not None:
+            boundaries[pending[0]] = pending[1]
+            pending = None
+        self.settled = start + cut
+        if not final and last_word is not None and (pending is not None or not text[cut:cut + 1].strip()):
+            self.settled = min(self.settled, last_word)
+        self._carry = text[cut:]
+        self._unsettled = {offset: kind for offset, kind in boundaries.items() if offset >= self.settled}
+        self._pending = pending
+        self._last_word = last_word
+        return boundaries
+
+def boundary_index(text):
+    return BoundaryIndex().feed(text)
+
+def instruction_text(instructions):
+    return ''.join(instruction.content if instruction.type == InstructionType.TEXT else '\n'
+                   for instruction in instructions
+                   if instruction.type in (InstructionType.TEXT, InstructionType.NEWLINE))
@@ -0,0 +1,77 @@
+import json
+import os
+import platform
+import time
+
+from config import (
+    CALIBRATION_PATH, CALIBRATION_MAX_AGE, CALIBRATION_SAMPLES,
+    CALIBRATION_REQUESTS, SPIN_MAX_THRESHOLD
+)
+
+CALIBRATION_FORMAT = 1
+
+def machine_id():
+    return "|".join((platform.node(), platform.platform(),
+                     platform.python_implementation(), platform.python_version()))
+
+def _quantile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+def measure_sleep(samples=CALIBRATION_SAMPLES, requests=CALIBRATION_REQUESTS,
+                  sleep=time.sleep, clock=time.perf_counter):
+    overshoots = []
+    shortest = float('inf')
+    for _ in range(samples):
+        for requested in requests:
+            started = clock()
+            sleep(requested)
+            elapsed = clock() - started
+            overshoots.append(max(0.0, elapsed - requested))
+            shortest = min(shortest, elapsed)
+    return {
+        'format': CALIBRATION_FORMAT,
+        'machine': machine_id(),
+        'measured_at': time.time(),
+        'overshoot_median': _quantile(overshoots, 0.5),
+        'overshoot_p95': _quantile(overshoots, 0.95),
+        'granularity': shortest,
+    }
+
+def is_stale(calibration, max_age=CALIBRATION_MAX_AGE, now=None):
+    now = time.time() if now is None else now
+    return (calibration.get('format') != CALIBRATION_FORMAT
+            or calibration.get('machine') != machine_id()
+            or not 0 <= now - calibration.get('measured_at', 0) <= max_age)
+
+def load_calibration(path=CALIBRATION_PATH, max_age=CALIBRATION_MAX_AGE, measure=measure_sleep):
+    try:
+        with open(path) as f:
+            calibration = json.load(f)
+        if not is_stale(calibration, max_age):
+            return calibration
+    except (FileNotFoundError, ValueError):
+        pass
+    calibration = measure()
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(calibration, f, indent=1)
+    os.replace(tmp_path, path)
+    return calibration
+
+class PreciseSleeper:
+    def __init__(self, calibration, sleep=time.sleep, clock=time.perf_counter, max_spin=SPIN_MAX_THRESHOLD):
+        self.sleep = sleep
+        self.clock = clock
+        self.spin_threshold = min(calibration['overshoot_p95'], max_spin)
+        self.expected_overshoot = max(0.0, calibration['overshoot_median'] - self.spin_threshold)
+
+    def __call__(self, seconds):
+        deadline = self.clock() + seconds
+        if seconds > self.spin_threshold:
+            self.sleep(seconds - self.spin_threshold)
+        while self.clock() < deadline:
+            pass
@@ -0,0 +1,311 @@
+import asyncio
+import hmac
+import itertools
+import json
+import os
+import secrets
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from config import (
+    DAEMON_SOCKET_PATH, DAEMON_TCP_HOST, DAEMON_TCP_PORT, DAEMON_MAX_REQUEST_BYTES, DAEMON_MAX_FINISHED_JOBS,
+    DAEMON_TOKEN_PATH
+)
+from engine.profiles import Profile, ProfileStore
+from engine.documents import open_document
+from engine.layouts import LAYOUT_ROWS
+from engine.planner import MODE_HUMAN, MODE_CHUNKED, CHUNK_WORD, CHUNK_LINE
+from engine.targets import TARGETS
+
+STATE_QUEUED = "queued"
+STATE_TYPING = "typing"
+STATE_PAUSED = "paused"
+STATE_DONE = "done"
+STATE_CANCELLED = "cancelled"
+STATE_FAILED = "failed"
+
+FINISHED_STATES = (STATE_DONE, STATE_CANCELLED, STATE_FAILED)
+
+SETTING_RANGES = {
+    'wpm': (1, 1000),
+    'error_rate': (0.0, 1.0),
+    'burst_min': (1, 1000),
+    'burst_max': (1, 1000),
+    'think_pause_min': (0.0, 60.0),
+    'think_pause_max': (0.0, 60.0),
+    'chunk_jitter': (0.0, 10.0),
+    'max_events_per_second': (1, 100000),
+}
+INTEGER_SETTINGS = ('burst_min', 'burst_max')
+SETTING_CHOICES = {
+    'layout': tuple(LAYOUT_ROWS),
+    'target': tuple(TARGETS),
+    'mode': (MODE_HUMAN, MODE_CHUNKED),
+    'chunk': (CHUNK_WORD, CHUNK_LINE),
+}
+
+def _is_number(value, integer=False):
+    return isinstance(value, int if integer else (int, float)) and not isinstance(value, bool)
+
+def validate_settings(settings):
+    if not isinstance(settings, dict):
+        raise DaemonError("'settings' must be an object")
+    for key, value in settings.items():
+        if key in SETTING_CHOICES:
+            if value not in SETTING_CHOICES[key]:
+                raise DaemonError(f"{key} must be one of {', '.join(SETTING_CHOICES[key])}")
+        elif key in SETTING_RANGES:
+            low, high = SETTING_RANGES[key]
+            if not _is_number(value, key in INTEGER_SETTINGS) or not low <= value <= high:
+                raise DaemonError(f"{key} must be a number from {low} to {high}")
+        else:
+            raise DaemonError(f"unknown setting: {key}")
+    for low, high in (('burst_min', 'burst_max'), ('think_pause_min', 'think_pause_max')):
+        if settings.get(low, 0) > settings.get(high, settings.get(low, 0)):
+            raise DaemonError(f"{low} must not exceed {high}")
+    return settings
+
+@dataclass
+class Job:
+    id: int
+    text: Optional[str]
+    path: Optional[str] = None
+    settings: dict = field(default_factory=dict)
+    profile: Optional[str] = None
+    seed: Optional[int] = None
+    previous: Optional[str] = None
+    state: str = STATE_QUEUED
+    current: int = 0
+    total: int = 0
+    error: Optional[str] = None
+
+    def status(self):
+        status = {'job': self.id, 'state': self.state, 'current': self.current, 'total': self.total}
+        if self.error:
+            status['error'] = self.error
+        return status
+
+class DaemonError(Exception):
+    pass
+
+class TypingDaemon:
+    def __init__(self, typer, profiles: Optional[ProfileStore] = None, sleep=None):
+        self.typer = typer
+        self.profiles = profiles if profiles is not None else ProfileStore()
+        self.sleep = sleep
+        self.jobs: Dict[int, Job] = {}
+        self.running: Optional[Job] = None
+        self._ids = itertools.count(1)
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker = None
+        self._token: Optional[str] = None
+
+    def _profile_for(self, job):
+        base = self.profiles.get(job.profile) if job.profile else self.profiles.active()
+        seed = job.seed if job.seed is not None else base.seed
+        return Profile(name=f"job-{job.id}", typer=dict(base.typer, **job.settings), timing=base.timing, seed=seed)
+
+    def _type(self, job):
+        def on_progress(current, total):
+            job.current = current
+
+        self.typer.apply_profile(self._profile_for(job))
+        self.typer.on_progress = on_progress
+        self.typer.on_complete = None
+        if job.previous is not None:
+            plan = self.typer.plan_revision(job.previous, job.text)
+            job.total = plan.total_chars
+            return self.typer.execute(plan, sleep=self.sleep)
+        if job.path is None:
+            return self.typer.execute(self.typer.plan(job.text), sleep=self.sleep)
+        with open_document(job.path) as document:
+            job.total = document.count_chars(self.typer.parser)
+            plans = self.typer.plan_windows(document.windows())
+            return self.typer.execute_windows(plans, job.total, sleep=self.sleep)
+
+    async def _work(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self._queue.get()
+            self._update_queue_depth()
+            if job.state != STATE_QUEUED:
+                continue
+            self.typer.reset_controls()
+            job.state = STATE_TYPING
+            self.running = job
+            try:
+                completed = await loop.run_in_executor(None, self._type, job)
+                job.state = STATE_DONE if completed else STATE_CANCELLED
+            except Exception as e:
+                job.state = STATE_FAILED
+                job.error = str(e)
+            finally:
+                self.running = None
+                self._finish(job)
+
+    def _finish(self, job):
+        job.text = job.previous = None
+        finished = [job_id for job_id, job in self.jobs.items() if job.state in FINISHED_STATES]
+        for job_id in finished[:max(0, len(finished) - DAEMON_MAX_FINISHED_JOBS)]:
+            del self.jobs[job_id]
+
+    def _update_queue_depth(self):
+        if self.typer.metrics is not None:
+            self.typer.metrics.queue_depth = self._queue.qsize()
+
+    def _job(self, request):
+        job_id = request.get('job')
+        if not isinstance(job_id, int) or isinstance(job_id, bool):
+            raise DaemonError(f"job must be an integer id: {job_id!r}")
+        job = self.jobs.get(job_id)
+        if job is None:
+            raise DaemonError(f"unknown job: {request.get('job')}")
+        return job
+
+    async def submit(self, request):
+        text, path = request.get('text'), request.get('path')
+        if not isinstance(text, str) and not isinstance(path, str):
+            raise DaemonError("submit needs a 'text' or 'path' string")
+        if path is not None and not os.path.isfile(path):
+            raise DaemonError(f"no such file: {path}")
+        previous = request.get('previous')
+        if previous is not None and (path is not None or not isinstance(previous, str)):
+            raise DaemonError("'previous' must be a string and needs a 'text' job")
+        settings = validate_settings(request.get('settings') or {})
+        profile, seed = request.get('profile'), request.get('seed')
+        if profile is not None and not isinstance(profile, str):
+            raise DaemonError("'profile' must be a string")
+        if seed is not None and not _is_number(seed, integer=True):
+            raise DaemonError("'seed' must be an integer")
+        total = 0
+        if path is None:
+            loop = asyncio.get_running_loop()
+            total = await loop.run_in_executor(None, self.typer.parser.get_plain_text_length, text)
+        job = Job(next(self._ids), text if path is None else None, path, settings, profile, seed, previous,
+                  total=total)
+        self.jobs[job.id] = job
+        self._queue.put_nowait(job)
+        self._update_queue_depth()
+        return job.status()
+
+    def status(self, request):
+        if 'job' not in request:
+            return {'jobs': [job.status() for job in self.jobs.values()]}
+        return self._job(request).status()
+
+    def pause(self, request):
+        job = self._job(request)
+        if job is self.running and job.state == STATE_TYPING:
+            self.typer.pause()
+            job.state = STATE_PAUSED
+        elif job.state != STATE_PAUSED:
+            raise DaemonError(f"job {job.id} is {job.state}")
+        return job.status()
+
+    def resume(self, request):
+        job = self._job(request)
+        if job.state != STATE_PAUSED:
+            raise DaemonError(f"job {job.id} is {job.state}")
+        job.state = STATE_TYPING
+        self.typer.resume()
+        return job.status()
+
+    def cancel(self, request):
+        job = self._job(request)
+        if job is self.running:
+            self.typer.cancel()
+        elif job.state == STATE_QUEUED:
+            job.state = STATE_CANCELLED
+            self._finish(job)
+        return job.status()
+
+    COMMANDS = ('submit', 'status', 'pause', 'resume', 'cancel')
+
+    async def handle(self, request):
+        command = request.get('cmd') if isinstance(request, dict) else None
+        if self._token is not None:
+            token = request.get('token') if isinstance(request, dict) else None
+            if not isinstance(token, str) or not hmac.compare_digest(token.encode(), self._token.encode()):
+                raise DaemonError("missing or wrong token")
+        if command not in self.COMMANDS:
+            raise DaemonError(f"unknown command: {command}")
+        if command == 'submit':
+            return await self.submit(request)
+        return getattr(self, command)(request)
+
+    async def _serve_client(self, reader, writer):
+        try:
+            async for line in reader:
+                if not line.strip():
+                    continue
+                try:
+                    reply = dict(await self.handle(json.loads(line)), ok=True)
+                except (DaemonError, ValueError, TypeError) as e:
+                    reply = {'ok': False, 'error': str(e)}
+                writer.write(json.dumps(reply).encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, path=DAEMON_SOCKET_PATH, host=DAEMON_TCP_HOST, port=DAEMON_TCP_PORT,
+                    token_path=DAEMON_TOKEN_PATH):
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.ensure_future(self._work())
+        if hasattr(asyncio, 'start_unix_server') and path:
+            _private_directory(path)
+            if os.path.exists(path):
+                os.unlink(path)
+            server = await asyncio.start_unix_server(self._serve_client, path, limit=DAEMON_MAX_REQUEST_BYTES)
+            os.chmod(path, 0o600)
+            return server
+        self._token = write_token(token_path)
+        return await asyncio.start_server(self._serve_client, host, port, limit=DAEMON_MAX_REQUEST_BYTES)
+
+    async def stop(self):
+        if self.running:
+            self.typer.cancel()
+        if self._worker:
+            self._worker.cancel()
+
+    async def serve_forever(self, path=DAEMON_SOCKET_PATH):
+        server = await self.start(path)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.stop()
+
+def _private_directory(path):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+
+def write_token(path):
+    token = secrets.token_hex(16)
+    _private_directory(path)
+    if os.path.exists(path):
+        os.unlink(path)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "w") as f:
+        f.write(token)
+    return token
+
+def read_token(path=DAEMON_TOKEN_PATH):
+    with open(path) as f:
+        return f.read().strip()
+
+async def send_request(socket_path=DAEMON_SOCKET_PATH, port=DAEMON_TCP_PORT, token_path=DAEMON_TOKEN_PATH,
+                       **request):
+    if hasattr(asyncio, 'open_unix_connection') and socket_path:
+        reader, writer = await asyncio.open_unix_connection(socket_path, limit=DAEMON_MAX_REQUEST_BYTES)
+    else:
+        request['token'] = read_token(token_path)
+        reader, writer = await asyncio.open_connection(DAEMON_TCP_HOST, port, limit=DAEMON_MAX_REQUEST_BYTES)
+    try:
+        writer.write(json.dumps(request).encode() + b"\n")
+        await writer.drain()
+        return json.loads(await reader.readline())
+    finally:
+        writer.close()
@@ -0,0 +1,106 @@
+import mmap
+import os
+
+from config import DOCUMENT_WINDOW_CHARS
+
+def iter_windows(stream, window_chars=DOCUMENT_WINDOW_CHARS):
+    lines = []
+    size = 0
+    for line in stream:
+        lines.append(line)
+        size += len(line)
+        if size >= window_chars:
+            yield ''.join(lines)
+            lines = []
+            size = 0
+    if lines:
+        yield ''.join(lines)
+
+def count_document_chars(stream, parser, window_chars=DOCUMENT_WINDOW_CHARS):
+    if not stream.seekable():
+        return 0
+    start = stream.tell()
+    total = sum(parser.get_plain_text_length(window) for window in iter_windows(stream, window_chars))
+    stream.seek(start)
+    return total
+
+def _normalise_newlines(text):
+    if '\r' in text:
+        return text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+class Document:
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class StreamDocument(Document):
+    def __init__(self, stream, owned=False):
+        self.stream = stream
+        self.owned = owned
+
+    def windows(self, window_chars=DOCUMENT_WINDOW_CHARS):
+        return iter_windows(self.stream, window_chars)
+
+    def count_chars(self, parser, window_chars=DOCUMENT_WINDOW_CHARS):
+        return count_document_chars(self.stream, parser, window_chars)
+
+    def close(self):
+        if self.owned:
+            self.stream.close()
+
+class MappedDocument(Document):
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        self.buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _window_end(self, start, window_bytes):
+        buffer = self.buffer
+        size = len(buffer)
+        if start + window_bytes >= size:
+            return size
+        position = start + window_bytes - 1
+        limit = min(start + 2 * window_bytes, size)
+        ends = [end for end in (buffer.find(b'\n', position, limit), buffer.find(b'\r', position, limit)) if end >= 0]
+        if ends:
+            end = min(ends) + 1
+            return end + 1 if buffer[end - 1:end + 1] == b'\r\n' else end
+        if limit == size:
+            return size
+        end = limit
+        while end > start + 1 and buffer[end] & 0xC0 == 0x80:
+            end -= 1
+        return end
+
+    def line_windows(self, window_bytes=DOCUMENT_WINDOW_CHARS):
+        size = len(self.buffer)
+        start = 0
+        while start < size:
+            end = self._window_end(start, window_bytes)
+            yield start, end
+            start = end
+
+    def windows(self, window_chars=DOCUMENT_WINDOW_CHARS):
+        for start, end in self.line_windows(window_chars):
+            with memoryview(self.buffer)[start:end] as window:
+                text = str(window, 'utf-8')
+            yield _normalise_newlines(text)
+
+    def count_chars(self, parser, window_chars=DOCUMENT_WINDOW_CHARS):
+        return sum(parser.get_plain_text_length(window) for window in self.windows(window_chars))
+
+    def close(self):
+        self.buffer.close()
+        self._file.close()
+
+def open_document(source):
+    if isinstance(source, (str, os.PathLike)):
+        if os.path.getsize(source):
+            return MappedDocument(source)
+        return StreamDocument(open(source, encoding="utf-8"), owned=True)
+    return StreamDocument(source)
@@ -0,0 +1,140 @@
+import math
+from typing import Dict, List, Sequence
+
+from config import ERROR_KIND_WEIGHTS
+
+ERROR_ADJACENT = "adjacent"
+ERROR_DOUBLE = "double"
+ERROR_TRANSPOSE = "transpose"
+
+LAYOUT_ROWS = {
+    "qwerty": (
+        ("`1234567890-=", "~!@#$%^&*()_+"),
+        ("qwertyuiop[]\\", "QWERTYUIOP{}|"),
+        ("asdfghjkl;'", 'ASDFGHJKL:"'),
+        ("zxcvbnm,./", "ZXCVBNM<>?"),
+    ),
+    "azerty": (
+        ("²&é\"'(-è_çà)=", "²1234567890°+"),
+        ("azertyuiop^$", "AZERTYUIOP¨£"),
+        ("qsdfghjklmù*", "QSDFGHJKLM%µ"),
+        ("<wxcvbn,;:!", ">WXCVBN?./§"),
+    ),
+    "dvorak": (
+        ("`1234567890[]", "~!@#$%^&*(){}"),
+        ("',.pyfgcrl/=\\", "\"<>PYFGCRL?+|"),
+        ("aoeuidhtns-", "AOEUIDHTNS_"),
+        (";qjkxbmwvz", ":QJKXBMWVZ"),
+    ),
+}
+
+ROW_OFFSETS = {
+    "qwerty": (0.0, 0.5, 0.75, 1.25),
+    "azerty": (0.0, 0.5, 0.75, 0.25),
+    "dvorak": (0.0, 0.5, 0.75, 1.25),
+}
+
+NEIGHBOUR_RADIUS = 1.3
+
+class AliasTable:
+    def __init__(self, items: Sequence, weights: Sequence[float]):
+        count = len(items)
+        total = float(sum(weights))
+        scaled = [w * count / total for w in weights]
+        self.items = list(items)
+        self.prob = [1.0] * count
+        self.alias = list(range(count))
+        small = [i for i, w in enumerate(scaled) if w < 1.0]
+        large = [i for i, w in enumerate(scaled) if w >= 1.0]
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            if scaled[l] < 1.0:
+                small.append(l)
+            else:
+                large.append(l)
+
+    def sample(self, u: float):
+        position = u * len(self.items)
+        index = int(position)
+        if position - index < self.prob[index]:
+            return self.items[index]
+        return self.items[self.alias[index]]
+
+class KeyboardLayout:
+    def __init__(self, name, rows, offsets):
+        self.name = name
+        self.positions: Dict[str, tuple] = {}
+        self._shifted: Dict[str, bool] = {}
+        plain_keys = []
+        for row_index, (plain, shifted) in enumerate(rows):
+            for col, (low, high) in enumerate(zip(plain, shifted)):
+                position = (col + offsets[row_index], float(row_index))
+                plain_keys.append((low, high, position))
+                self.positions.setdefault(low, position)
+                self.positions.setdefault(high, position)
+                self._shifted.setdefault(low, False)
+                self._shifted.setdefault(high, low != high)
+        self.neighbours: Dict[str, List[tuple]] = {}
+        for low, high, position in plain_keys:
+            plain_weights = []
+            shifted_weights = []
+            for other_low, other_high, other_position in plain_keys:
+                distance = math.dist(position, other_position)
+                if 0 < distance <= NEIGHBOUR_RADIUS:
+                    weight = 1.0 / (distance * distance)
+                    plain_weights.append((other_low, weight))
+                    shifted_weights.append((other_high, weight))
+            self.neighbours.setdefault(low, plain_weights)
+            self.neighbours.setdefault(high, shifted_weights)
+        self.adjacent_tables = {
+            char: AliasTable([n for n, _ in neighbours], [w for _, w in neighbours])
+            for char, neighbours in self.neighbours.items() if neighbours
+        }
+        self.error_tables = {char: self._build_error_table(char) for char in self.adjacent_tables}
+
+    def _build_error_table(self, char) -> AliasTable:
+        neighbours = self.neighbours[char]
+        adjacent_total = sum(weight for _, weight in neighbours)
+        items = []
+        weights = []
+        for neighbour, weight in neighbours:
+            items.append((ERROR_ADJACENT, neighbour))
+            weights.append(ERROR_KIND_WEIGHTS[ERROR_ADJACENT] * weight / adjacent_total)
+        items.append((ERROR_DOUBLE, char))
+        weights.append(ERROR_KIND_WEIGHTS[ERROR_DOUBLE])
+        items.append((ERROR_TRANSPOSE, ''))
+        weights.append(ERROR_KIND_WEIGHTS[ERROR_TRANSPOSE])
+        return AliasTable(items, weights)
+
+    def __contains__(self, char):
+        return char in self.error_tables
+
+    def is_shifted(self, char):
+        return self._shifted.get(char, False)
+
+    def sample_error(self, char, u: float):
+        table = self.error_tables.get(char)
+        if table is None:
+            return None
+        return table.sample(u)
+
+    def adjacent_key(self, char, u: float):
+        table = self.adjacent_tables.get(char)
+        if table is None:
+            return char
+        return table.sample(u)
+
+_layouts: Dict[str, KeyboardLayout] = {}
+
+def get_layout(name) -> KeyboardLayout:
+    layout = _layouts.get(name)
+    if layout is None:
+        if name not in LAYOUT_ROWS:
+            raise ValueError(f"Unknown keyboard layout: {name}")
+        layout = KeyboardLayout(name, LAYOUT_ROWS[name], ROW_OFFSETS[name])
+        _layouts[name] = layout
+    return layout
@@ -12,6 +12,38 @@ class InstructionType(Enum):
     HEADING_START = "heading_start"
     HEADING_END = "heading_end"
     NEWLINE = "newline"
+    STRIKE_START = "strike_start"
+    STRIKE_END = "strike_end"
+    CODE_START = "code_start"
+    CODE_END = "code_end"
+    LINK_START = "link_start"
+    LINK_END = "link_end"
+    LIST_ITEM_START = "list_item_start"
+    LIST_ITEM_END = "list_item_end"
+    QUOTE_START = "quote_start"
+    QUOTE_END = "quote_end"
+
+LIST_BULLET = "bullet"
+LIST_NUMBERED = "numbered"
+
+SPAN_INSTRUCTIONS = {
+    'bold': (InstructionType.BOLD_START, InstructionType.BOLD_END),
+    'italic': (InstructionType.ITALIC_START, InstructionType.ITALIC_END),
+    'strike': (InstructionType.STRIKE_START, InstructionType.STRIKE_END),
+}
+
+INLINE_GROUPS = {
+    'code': 'code',
+    'link_url': 'link',
+    'bold': 'bold',
+    'bold_alt': 'bold',
+    'strike': 'strike',
+    'italic': 'italic',
+    'italic_alt': 'italic',
+}
+
+INLINE_MARKERS = '*_~`['
+BLOCK_MARKUP_PATTERN = re.compile(r'^[^\S\n]*(?:[#>]|[-+][^\S\n]|\d+[.)][^\S\n])', re.MULTILINE)
 
 @dataclass
 class TypingInstruction:
@@ -24,6 +56,22 @@ class MarkdownParser:
         self.bold_pattern = re.compile(r'\*\*(.+?)\*\*|__(.+?)__')
         self.italic_pattern = re.compile(r'(?<!\*)\*(?!\*)(.+?)(?<!\*)\*(?!\*)|(?<!_)_(?!_)(.+?)(?<!_)_(?!_)')
         self.heading_pattern = re.compile(r'^(#{1,3})\s+(.+)$', re.MULTILINE)
+        self.quote_pattern = re.compile(r'(?:>\s?)+')
+        self.list_pattern = re.compile(r'^\s*(?:([-*+])|\d+[.)])\s+(.+)$')
+        self.inline_pattern = re.compile(
+            r'`(?P<code>[^`\n]+)`|'
+            r'\[(?P<link_text>[^\[\]\n]+)\]\((?P<link_url>[^)\s\[]+)\)|'
+            r'\*\*(?P<bold>.+?)\*\*|__(?P<bold_alt>.+?)__|'
+            r'~~(?P<strike>.+?)~~|'
+            r'(?<!\*)\*(?!\*)(?P<italic>.+?)(?<!\*)\*(?!\*)|'
+            r'(?<!_)_(?!_)(?P<italic_alt>.+?)(?<!_)_(?!_)'
+        )
+
+    def is_plain(self, markdown_text: str) -> bool:
+        for marker in INLINE_MARKERS:
+            if marker in markdown_text:
+                return False
+        return BLOCK_MARKUP_PATTERN.search(markdown_text) is None
 
     def parse(self, markdown_text: str) -> List[TypingInstruction]:
         instructions = []
@@ -39,9 +87,25 @@ class MarkdownParser:
         return instructions
 
     def _parse_line(self, line: str) -> List[TypingInstruction]:
+        quote_match = self.quote_pattern.match(line)
+        if quote_match:
+            line = line[quote_match.end():]
+            return ([TypingInstruction(InstructionType.QUOTE_START)] + self._parse_block(line)
+                    + [TypingInstruction(InstructionType.QUOTE_END)])
+        return self._parse_block(line)
+
+    def _parse_block(self, line: str) -> List[TypingInstruction]:
         instructions = []
         
-        heading_match = re.match(r'^(#{1,3})\s+(.+)$', line)
+        list_match = self.list_pattern.match(line)
+        if list_match:
+            kind = LIST_BULLET if list_match.group(1) else LIST_NUMBERED
+            instructions.append(TypingInstruction(InstructionType.LIST_ITEM_START, content=kind))
+            instructions.extend(self._parse_inline(list_match.group(2)))
+            instructions.append(TypingInstruction(InstructionType.LIST_ITEM_END, content=kind))
+            return instructions
+        
+        heading_match = self.heading_pattern.match(line)
         if heading_match:
             level = len(heading_match.group(1))
             content = heading_match.group(2)
@@ -65,14 +129,19 @@ class MarkdownParser:
         tokens = self._tokenize(text)
         
         for token in tokens:
-            if token['type'] == 'bold':
-                instructions.append(TypingInstruction(InstructionType.BOLD_START))
+            if token['type'] in SPAN_INSTRUCTIONS:
+                start, end = SPAN_INSTRUCTIONS[token['type']]
+                instructions.append(TypingInstruction(start))
                 instructions.extend(self._parse_inline(token['content']))
-                instructions.append(TypingInstruction(InstructionType.BOLD_END))
-            elif token['type'] == 'italic':
-                instructions.append(TypingInstruction(InstructionType.ITALIC_START))
+                instructions.append(TypingInstruction(end))
+            elif token['type'] == 'code':
+                instructions.append(TypingInstruction(InstructionType.CODE_START))
+                instructions.append(TypingInstruction(InstructionType.TEXT, content=token['content']))
+                instructions.append(TypingInstruction(InstructionType.CODE_END))
+            elif token['type'] == 'link':
+                instructions.append(TypingInstruction(InstructionType.LINK_START, content=token['url']))
                 instructions.extend(self._parse_inline(token['content']))
-                instructions.append(TypingInstruction(InstructionType.ITALIC_END))
+                instructions.append(TypingInstruction(InstructionType.LINK_END, content=token['url']))
             else:
                 if token['content']:
                     instructions.append(TypingInstruction(
@@ -86,24 +155,19 @@ class MarkdownParser:
         tokens = []
         current_pos = 0
         
-        combined_pattern = re.compile(
-            r'(\*\*(.+?)\*\*|__(.+?)__)|'
-            r'((?<!\*)\*(?!\*)(.+?)(?<!\*)\*(?!\*)|(?<!_)_(?!_)(.+?)(?<!_)_(?!_))'
-        )
-        
-        for match in combined_pattern.finditer(text):
+        for match in self.inline_pattern.finditer(text):
             if match.start() > current_pos:
                 tokens.append({
                     'type': 'text',
                     'content': text[current_pos:match.start()]
                 })
             
-            if match.group(1):
-                content = match.group(2) or match.group(3)
-                tokens.append({'type': 'bold', 'content': content})
-            elif match.group(4):
-                content = match.group(5) or match.group(6)
-                tokens.append({'type': 'italic', 'content': content})
+            token_type = INLINE_GROUPS[match.lastgroup]
+            if token_type == 'link':
+                tokens.append({'type': 'link', 'content': match.group('link_text'),
+                               'url': match.group('link_url')})
+            else:
+                tokens.append({'type': token_type, 'content': match.group(match.lastgroup)})
             
             current_pos = match.end()
         
@@ -113,6 +177,8 @@ class MarkdownParser:
         return tokens
 
     def get_plain_text_length(self, markdown_text: str) -> int:
+        if self.is_plain(markdown_text):
+            return len(markdown_text)
         instructions = self.parse(markdown_text)
         length = 0
         for inst in instructions:
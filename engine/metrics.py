@@ -0,0 +1,169 @@
+import os
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config import LATENESS_BUCKETS, METRICS_HOST, METRICS_PORT, METRICS_FILE_INTERVAL
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+class Histogram:
+    def __init__(self, bounds):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+class TypingMetrics:
+    def __init__(self, buckets=LATENESS_BUCKETS):
+        self.lateness = Histogram(buckets)
+        self.keystrokes = self.keystrokes_before = 0
+        self.chars = self.chars_before = 0
+        self.errors = 0
+        self.pause_seconds = 0.0
+        self.session_pause = 0.0
+        self.sessions_completed = self.sessions_cancelled = 0
+        self.queue_depth = 0
+        self.target_wpm = 0.0
+        self.typing = False
+        self.started_at = self.last_at = self._mark = 0.0
+
+    def start_session(self, target_wpm, now):
+        self.keystrokes_before += self.keystrokes
+        self.chars_before += self.chars
+        self.keystrokes = self.chars = 0
+        self.session_pause = 0.0
+        self.target_wpm = target_wpm
+        self.typing = True
+        self.started_at = self.last_at = self._mark = now
+
+    def keystroke(self, delay, now):
+        self.lateness.observe(now - self._mark - delay)
+        self.keystrokes += 1
+        self.last_at = self._mark = now
+
+    def paused(self, seconds):
+        self.pause_seconds += seconds
+        self.session_pause += seconds
+        self._mark += seconds
+
+    def end_session(self, completed):
+        self.typing = False
+        if completed:
+            self.sessions_completed += 1
+        else:
+            self.sessions_cancelled += 1
+
+    def _active_seconds(self):
+        return self.last_at - self.started_at - self.session_pause
+
+    def achieved_wpm(self):
+        elapsed = self._active_seconds()
+        return self.chars / 5 / elapsed * 60 if elapsed > 0 else 0.0
+
+    def keystrokes_per_second(self):
+        elapsed = self._active_seconds()
+        return self.keystrokes / elapsed if elapsed > 0 else 0.0
+
+def _sample(lines, name, kind, help_text, value, labels=()):
+    if kind:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+    label_text = ','.join(f'{key}="{label}"' for key, label in labels)
+    lines.append(f"{name}{{{label_text}}} {value!r}" if label_text else f"{name} {value!r}")
+
+def render(metrics):
+    lines = []
+    _sample(lines, "texttyper_keystrokes_total", "counter", "Keystroke events injected.",
+            metrics.keystrokes_before + metrics.keystrokes)
+    _sample(lines, "texttyper_characters_total", "counter", "Characters of text typed.",
+            metrics.chars_before + metrics.chars)
+    _sample(lines, "texttyper_errors_injected_total", "counter", "Typo episodes injected.",
+            metrics.errors)
+    _sample(lines, "texttyper_pause_seconds_total", "counter", "Time spent paused by the user.",
+            metrics.pause_seconds)
+    _sample(lines, "texttyper_sessions_total", "counter", "Typing sessions that finished.",
+            metrics.sessions_completed, (("outcome", "completed"),))
+    _sample(lines, "texttyper_sessions_total", None, None, metrics.sessions_cancelled, (("outcome", "cancelled"),))
+    _sample(lines, "texttyper_typing", "gauge", "1 while a session is typing.", int(metrics.typing))
+    _sample(lines, "texttyper_queue_depth", "gauge", "Jobs waiting to be typed.", metrics.queue_depth)
+    _sample(lines, "texttyper_target_wpm", "gauge", "Configured speed of the latest session.", metrics.target_wpm)
+    _sample(lines, "texttyper_achieved_wpm", "gauge", "Speed reached by the latest session, excluding pauses.",
+            metrics.achieved_wpm())
+    _sample(lines, "texttyper_keystrokes_per_second", "gauge", "Keystroke rate of the latest session.",
+            metrics.keystrokes_per_second())
+    histogram = metrics.lateness
+    name = "texttyper_scheduler_lateness_seconds"
+    lines.append(f"# HELP {name} Delay between a keystroke's scheduled and actual injection time.")
+    lines.append(f"# TYPE {name} histogram")
+    cumulative = 0
+    for bound, count in zip(histogram.bounds + (float('inf'),), list(histogram.counts)):
+        cumulative += count
+        _sample(lines, f"{name}_bucket", None, None, cumulative, (("le", "+Inf" if bound == float('inf') else repr(bound)),))
+    _sample(lines, f"{name}_sum", None, None, histogram.sum)
+    _sample(lines, f"{name}_count", None, None, cumulative)
+    return '\n'.join(lines) + '\n'
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    metrics = None
+
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = render(self.metrics).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class MetricsServer:
+    def __init__(self, metrics, host=METRICS_HOST, port=METRICS_PORT):
+        handler = type('MetricsHandler', (_MetricsHandler,), {'metrics': metrics})
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+class TextFileExporter:
+    def __init__(self, metrics, path, interval=METRICS_FILE_INTERVAL):
+        self.metrics = metrics
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+
+    def write(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(render(self.metrics))
+        os.replace(tmp_path, self.path)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.write()
+
+    def start(self):
+        self.write()
+        threading.Thread(target=self._run, daemon=True).start()
+        return self
+
+    def close(self):
+        self._stop.set()
+        self.write()
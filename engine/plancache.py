@@ -0,0 +1,126 @@
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from config import PLAN_CACHE_PATH, PLAN_CACHE_MAX_BYTES
+from engine.planner import KeystrokePlan, OP_CHORD
+
+PLAN_FORMAT = 3
+PLAN_MAGIC = b'TTPL'
+PLAN_SUFFIX = '.plan'
+HEADER = struct.Struct('<4sHxxQQQQ')
+CHORD_SEPARATOR = '\x00'
+
+def plan_key(typer, markdown_text):
+    timing = typer.timing
+    settings = (
+        PLAN_FORMAT, sys.byteorder, typer.error_rate, typer.burst_min, typer.burst_max,
+        typer.layout.name, typer.target, typer.mode, typer.chunk, typer.chunk_jitter,
+        typer.max_events_per_second, timing.wpm, timing.micro_pause_min, timing.micro_pause_max,
+        timing.think_pause_min, timing.think_pause_max,
+        sorted(timing.bigram_factors.items()) if timing.bigram_factors else None,
+        timing.think_pause_quantiles, timing.seed,
+    )
+    digest = hashlib.sha256(repr(settings).encode())
+    digest.update(markdown_text.encode('utf-8', 'surrogatepass'))
+    return digest.hexdigest()
+
+def write_plan(f, plan):
+    parts = [CHORD_SEPARATOR.join(arg) if op == OP_CHORD else arg for op, arg in zip(plan.ops, plan.args)]
+    offsets = array('Q', [0])
+    for part in parts:
+        offsets.append(offsets[-1] + len(part))
+    blob = ''.join(parts).encode('utf-8', 'surrogatepass')
+    f.write(HEADER.pack(PLAN_MAGIC, PLAN_FORMAT, len(plan), plan.total_chars, len(plan.error_ops), len(blob)))
+    f.write(array('d', plan.delays))
+    f.write(array('Q', plan.progress))
+    f.write(array('Q', plan.error_ops))
+    f.write(offsets)
+    f.write(plan.ops)
+    f.write(blob)
+
+class MappedPlan(KeystrokePlan):
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count, self.total_chars, errors, blob_size = HEADER.unpack_from(self._buffer)
+        start = HEADER.size
+        end = start + 8 * count * 2 + 8 * errors + 8 * (count + 1) + count + blob_size
+        if magic != PLAN_MAGIC or version != PLAN_FORMAT or end != len(self._buffer):
+            raise ValueError(f"not a keystroke plan: {path}")
+        view = memoryview(self._buffer)
+        self.delays = view[start:start + 8 * count].cast('d')
+        start += 8 * count
+        self.progress = view[start:start + 8 * count].cast('Q')
+        start += 8 * count
+        self.error_ops = view[start:start + 8 * errors].cast('Q')
+        start += 8 * errors
+        offsets = view[start:start + 8 * (count + 1)].cast('Q').tolist()
+        start += 8 * (count + 1)
+        self.ops = view[start:start + count]
+        text = str(view[start + count:end], 'utf-8', 'surrogatepass')
+        self.args = [tuple(text[offsets[i]:offsets[i + 1]].split(CHORD_SEPARATOR)) if op == OP_CHORD
+                     else text[offsets[i]:offsets[i + 1]] for i, op in enumerate(self.ops)]
+
+class PlanCache:
+    def __init__(self, path=PLAN_CACHE_PATH, max_bytes=PLAN_CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+
+    def _file(self, key):
+        return os.path.join(self.path, key + PLAN_SUFFIX)
+
+    def get(self, key):
+        path = self._file(key)
+        try:
+            plan = MappedPlan(path)
+            os.utime(path)
+        except (OSError, ValueError, struct.error):
+            return None
+        return plan
+
+    def put(self, key, plan):
+        path = self._file(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                write_plan(f, plan)
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+        self.evict()
+
+    def entries(self):
+        entries = []
+        with os.scandir(self.path) as it:
+            for entry in it:
+                if entry.name.endswith(PLAN_SUFFIX):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return sorted(entries)
+
+    def evict(self):
+        try:
+            entries = self.entries()
+        except OSError:
+            return
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
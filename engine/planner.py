@@ -0,0 +1,374 @@
+import re
+from array import array
+
+from config import ERROR_OVERRUN_WEIGHTS, CHORD_BATCH_GAP, NAVIGATION_KEY_GAP
+from engine.markdown_parser import InstructionType
+from engine.boundaries import BoundaryIndex, instruction_text, BOUNDARY_CLAUSE, BOUNDARY_PARAGRAPH
+from engine.layouts import AliasTable, ERROR_DOUBLE, ERROR_TRANSPOSE
+from engine.targets import get_target, LINK_DIALOG
+
+OP_TYPE = 0
+OP_KEY = 1
+OP_CHORD = 2
+
+MODE_HUMAN = "human"
+MODE_CHUNKED = "chunked"
+
+CHUNK_WORD = "word"
+CHUNK_LINE = "line"
+
+INLINE_STYLES = ('bold', 'italic', 'strike', 'code')
+VISIBLE_ON_WHITESPACE = ('strike', 'code')
+
+STYLE_STARTS = {
+    InstructionType.BOLD_START: 'bold',
+    InstructionType.ITALIC_START: 'italic',
+    InstructionType.STRIKE_START: 'strike',
+    InstructionType.CODE_START: 'code',
+}
+STYLE_ENDS = {
+    InstructionType.BOLD_END: 'bold',
+    InstructionType.ITALIC_END: 'italic',
+    InstructionType.STRIKE_END: 'strike',
+    InstructionType.CODE_END: 'code',
+}
+BLOCK_INSTRUCTIONS = {
+    InstructionType.HEADING_START, InstructionType.HEADING_END,
+    InstructionType.LIST_ITEM_START, InstructionType.LIST_ITEM_END,
+    InstructionType.QUOTE_START, InstructionType.QUOTE_END,
+}
+
+WORD_CHUNK_PATTERN = re.compile(r'\S+\s*|\s+')
+
+OVERRUN_TABLE = AliasTable(range(1, len(ERROR_OVERRUN_WEIGHTS) + 1), ERROR_OVERRUN_WEIGHTS)
+
+class KeystrokePlan:
+    def __init__(self):
+        self.ops = array('B')
+        self.args = []
+        self.delays = array('d')
+        self.progress = array('L')
+        self.error_ops = array('L')
+        self.total_chars = 0
+
+    def add(self, op, arg, delay, progress):
+        self.ops.append(op)
+        self.args.append(arg)
+        self.delays.append(delay)
+        self.progress.append(progress)
+
+    def __len__(self):
+        return len(self.ops)
+
+    def characters(self):
+        return set().union(*(arg for op, arg in zip(self.ops, self.args) if op == OP_TYPE))
+
+    def duration(self):
+        return sum(self.delays)
+
+class Planner:
+    def __init__(self, typer):
+        self.typer = typer
+        self.timing = typer.timing
+        self.layout = typer.layout
+        self.rng = typer.rng
+        self.error_rate = typer.error_rate
+        self.plan = KeystrokePlan()
+        self._pending = 0.0
+        self._chars = 0
+        self._sentences = 0
+        self._boundaries = {}
+        self._stream = None
+        self._settled = float('inf')
+        self._deferred = []
+        self._offset = 0
+        self._prev_char = ''
+        self.target = get_target(typer.target)
+        self._on = self.target.on_actions()
+        self._off = self.target.off_actions()
+        self._styles = set()
+        self._applied_styles = set()
+        self._size_steps = self._applied_size_steps = 0
+        self._list = self._applied_list = None
+        self._quote = self._applied_quote = False
+        self._link_started_at = 0
+
+    def build(self, instructions, final=True) -> KeystrokePlan:
+        eager = not self.target.lazy_formatting
+        self._index_boundaries(instruction_text(instructions), final)
+        for instruction in instructions:
+            kind = instruction.type
+            if kind == InstructionType.TEXT:
+                self._sync_formatting(whitespace=not instruction.content.strip())
+                self._plan_text(instruction.content)
+            elif kind == InstructionType.NEWLINE:
+                self._newline()
+            elif kind in STYLE_STARTS:
+                self._styles.add(STYLE_STARTS[kind])
+            elif kind in STYLE_ENDS:
+                self._styles.discard(STYLE_ENDS[kind])
+            elif kind == InstructionType.HEADING_START:
+                self._size_steps = 4 - instruction.heading_level
+            elif kind == InstructionType.HEADING_END:
+                self._size_steps = 0
+            elif kind == InstructionType.LIST_ITEM_START:
+                self._list = instruction.content
+            elif kind == InstructionType.LIST_ITEM_END:
+                self._list = None
+            elif kind == InstructionType.QUOTE_START:
+                self._quote = True
+            elif kind == InstructionType.QUOTE_END:
+                self._quote = False
+            elif kind == InstructionType.LINK_START:
+                self._link_started_at = self._chars
+            elif kind == InstructionType.LINK_END:
+                self._insert_link(instruction.content, self._chars - self._link_started_at)
+            if eager and (kind in STYLE_STARTS or kind in STYLE_ENDS or kind in BLOCK_INSTRUCTIONS):
+                self._sync_formatting()
+        if final:
+            self._sync_formatting()
+        self.plan.total_chars = self._chars
+        return self.plan
+
+    def build_plain(self, text, final=True) -> KeystrokePlan:
+        self._index_boundaries(text, final)
+        for index, line in enumerate(text.split('\n')):
+            if index:
+                self._newline()
+            if line:
+                self._sync_formatting(whitespace=not line.strip())
+                self._plan_text(line)
+        if final:
+            self._sync_formatting()
+        self.plan.total_chars = self._chars
+        return self.plan
+
+    def state(self):
+        return frozenset(self._applied_styles), self._applied_size_steps, self._applied_list, self._applied_quote
+
+    def restore_state(self, state):
+        styles, self._applied_size_steps, self._applied_list, self._applied_quote = state
+        self._applied_styles = set(styles)
+        self._styles = set()
+        self._size_steps, self._list, self._quote = 0, None, False
+
+    def navigate(self, key, count=1):
+        op = OP_KEY if isinstance(key, str) else OP_CHORD
+        for _ in range(count):
+            self._pending += NAVIGATION_KEY_GAP
+            self._emit(op, key)
+
+    def carry_boundaries(self):
+        self._stream = BoundaryIndex()
+
+    def _index_boundaries(self, text, final):
+        index = self._stream or BoundaryIndex()
+        self._offset = index.offset
+        self._boundaries = index.feed(text, final or self._stream is None)
+        self._settled = index.settled
+        deferred, self._deferred = self._deferred, []
+        for offset in deferred:
+            self._boundary_pause(offset)
+
+    def _emit(self, op, arg, advance=0):
+        self._chars += advance
+        self.plan.add(op, arg, self._pending, self._chars)
+        self._pending = 0.0
+
+    def _newline(self):
+        self._emit(OP_KEY, 'enter', 1)
+        self._prev_char = '\n'
+        self._pending += self.timing.get_keystroke_delay('\n', '\n')
+        self._after_char()
+
+    def _press_shortcuts(self, chords):
+        self._pending += self.timing.get_formatting_delay()
+        for index, keys in enumerate(chords):
+            if index:
+                self._pending += CHORD_BATCH_GAP
+            self._emit(OP_CHORD, keys)
+        self._pending += self.timing.get_formatting_delay()
+
+    def _apply_actions(self, actions):
+        chords = []
+        for action in actions:
+            if isinstance(action, str):
+                self._type_literal(action)
+            else:
+                chords.append(action)
+        if chords:
+            self._press_shortcuts(chords)
+
+    def _toggle_style(self, style, actions):
+        table = self._off if style in self._applied_styles else self._on
+        if style in table:
+            actions.append(table[style])
+        self._applied_styles ^= {style}
+
+    def _apply_heading_size(self, actions):
+        steps = self._size_steps - self._applied_size_steps
+        action = (self._on if steps > 0 else self._off).get('size')
+        if action:
+            actions.extend([action] * abs(steps))
+        self._applied_size_steps = self._size_steps
+
+    def _apply_list(self, actions):
+        if self._applied_list in self._off:
+            actions.append(self._off[self._applied_list])
+        if self._list in self._on:
+            actions.append(self._on[self._list])
+        self._applied_list = self._list
+
+    def _apply_quote(self, actions):
+        action = (self._on if self._quote else self._off).get('quote')
+        if action:
+            actions.append(action)
+        self._applied_quote = self._quote
+
+    def _sync_formatting(self, whitespace=False):
+        actions = []
+        for style in INLINE_STYLES:
+            wanted = style in self._styles
+            if wanted == (style in self._applied_styles):
+                continue
+            if whitespace and (wanted or style not in VISIBLE_ON_WHITESPACE):
+                continue
+            self._toggle_style(style, actions)
+        if not whitespace:
+            if self._size_steps != self._applied_size_steps:
+                self._apply_heading_size(actions)
+            if self._list != self._applied_list:
+                self._apply_list(actions)
+            if self._quote != self._applied_quote:
+                self._apply_quote(actions)
+        if actions:
+            self._apply_actions(actions)
+
+    def _type_literal(self, text):
+        for char in text:
+            self._type_char(char, 0)
+
+    def _insert_link(self, url, anchor_length):
+        if self.target.link_style != LINK_DIALOG:
+            if url:
+                self._type_literal(f" ({url})")
+            return
+        chord = self._on.get('link')
+        if not chord or not anchor_length:
+            return
+        self._press_shortcuts([('shift', 'left')] * anchor_length + [chord])
+        self._type_literal(url)
+        self._emit(OP_KEY, 'enter')
+        self._pending += self.timing.get_formatting_delay()
+        self._emit(OP_KEY, 'right')
+
+    def _type_char(self, char, advance=1):
+        self._emit(OP_TYPE, char, advance)
+        self._pending += self.timing.get_keystroke_delay(self._prev_char, char)
+        self._prev_char = char
+
+    def _after_char(self):
+        self._offset += 1
+        self._boundary_pause(self._offset - 1)
+
+    def _boundary_pause(self, offset):
+        if offset >= self._settled:
+            self._deferred.append(offset)
+            return
+        kind = self._boundaries.get(offset)
+        if kind is None:
+            return
+        if kind == BOUNDARY_CLAUSE:
+            self._pending += self.timing.get_clause_pause()
+            return
+        self._sentences += 1
+        if self.typer._burst_due(self._sentences, kind == BOUNDARY_PARAGRAPH):
+            self._pending += self.timing.get_think_pause()
+            self.timing.start_new_burst()
+
+    def _plan_text(self, content):
+        index = 0
+        length = len(content)
+        while index < length:
+            char = content[index]
+            if self._prev_char == ' ':
+                self._pending += self.timing.get_word_pause()
+            if char in self.layout and self.rng.next_uniform() < self.error_rate:
+                index += self._plan_error_episode(content, index)
+            else:
+                self._type_char(char)
+                self._after_char()
+                index += 1
+
+    def _episode_keystrokes(self, intended):
+        kind, wrong = self.layout.sample_error(intended[0], self.rng.next_uniform())
+        if kind == ERROR_TRANSPOSE and len(intended) > 1:
+            return intended[1] + intended[0] + intended[2:]
+        if kind == ERROR_DOUBLE:
+            return intended[0] + intended
+        if kind == ERROR_TRANSPOSE:
+            wrong = self.layout.adjacent_key(intended[0], self.rng.next_uniform())
+        return wrong + intended[1:]
+
+    def _plan_error_episode(self, content, index):
+        overrun = OVERRUN_TABLE.sample(self.rng.next_uniform())
+        intended = content[index:index + overrun]
+        typed = self._episode_keystrokes(intended)
+
+        correct = 0
+        while correct < min(len(typed), len(intended)) and typed[correct] == intended[correct]:
+            correct += 1
+        first_op = len(self.plan)
+        for position, char in enumerate(typed):
+            self._type_char(char, 1 if position < correct else 0)
+
+        mistakes = len(typed) - correct
+        if mistakes:
+            self.plan.error_ops.append(first_op + correct)
+            self._pending += self.timing.get_notice_delay()
+            for _ in range(mistakes):
+                self._emit(OP_KEY, 'backspace')
+                self._pending += self.timing.get_error_correction_delay()
+            self._prev_char = intended[correct - 1] if correct else ''
+        for char in intended[correct:]:
+            self._type_char(char)
+
+        for _ in intended:
+            self._after_char()
+        return len(intended)
+
+class ChunkPlanner(Planner):
+    def __init__(self, typer):
+        super().__init__(typer)
+        self.chunk = typer.chunk
+        self.jitter = typer.chunk_jitter
+        self.event_interval = 1.0 / typer.max_events_per_second
+        self._last_events = 0
+
+    def _index_boundaries(self, text, final):
+        pass
+
+    def _emit(self, op, arg, advance=0):
+        gap = self._last_events * self.event_interval
+        if self.jitter:
+            gap += self.rng.uniform(0.0, self.jitter)
+        self._pending = max(self._pending, gap)
+        self._last_events = 1 if op == OP_KEY else len(arg)
+        super()._emit(op, arg, advance)
+
+    def _newline(self):
+        self._emit(OP_KEY, 'enter', 1)
+
+    def _press_shortcuts(self, chords):
+        for keys in chords:
+            self._emit(OP_CHORD, keys)
+
+    def _type_literal(self, text):
+        self._emit(OP_TYPE, text)
+
+    def _plan_text(self, content):
+        if self.chunk == CHUNK_LINE:
+            self._emit(OP_TYPE, content, len(content))
+            return
+        for chunk in WORD_CHUNK_PATTERN.findall(content):
+            self._emit(OP_TYPE, chunk, len(chunk))
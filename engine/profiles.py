@@ -0,0 +1,119 @@
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Optional
+
+from config import (
+    PROFILES_PATH, DEFAULT_PROFILE_NAME,
+    DEFAULT_WPM, DEFAULT_ERROR_RATE,
+    DEFAULT_BURST_SIZE_MIN, DEFAULT_BURST_SIZE_MAX,
+    DEFAULT_THINK_PAUSE_MIN, DEFAULT_THINK_PAUSE_MAX, DEFAULT_TARGET
+)
+
+STORE_FORMAT = 1
+
+def default_typer_settings():
+    return {
+        'wpm': DEFAULT_WPM,
+        'error_rate': DEFAULT_ERROR_RATE,
+        'burst_min': DEFAULT_BURST_SIZE_MIN,
+        'burst_max': DEFAULT_BURST_SIZE_MAX,
+        'think_pause_min': DEFAULT_THINK_PAUSE_MIN,
+        'think_pause_max': DEFAULT_THINK_PAUSE_MAX,
+        'target': DEFAULT_TARGET
+    }
+
+@dataclass
+class Profile:
+    name: str
+    typer: dict = field(default_factory=default_typer_settings)
+    timing: dict = field(default_factory=dict)
+    seed: Optional[int] = None
+    revision: int = 0
+
+    @property
+    def key(self):
+        content = json.dumps([self.name, self.typer, self.timing, self.seed], sort_keys=True)
+        return hashlib.sha256(content.encode()).hexdigest()
+
+class ProfileStore:
+    def __init__(self, path=PROFILES_PATH):
+        self.path = path
+        self._profiles: Optional[Dict[str, Profile]] = None
+        self._active = DEFAULT_PROFILE_NAME
+
+    def _ensure_loaded(self):
+        if self._profiles is not None:
+            return self._profiles
+        self._profiles = {}
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            data = {}
+        if data.get('format') == STORE_FORMAT:
+            self._active = data.get('active', DEFAULT_PROFILE_NAME)
+            for name, fields in data.get('profiles', {}).items():
+                self._profiles[name] = Profile(name=name, **fields)
+        return self._profiles
+
+    def _write(self):
+        profiles = {}
+        for name, profile in self._profiles.items():
+            fields = asdict(profile)
+            del fields['name']
+            profiles[name] = fields
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({'format': STORE_FORMAT, 'active': self._active, 'profiles': profiles}, f, indent=1)
+        os.replace(tmp_path, self.path)
+
+    def names(self) -> List[str]:
+        return sorted(self._ensure_loaded())
+
+    def get(self, name) -> Profile:
+        profiles = self._ensure_loaded()
+        if name not in profiles:
+            profiles[name] = Profile(name=name)
+        return profiles[name]
+
+    def active(self) -> Profile:
+        self._ensure_loaded()
+        return self.get(self._active)
+
+    def set_active(self, name) -> Profile:
+        profile = self.get(name)
+        if name != self._active:
+            self._active = name
+            self._write()
+        return profile
+
+    def update(self, name, typer=None, timing=None, seed=None) -> Profile:
+        profile = self.get(name)
+        changed = False
+        if typer is not None:
+            merged = dict(profile.typer, **typer)
+            if merged != profile.typer:
+                profile.typer = merged
+                changed = True
+        if timing is not None and timing != profile.timing:
+            profile.timing = dict(timing)
+            changed = True
+        if seed is not None and seed != profile.seed:
+            profile.seed = seed
+            changed = True
+        if changed:
+            profile.revision += 1
+            self._write()
+        return profile
+
+    def delete(self, name):
+        profiles = self._ensure_loaded()
+        if profiles.pop(name, None) is not None:
+            if self._active == name:
+                self._active = DEFAULT_PROFILE_NAME
+            self._write()
@@ -0,0 +1,54 @@
+from typing import Callable, Optional
+
+from config import (
+    RATE_TARGET_LATENCY, RATE_TARGET_BACKLOG, RATE_MAX_SLOWDOWN, RATE_EWMA_ALPHA,
+    RATE_BACKOFF, RATE_RECOVERY, RATE_SETTLE_PAUSE, RATE_MAX_SLOWED_GAP
+)
+
+class AdaptiveRateController:
+    def __init__(self, probe: Optional[Callable[[], Optional[float]]] = None,
+                 target_latency=RATE_TARGET_LATENCY, target_backlog=RATE_TARGET_BACKLOG,
+                 max_slowdown=RATE_MAX_SLOWDOWN, settle_pause=RATE_SETTLE_PAUSE,
+                 max_slowed_gap=RATE_MAX_SLOWED_GAP):
+        self.probe = probe
+        self.target_latency = target_latency
+        self.target_backlog = target_backlog
+        self.max_slowdown = max_slowdown
+        self.settle_pause = settle_pause
+        self.max_slowed_gap = max_slowed_gap
+        self.reset()
+
+    def reset(self):
+        self.slowdown = 1.0
+        self.latency = 0.0
+        self.backlog = None
+        self.settle_count = 0
+
+    def observe(self, latency):
+        self.latency += RATE_EWMA_ALPHA * (latency - self.latency)
+        self.backlog = self.probe() if self.probe is not None else None
+        pressure = self.latency / self.target_latency
+        if self.backlog is not None:
+            pressure = max(pressure, self.backlog / self.target_backlog)
+        if pressure > 1.0:
+            self.slowdown = min(self.max_slowdown, self.slowdown * RATE_BACKOFF)
+        else:
+            self.slowdown = max(1.0, self.slowdown * RATE_RECOVERY)
+
+    def _settle_delay(self):
+        if self.backlog is not None:
+            return 2 * self.backlog
+        if self.slowdown > 1.0 or self.latency > self.target_latency:
+            return 2 * self.latency + self.settle_pause * self.slowdown
+        return 0.0
+
+    def wait_before(self, planned_delay, settle=False):
+        delay = planned_delay
+        if planned_delay < self.max_slowed_gap:
+            delay *= self.slowdown
+        if settle:
+            settle_delay = self._settle_delay()
+            if settle_delay > delay:
+                self.settle_count += 1
+                delay = settle_delay
+        return delay
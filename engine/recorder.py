@@ -0,0 +1,109 @@
+import os
+import struct
+import time
+import threading
+from typing import Iterator, Optional
+
+from config import KEYLOG_CHUNK_RECORDS
+
+LOG_MAGIC = b"TTKL\x01\x00\x00\x00"
+RECORD = struct.Struct("<II")
+SESSION_BREAK = 0xFFFFFFFF
+
+KEY_BACKSPACE = 0x08
+KEY_TAB = 0x09
+KEY_ENTER = 0x0A
+
+class KeystrokeLogWriter:
+    def __init__(self, path, buffer_records=1024):
+        self.path = path
+        self._buffer = bytearray()
+        self._buffer_limit = buffer_records * RECORD.size
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        self._file = os.fdopen(fd, "ab")
+        if self._file.tell() == 0:
+            self._file.write(LOG_MAGIC)
+
+    def append(self, code: int, delta_us: int):
+        self._buffer += RECORD.pack(min(delta_us, SESSION_BREAK), code)
+        if len(self._buffer) >= self._buffer_limit:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._buffer.clear()
+        self._file.flush()
+
+    def close(self):
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
+
+def iter_log_chunks(path, chunk_records=KEYLOG_CHUNK_RECORDS) -> Iterator[list]:
+    chunk_bytes = chunk_records * RECORD.size
+    with open(path, "rb") as f:
+        if f.read(len(LOG_MAGIC)) != LOG_MAGIC:
+            raise ValueError(f"{path} is not a keystroke log")
+        while True:
+            chunk = f.read(chunk_bytes)
+            if not chunk:
+                return
+            usable = len(chunk) - len(chunk) % RECORD.size
+            yield list(RECORD.iter_unpack(chunk[:usable]))
+
+def key_to_code(key) -> Optional[int]:
+    char = getattr(key, "char", None)
+    if char:
+        return ord(char)
+    name = getattr(key, "name", None)
+    if name == "backspace":
+        return KEY_BACKSPACE
+    if name == "enter":
+        return KEY_ENTER
+    if name == "tab":
+        return KEY_TAB
+    if name == "space":
+        return ord(" ")
+    return None
+
+class KeystrokeRecorder:
+    def __init__(self, path):
+        self.writer = KeystrokeLogWriter(path)
+        self.keystrokes = 0
+        self._last_time = None
+        self._listener = None
+        self._lock = threading.Lock()
+
+    def record(self, code: int, timestamp: Optional[float] = None):
+        if timestamp is None:
+            timestamp = time.perf_counter()
+        with self._lock:
+            if self._last_time is None:
+                delta_us = SESSION_BREAK
+            else:
+                delta_us = int(max(0.0, timestamp - self._last_time) * 1_000_000)
+            self._last_time = timestamp
+            self.writer.append(code, delta_us)
+            self.keystrokes += 1
+
+    def _on_press(self, key):
+        code = key_to_code(key)
+        if code is not None:
+            self.record(code)
+
+    def start(self):
+        from pynput import keyboard
+        self._listener = keyboard.Listener(on_press=self._on_press)
+        self._listener.start()
+
+    def stop(self):
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+        with self._lock:
+            self.writer.close()
+
+def log_size(path) -> int:
+    return max(0, os.path.getsize(path) - len(LOG_MAGIC)) // RECORD.size
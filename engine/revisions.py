@@ -0,0 +1,249 @@
+from bisect import bisect_right
+from difflib import SequenceMatcher
+from itertools import groupby
+
+from config import DOCUMENT_END_KEYS, PARAGRAPH_UP_KEYS, SELECT_ALL_KEYS
+from engine.markdown_parser import InstructionType, TypingInstruction
+from engine.planner import Planner, STYLE_STARTS, STYLE_ENDS, BLOCK_INSTRUCTIONS, WORD_CHUNK_PATTERN
+from engine.targets import LINK_DIALOG
+
+STYLE_START_INSTRUCTIONS = {style: kind for kind, style in STYLE_STARTS.items()}
+STYLE_END_INSTRUCTIONS = {style: kind for kind, style in STYLE_ENDS.items()}
+EDITABLE_INSTRUCTIONS = BLOCK_INSTRUCTIONS | set(STYLE_STARTS) | set(STYLE_ENDS) | {InstructionType.TEXT}
+
+def split_paragraphs(instructions):
+    paragraphs = [[]]
+    for instruction in instructions:
+        if instruction.type == InstructionType.NEWLINE:
+            paragraphs.append([])
+        else:
+            paragraphs[-1].append(instruction)
+    return paragraphs
+
+def paragraph_key(paragraph):
+    return tuple((instruction.type, instruction.content, instruction.heading_level) for instruction in paragraph)
+
+def diff_opcodes(old, new):
+    start = 0
+    limit = min(len(old), len(new))
+    while start < limit and old[start] == new[start]:
+        start += 1
+    end = 0
+    while end < limit - start and old[-1 - end] == new[-1 - end]:
+        end += 1
+    matcher = SequenceMatcher(None, old[start:len(old) - end], new[start:len(new) - end], autojunk=False)
+    return [(tag, i1 + start, i2 + start, j1 + start, j2 + start)
+            for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag != 'equal']
+
+def _cells(paragraph):
+    cells = []
+    styles = frozenset()
+    for instruction in paragraph:
+        if instruction.type in STYLE_STARTS:
+            styles = styles | {STYLE_STARTS[instruction.type]}
+        elif instruction.type in STYLE_ENDS:
+            styles = styles - {STYLE_ENDS[instruction.type]}
+        elif instruction.type == InstructionType.TEXT:
+            cells.extend((char, styles) for char in instruction.content)
+    return cells
+
+def _tokens(cells):
+    text = ''.join(char for char, _ in cells)
+    return [tuple(cells[match.start():match.end()]) for match in WORD_CHUNK_PATTERN.finditer(text)]
+
+def _cell_instructions(cells):
+    instructions = []
+    for styles, run in groupby(cells, key=lambda cell: cell[1]):
+        ordered = sorted(styles)
+        instructions.extend(TypingInstruction(STYLE_START_INSTRUCTIONS[style]) for style in ordered)
+        instructions.append(TypingInstruction(InstructionType.TEXT, ''.join(char for char, _ in run)))
+        instructions.extend(TypingInstruction(STYLE_END_INSTRUCTIONS[style]) for style in reversed(ordered))
+    return instructions
+
+def _block_prefix(paragraph):
+    prefix = []
+    for instruction in paragraph:
+        if instruction.type not in BLOCK_INSTRUCTIONS:
+            break
+        prefix.append(instruction)
+    return prefix
+
+def _block_key(paragraph):
+    return paragraph_key(instruction for instruction in paragraph if instruction.type in BLOCK_INSTRUCTIONS)
+
+class RenderedDocument(Planner):
+    def __init__(self, typer, paragraphs):
+        super().__init__(typer)
+        self.texts = []
+        self.runs = []
+        self.entries = []
+        for paragraph in paragraphs:
+            self._parts = []
+            self.runs.append(([], []))
+            self.entries.append(self.state())
+            self.build(paragraph, final=False)
+            self.texts.append(''.join(self._parts))
+
+    def _index_boundaries(self, text, final):
+        pass
+
+    def _emit(self, op, arg, advance=0):
+        pass
+
+    def _press_shortcuts(self, chords):
+        pass
+
+    def _append(self, text):
+        self._parts.append(text)
+        ends, states = self.runs[-1]
+        ends.append((ends[-1] if ends else 0) + len(text))
+        states.append(self.state())
+
+    def _type_literal(self, text):
+        self._append(text)
+
+    def _plan_text(self, content):
+        self._append(content)
+
+    def _insert_link(self, url, anchor_length):
+        if self.target.link_style != LINK_DIALOG and url:
+            self._type_literal(f" ({url})")
+
+    def entry_state(self, paragraph):
+        return self.entries[paragraph] if paragraph < len(self.entries) else self.state()
+
+    def state_of(self, paragraph, index):
+        ends, states = self.runs[paragraph]
+        if index is None or not ends:
+            return self.entries[paragraph]
+        return states[min(bisect_right(ends, index), len(states) - 1)]
+
+class RevisionPlanner:
+    def __init__(self, typer, planner):
+        self.typer = typer
+        self.planner = planner
+
+    def build(self, previous, current):
+        self.old = split_paragraphs(previous)
+        self.new = split_paragraphs(current)
+        self.rendered = RenderedDocument(self.typer, self.old)
+        self.new_lengths = [len(text) for text in RenderedDocument(self.typer, self.new).texts]
+        self.lengths = [len(text) for text in self.rendered.texts]
+        opcodes = diff_opcodes([paragraph_key(p) for p in self.old], [paragraph_key(p) for p in self.new])
+        if opcodes:
+            self.planner.navigate(DOCUMENT_END_KEYS)
+            self.cursor = (len(self.lengths) - 1, self.lengths[-1])
+        for _, i1, i2, j1, j2 in reversed(opcodes):
+            for action in reversed(self._actions(i1, i2, j1, j2)):
+                if action[0] == 'edit':
+                    self._edit_paragraph(action[1], action[2])
+                else:
+                    self._replace_paragraphs(*action[1:])
+        plan = self.planner.plan
+        plan.total_chars = self.planner._chars
+        return plan
+
+    def _actions(self, i1, i2, j1, j2):
+        actions = []
+        pairs = min(i2 - i1, j2 - j1)
+        for k in range(pairs):
+            old_index, new_index = i1 + k, j1 + k
+            if self._editable(self.old[old_index], self.new[new_index], old_index):
+                actions.append(('edit', old_index, new_index))
+            elif actions and actions[-1][0] == 'replace' and actions[-1][2] == old_index:
+                actions[-1][2] += 1
+                actions[-1][4] += 1
+            else:
+                actions.append(['replace', old_index, old_index + 1, new_index, new_index + 1])
+        if i2 - i1 != j2 - j1:
+            if actions and actions[-1][0] == 'replace' and actions[-1][2] == i1 + pairs:
+                actions[-1][2], actions[-1][4] = i2, j2
+            else:
+                actions.append(['replace', i1 + pairs, i2, j1 + pairs, j2])
+        return actions
+
+    def _editable(self, old, new, index):
+        for paragraph in (old, new):
+            if any(instruction.type not in EDITABLE_INSTRUCTIONS for instruction in paragraph):
+                return False
+        return (_block_key(old) == _block_key(new)
+                and self.rendered.texts[index] == ''.join(char for char, _ in _cells(old)))
+
+    def _move_to(self, paragraph, offset):
+        current, current_offset = self.cursor
+        ups = current - paragraph + (1 if current_offset else 0)
+        moves = [(ups + offset, ups, 'right', offset)]
+        if paragraph == current:
+            moves.append((current_offset - offset, 0, 'left', current_offset - offset))
+        else:
+            lefts = self.lengths[paragraph] - offset + 1
+            moves.append((ups - 1 + lefts, ups - 1, 'left', lefts))
+        _, ups, key, count = min(moves)
+        self.planner.navigate(PARAGRAPH_UP_KEYS, ups)
+        self.planner.navigate(key, count)
+        self.cursor = (paragraph, offset)
+
+    def _type_paragraphs(self, paragraphs, state, leading_break=True):
+        self.planner.restore_state(state)
+        for index, paragraph in enumerate(paragraphs):
+            if leading_break or index:
+                self.planner._newline()
+            self.planner.build(paragraph, final=False)
+
+    def _replace_paragraphs(self, a, b, c, d):
+        paragraphs = self.new[c:d]
+        if a == 0 and b == len(self.lengths):
+            self.planner.navigate(SELECT_ALL_KEYS)
+            self.planner.navigate('delete')
+            self._type_paragraphs(paragraphs, Planner(self.typer).state(), leading_break=False)
+            self.lengths = self.new_lengths[c:d]
+            self.cursor = (len(self.lengths) - 1, self.lengths[-1])
+            return
+        if a:
+            self._move_to(a - 1, self.lengths[a - 1])
+            self.planner.navigate('delete', sum(self.lengths[k] + 1 for k in range(a, b)))
+            self._type_paragraphs(paragraphs, self.rendered.entry_state(a))
+            end = a - 1 + len(paragraphs)
+            last = self.new_lengths[d - 1] if paragraphs else self.lengths[a - 1]
+        else:
+            self._move_to(0, 0)
+            self.planner.navigate('delete', sum(self.lengths[k] + 1 for k in range(a, b)))
+            if paragraphs:
+                self.planner._newline()
+                self.planner.navigate('up')
+                self._type_paragraphs(paragraphs, self.rendered.entry_state(b), leading_break=False)
+            end = len(paragraphs) - 1
+            last = self.new_lengths[d - 1] if paragraphs else 0
+        self.lengths[a:b] = self.new_lengths[c:d]
+        self.cursor = (max(end, 0), last)
+
+    def _edit_paragraph(self, index, new_index):
+        old, new = self.old[index], self.new[new_index]
+        old_cells, new_cells = _cells(old), _cells(new)
+        old_tokens, new_tokens = _tokens(old_cells), _tokens(new_cells)
+        old_offsets = [0]
+        for token in old_tokens:
+            old_offsets.append(old_offsets[-1] + len(token))
+        new_offsets = [0]
+        for token in new_tokens:
+            new_offsets.append(new_offsets[-1] + len(token))
+        block = _block_prefix(new)
+        for _, t1, t2, u1, u2 in reversed(diff_opcodes(old_tokens, new_tokens)):
+            start, end = old_offsets[t1], old_offsets[t2]
+            new_start, new_end = new_offsets[u1], new_offsets[u2]
+            while start < end and new_start < new_end and old_cells[start] == new_cells[new_start]:
+                start += 1
+                new_start += 1
+            while start < end and new_start < new_end and old_cells[end - 1] == new_cells[new_end - 1]:
+                end -= 1
+                new_end -= 1
+            if start:
+                neighbour = start - 1
+            else:
+                neighbour = end if end < len(old_cells) else None
+            self._move_to(index, start)
+            self.planner.navigate('delete', end - start)
+            self.planner.restore_state(self.rendered.state_of(index, neighbour))
+            self.planner.build(block + _cell_instructions(new_cells[new_start:new_end]), final=False)
+            self.lengths[index] += (new_end - new_start) - (end - start)
+            self.cursor = (index, start + new_end - new_start)
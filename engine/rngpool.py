@@ -0,0 +1,29 @@
+import math
+import random
+from itertools import chain, repeat
+
+from config import RNG_POOL_BLOCK
+
+TWO_PI = 2.0 * math.pi
+
+class PooledRandom(random.Random):
+    def __init__(self, seed=None, block=RNG_POOL_BLOCK):
+        self.block = block
+        super().__init__(seed)
+
+    def seed(self, a=None, version=2):
+        super().seed(a, version)
+        self.next_uniform = super().random
+        self.next_normal = chain.from_iterable(self._normal_blocks()).__next__
+
+    def _normal_blocks(self):
+        draw = super().random
+        log, sqrt, cos, sin = math.log, math.sqrt, math.cos, math.sin
+        while True:
+            pairs = [(sqrt(-2.0 * log(1.0 - draw())), TWO_PI * draw()) for _ in repeat(None, self.block // 2)]
+            yield [radius * cos(angle) for radius, angle in pairs] + [radius * sin(angle) for radius, angle in pairs]
+
+    def gauss(self, mu=0.0, sigma=1.0):
+        return mu + sigma * self.next_normal()
+
+    normalvariate = gauss
@@ -0,0 +1,74 @@
+from dataclasses import dataclass, field
+from typing import Dict
+
+from config import IS_MAC, MODIFIER_KEY
+
+LINK_DIALOG = "dialog"
+LINK_INLINE = "inline"
+
+@dataclass
+class TargetProfile:
+    name: str
+    formats: Dict[str, tuple] = field(default_factory=dict)
+    link_style: str = LINK_INLINE
+    lazy_formatting: bool = True
+
+    def on_actions(self):
+        return {name: actions[0] for name, actions in self.formats.items() if actions[0]}
+
+    def off_actions(self):
+        return {name: actions[1] for name, actions in self.formats.items() if actions[1]}
+
+def _toggle(*keys):
+    return (keys, keys)
+
+GOOGLE_DOCS = TargetProfile(
+    name="gdocs",
+    formats={
+        'bold': _toggle(MODIFIER_KEY, 'b'),
+        'italic': _toggle(MODIFIER_KEY, 'i'),
+        'strike': _toggle(MODIFIER_KEY, 'shift', 'x') if IS_MAC else _toggle('alt', 'shift', '5'),
+        'size': ((MODIFIER_KEY, 'shift', '.'), (MODIFIER_KEY, 'shift', ',')),
+        'bullet': _toggle(MODIFIER_KEY, 'shift', '8'),
+        'numbered': _toggle(MODIFIER_KEY, 'shift', '7'),
+        'quote': ((MODIFIER_KEY, ']'), (MODIFIER_KEY, '[')),
+        'link': _toggle(MODIFIER_KEY, 'k'),
+    },
+    link_style=LINK_DIALOG,
+)
+
+WORD = TargetProfile(
+    name="word",
+    formats={
+        'bold': _toggle(MODIFIER_KEY, 'b'),
+        'italic': _toggle(MODIFIER_KEY, 'i'),
+        'size': ((MODIFIER_KEY, 'shift', '.'), (MODIFIER_KEY, 'shift', ',')),
+        'bullet': ((MODIFIER_KEY, 'shift', 'l'), (MODIFIER_KEY, 'shift', 'n')),
+        'quote': ((MODIFIER_KEY, 'm'), (MODIFIER_KEY, 'shift', 'm')),
+        'link': _toggle(MODIFIER_KEY, 'k'),
+    },
+    link_style=LINK_DIALOG,
+)
+
+PLAIN_TEXT = TargetProfile(name="plain")
+
+SLACK = TargetProfile(
+    name="slack",
+    formats={
+        'bold': ('*', '*'),
+        'italic': ('_', '_'),
+        'strike': ('~', '~'),
+        'code': ('`', '`'),
+        'bullet': ('- ', None),
+        'numbered': ('1. ', None),
+        'quote': ('> ', None),
+    },
+    lazy_formatting=False,
+)
+
+TARGETS = {target.name: target for target in (GOOGLE_DOCS, WORD, PLAIN_TEXT, SLACK)}
+
+def get_target(name) -> TargetProfile:
+    if name not in TARGETS:
+        raise ValueError(f"Unknown target application: {name}")
+    return TARGETS[name]
@@ -1,10 +1,13 @@
-import random
 import math
-from config import COMMON_BIGRAMS
+from config import (
+    COMMON_BIGRAMS, ERROR_OVERRUN_WEIGHTS,
+    NOTICE_DELAY_MEDIAN, NOTICE_DELAY_SIGMA, CLAUSE_PAUSE_MIN, CLAUSE_PAUSE_MAX
+)
+from engine.rngpool import PooledRandom
 
 class TimingEngine:
     def __init__(self, wpm=60, micro_pause_min=0.05, micro_pause_max=0.15,
-                 think_pause_min=1.0, think_pause_max=3.0):
+                 think_pause_min=1.0, think_pause_max=3.0, seed=None):
         self.wpm = wpm
         self.micro_pause_min = micro_pause_min
         self.micro_pause_max = micro_pause_max
@@ -14,6 +17,15 @@ class TimingEngine:
         self.fatigue_factor = 1.0
         self._burst_speed_multiplier = 1.0
         self._chars_in_current_burst = 0
+        self.bigram_factors = None
+        self.think_pause_quantiles = None
+        self.seed = seed
+        self.rng = PooledRandom(seed)
+        self.sleep_overhead = 0.0
+
+    def load_profile(self, profile):
+        self.bigram_factors = dict(profile.get('bigram_factors') or {}) or None
+        self.think_pause_quantiles = list(profile.get('think_pause_quantiles') or []) or None
 
     def _base_delay(self):
         chars_per_minute = self.wpm * 5
@@ -21,7 +33,7 @@ class TimingEngine:
         return base
 
     def _apply_gaussian_variation(self, delay):
-        variation = random.gauss(1.0, 0.25)
+        variation = 1.0 + 0.25 * self.rng.next_normal()
         return delay * max(0.5, min(2.0, variation))
 
     def _apply_fatigue(self, delay):
@@ -30,43 +42,46 @@ class TimingEngine:
         return delay * self.fatigue_factor
 
     def start_new_burst(self):
-        self._burst_speed_multiplier = random.uniform(0.7, 1.3)
+        self._burst_speed_multiplier = 0.7 + 0.6 * self.rng.next_uniform()
         self._chars_in_current_burst = 0
 
     def get_keystroke_delay(self, prev_char, current_char):
+        uniform = self.rng.next_uniform
         base = self._base_delay()
         
         bigram = (prev_char + current_char).lower()
-        if bigram in COMMON_BIGRAMS:
+        if self.bigram_factors is not None:
+            base *= self.bigram_factors.get(bigram, 1.0)
+        elif bigram in COMMON_BIGRAMS:
             base *= 0.8
         
         if current_char == ' ':
-            base *= random.uniform(1.0, 1.4)
+            base *= 1.0 + 0.4 * uniform()
         elif current_char == '\n':
-            base *= random.uniform(1.2, 1.8)
+            base *= 1.2 + 0.6 * uniform()
         elif current_char in '.,':
-            base *= random.uniform(0.9, 1.3)
+            base *= 0.9 + 0.4 * uniform()
         elif current_char in '!?':
-            base *= random.uniform(1.0, 1.5)
+            base *= 1.0 + 0.5 * uniform()
         elif current_char in ';:':
-            base *= random.uniform(1.1, 1.6)
+            base *= 1.1 + 0.5 * uniform()
         elif current_char.isupper():
-            base *= random.uniform(1.0, 1.2)
+            base *= 1.0 + 0.2 * uniform()
         elif current_char in '0123456789':
-            base *= random.uniform(1.0, 1.15)
+            base *= 1.0 + 0.15 * uniform()
         elif current_char in '[]{}()<>':
-            base *= random.uniform(1.2, 1.5)
+            base *= 1.2 + 0.3 * uniform()
         
         base *= self._burst_speed_multiplier
         
         delay = self._apply_gaussian_variation(base)
         delay = self._apply_fatigue(delay)
         
-        if random.random() < 0.03:
-            delay += random.uniform(0.15, 0.4)
+        if uniform() < 0.03:
+            delay += 0.15 + 0.25 * uniform()
         
-        if random.random() < 0.08 and prev_char == ' ':
-            delay += random.uniform(0.1, 0.3)
+        if uniform() < 0.08 and prev_char == ' ':
+            delay += 0.1 + 0.2 * uniform()
         
         self.chars_typed += 1
         self._chars_in_current_burst += 1
@@ -74,31 +89,56 @@ class TimingEngine:
         return max(0.008, delay)
 
     def get_word_pause(self):
-        if random.random() < 0.15:
-            return random.uniform(0.2, 0.6)
+        uniform = self.rng.next_uniform
+        if uniform() < 0.15:
+            return 0.2 + 0.4 * uniform()
         return 0
 
+    def get_clause_pause(self):
+        return CLAUSE_PAUSE_MIN + (CLAUSE_PAUSE_MAX - CLAUSE_PAUSE_MIN) * self.rng.next_uniform()
+
     def get_think_pause(self):
-        base_pause = random.uniform(self.think_pause_min, self.think_pause_max)
-        if random.random() < 0.3:
-            base_pause *= random.uniform(1.2, 1.8)
+        if self.think_pause_quantiles:
+            return self._sample_quantiles(self.think_pause_quantiles)
+        base_pause = self.rng.uniform(self.think_pause_min, self.think_pause_max)
+        if self.rng.random() < 0.3:
+            base_pause *= self.rng.uniform(1.2, 1.8)
         return base_pause
 
+    def _sample_quantiles(self, quantiles):
+        position = self.rng.random() * (len(quantiles) - 1)
+        index = int(position)
+        if index >= len(quantiles) - 1:
+            return quantiles[-1]
+        low, high = quantiles[index], quantiles[index + 1]
+        return low + (high - low) * (position - index)
+
     def get_error_correction_delay(self):
-        return random.uniform(0.08, 0.2)
+        return 0.08 + 0.12 * self.rng.next_uniform()
+
+    def get_notice_delay(self):
+        delay = self.rng.lognormvariate(math.log(NOTICE_DELAY_MEDIAN), NOTICE_DELAY_SIGMA)
+        return min(1.5, max(0.12, delay))
 
     def get_formatting_delay(self):
-        return random.uniform(0.12, 0.3)
+        return 0.12 + 0.18 * self.rng.next_uniform()
 
     def estimate_total_time(self, total_chars, error_rate=0.03):
         base_time = (total_chars / (self.wpm * 5)) * 60
-        error_overhead = total_chars * error_rate * 0.25
+        overrun = sum((i + 1) * w for i, w in enumerate(ERROR_OVERRUN_WEIGHTS)) / sum(ERROR_OVERRUN_WEIGHTS)
+        notice = NOTICE_DELAY_MEDIAN * math.exp(NOTICE_DELAY_SIGMA ** 2 / 2)
+        episode_cost = notice + overrun * (0.14 + 60.0 / (self.wpm * 5))
+        error_overhead = total_chars * error_rate * episode_cost
         avg_sentences = total_chars / 80
         think_time = avg_sentences * ((self.think_pause_min + self.think_pause_max) / 2) / 3
+        clause_time = total_chars / 60 * (CLAUSE_PAUSE_MIN + CLAUSE_PAUSE_MAX) / 2
         hesitation_overhead = total_chars * 0.03 * 0.25
-        return base_time + error_overhead + think_time + hesitation_overhead
+        sleep_overhead = total_chars * self.sleep_overhead
+        return base_time + error_overhead + think_time + clause_time + hesitation_overhead + sleep_overhead
 
     def reset(self):
+        if self.seed is not None:
+            self.rng.seed(self.seed)
         self.chars_typed = 0
         self.fatigue_factor = 1.0
         self._burst_speed_multiplier = 1.0
@@ -0,0 +1,158 @@
+import json
+import math
+from typing import Iterable
+
+from config import (
+    KEYLOG_CHUNK_RECORDS, TRAIN_PAUSE_THRESHOLD, TRAIN_IDLE_THRESHOLD,
+    TRAIN_MIN_BIGRAM_COUNT, TRAIN_SENTENCE_CHARS, ERROR_OVERRUN_WEIGHTS
+)
+from engine.recorder import iter_log_chunks, SESSION_BREAK, KEY_BACKSPACE
+
+PROFILE_FORMAT = 1
+QUANTILES = [i / 10 for i in range(11)]
+
+class LogHistogram:
+    def __init__(self, low, high, buckets=64):
+        self.low = low
+        self.high = high
+        self.counts = [0] * buckets
+        self._log_low = math.log(low)
+        self._scale = buckets / (math.log(high) - self._log_low)
+        self.total = 0
+
+    def add(self, value):
+        index = int((math.log(max(value, self.low)) - self._log_low) * self._scale)
+        self.counts[min(max(index, 0), len(self.counts) - 1)] += 1
+        self.total += 1
+
+    def _bucket_edge(self, index):
+        return math.exp(self._log_low + index / self._scale)
+
+    def quantiles(self, qs):
+        if self.total == 0:
+            return []
+        result = []
+        for q in qs:
+            target = q * self.total
+            seen = 0
+            for i, count in enumerate(self.counts):
+                if count and seen + count >= target:
+                    fraction = (target - seen) / count
+                    low, high = self._bucket_edge(i), self._bucket_edge(i + 1)
+                    result.append(low + (high - low) * fraction)
+                    break
+                seen += count
+            else:
+                result.append(self.high)
+        return result
+
+class ProfileTrainer:
+    def __init__(self, pause_threshold=TRAIN_PAUSE_THRESHOLD,
+                 idle_threshold=TRAIN_IDLE_THRESHOLD,
+                 min_bigram_count=TRAIN_MIN_BIGRAM_COUNT):
+        self.pause_threshold = pause_threshold
+        self.idle_threshold = idle_threshold
+        self.min_bigram_count = min_bigram_count
+        self.reset()
+
+    def reset(self):
+        self.keystrokes = 0
+        self.backspaces = 0
+        self.latency_sum = 0.0
+        self.latency_count = 0
+        self.bigram_sums = {}
+        self.bigram_counts = {}
+        self.pauses = LogHistogram(self.pause_threshold, self.idle_threshold)
+        self.burst_count = 0
+        self.burst_sum = 0
+        self.burst_sq_sum = 0
+        self._current_burst = 0
+        self._prev_char = ''
+
+    def _end_burst(self):
+        if self._current_burst:
+            self.burst_count += 1
+            self.burst_sum += self._current_burst
+            self.burst_sq_sum += self._current_burst * self._current_burst
+        self._current_burst = 0
+
+    def feed(self, records: Iterable[tuple]):
+        for delta_us, code in records:
+            self.keystrokes += 1
+            if delta_us == SESSION_BREAK:
+                self._end_burst()
+                self._prev_char = ''
+            else:
+                delta = delta_us / 1_000_000
+                if delta >= self.idle_threshold:
+                    self._end_burst()
+                    self._prev_char = ''
+                elif delta >= self.pause_threshold:
+                    self.pauses.add(delta)
+                    self._end_burst()
+                elif code != KEY_BACKSPACE and self._prev_char:
+                    self.latency_sum += delta
+                    self.latency_count += 1
+                    bigram = (self._prev_char + chr(code)).lower()
+                    self.bigram_sums[bigram] = self.bigram_sums.get(bigram, 0.0) + delta
+                    self.bigram_counts[bigram] = self.bigram_counts.get(bigram, 0) + 1
+            if code == KEY_BACKSPACE:
+                self.backspaces += 1
+                self._prev_char = ''
+            else:
+                self._prev_char = chr(code)
+            self._current_burst += 1
+
+    def train_file(self, path, chunk_records=KEYLOG_CHUNK_RECORDS):
+        for chunk in iter_log_chunks(path, chunk_records):
+            self.feed(chunk)
+        return self.build_profile()
+
+    def build_profile(self) -> dict:
+        self._end_burst()
+        mean_latency = self.latency_sum / self.latency_count if self.latency_count else 0.0
+        bigram_factors = {}
+        if mean_latency > 0:
+            for bigram, count in self.bigram_counts.items():
+                if count >= self.min_bigram_count:
+                    factor = self.bigram_sums[bigram] / count / mean_latency
+                    bigram_factors[bigram] = round(factor, 4)
+        typed = self.keystrokes - self.backspaces
+        burst_mean = self.burst_sum / self.burst_count if self.burst_count else 0.0
+        burst_var = self.burst_sq_sum / self.burst_count - burst_mean ** 2 if self.burst_count else 0.0
+        return {
+            'format': PROFILE_FORMAT,
+            'keystrokes': self.keystrokes,
+            'mean_latency': mean_latency,
+            'wpm': 60.0 / (mean_latency * 5) if mean_latency else 0.0,
+            'bigram_factors': bigram_factors,
+            'think_pause_quantiles': self.pauses.quantiles(QUANTILES),
+            'error_rate': self.backspaces / typed if typed > 0 else 0.0,
+            'burst_mean': burst_mean,
+            'burst_std': math.sqrt(max(0.0, burst_var)),
+        }
+
+def typer_settings(profile: dict) -> dict:
+    settings = {}
+    if profile.get('wpm'):
+        settings['wpm'] = max(1, round(profile['wpm']))
+    if 'error_rate' in profile:
+        overrun = sum((i + 1) * w for i, w in enumerate(ERROR_OVERRUN_WEIGHTS)) / sum(ERROR_OVERRUN_WEIGHTS)
+        settings['error_rate'] = round(profile['error_rate'] / overrun, 4)
+    if profile.get('burst_mean'):
+        spread = profile.get('burst_std', 0.0)
+        settings['burst_min'] = max(1, round((profile['burst_mean'] - spread) / TRAIN_SENTENCE_CHARS))
+        settings['burst_max'] = max(settings['burst_min'],
+                                    round((profile['burst_mean'] + spread) / TRAIN_SENTENCE_CHARS))
+    return settings
+
+def save_timing_profile(profile: dict, path):
+    with open(path, "w") as f:
+        json.dump(profile, f, indent=1, sort_keys=True)
+
+def load_timing_profile(path) -> dict:
+    with open(path) as f:
+        profile = json.load(f)
+    if profile.get('format') != PROFILE_FORMAT:
+        raise ValueError(f"Unsupported timing profile format in {path}")
+    return profile
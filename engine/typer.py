@@ -1,163 +1,412 @@
-import random
+import gc
 import time
+import asyncio
 import threading
 from typing import Callable, Optional
-from pynput.keyboard import Key, Controller
 
-from config import IS_MAC, KEYBOARD_ADJACENT
+from config import (
+    KEYBOARD_LAYOUT, DEFAULT_TARGET, DEFAULT_CHUNK_UNIT, DEFAULT_MAX_EVENTS_PER_SECOND,
+    DOCUMENT_WINDOW_CHARS, PAUSE_GC_WHILE_TYPING, GC_RELEASE_DELAY, GC_REARM_MARGIN
+)
 from engine.timing import TimingEngine
-from engine.markdown_parser import MarkdownParser, InstructionType
+from engine.markdown_parser import MarkdownParser
+from engine.layouts import get_layout
+from engine.planner import (
+    Planner, ChunkPlanner, KeystrokePlan,
+    OP_TYPE, OP_KEY, OP_CHORD, MODE_HUMAN, MODE_CHUNKED
+)
+from engine.targets import get_target
+from engine.backends import PynputBackend
+from engine.documents import open_document
+from engine.clock import PreciseSleeper
+from engine.revisions import RevisionPlanner
+from engine.plancache import plan_key
+
+_gc_lock = threading.Lock()
+_gc_holders = 0
+_gc_waiting = 0
+_gc_was_enabled = True
+
+def hold_gc():
+    global _gc_holders, _gc_was_enabled
+    with _gc_lock:
+        if not _gc_holders:
+            _gc_was_enabled = gc.isenabled()
+            gc.collect()
+            gc.freeze()
+            gc.disable()
+        _gc_holders += 1
+
+def release_gc():
+    global _gc_holders
+    with _gc_lock:
+        _gc_holders -= 1
+        if not _gc_holders:
+            gc.unfreeze()
+            if _gc_was_enabled:
+                gc.enable()
+
+def wait_gc():
+    global _gc_waiting
+    with _gc_lock:
+        _gc_waiting += 1
+        if _gc_waiting == _gc_holders and _gc_was_enabled:
+            gc.enable()
+
+def resume_gc():
+    global _gc_waiting
+    with _gc_lock:
+        _gc_waiting -= 1
+        gc.disable()
+
+def _event_rate(value):
+    if value <= 0:
+        raise ValueError(f"max_events_per_second must be positive, got {value}")
+    return value
 
 class Typer:
     def __init__(self, wpm=60, error_rate=0.03, burst_min=2, burst_max=4,
-                 think_pause_min=1.0, think_pause_max=3.0):
-        self.keyboard = Controller()
+                 think_pause_min=1.0, think_pause_max=3.0, seed=None,
+                 layout=KEYBOARD_LAYOUT, target=DEFAULT_TARGET, backend=None, mode=MODE_HUMAN,
+                 chunk=DEFAULT_CHUNK_UNIT, chunk_jitter=0.0,
+                 max_events_per_second=DEFAULT_MAX_EVENTS_PER_SECOND,
+                 rate_controller=None, pause_gc=PAUSE_GC_WHILE_TYPING, plan_cache=None,
+                 metrics=None):
+        self.backend = backend if backend is not None else PynputBackend()
         self.timing = TimingEngine(
             wpm=wpm,
             think_pause_min=think_pause_min,
-            think_pause_max=think_pause_max
+            think_pause_max=think_pause_max,
+            seed=seed
         )
+        self.rng = self.timing.rng
         self.parser = MarkdownParser()
+        self.layout = get_layout(layout)
+        self.target = get_target(target).name
         self.error_rate = error_rate
         self.burst_min = burst_min
         self.burst_max = burst_max
+        self.mode = mode
+        self.chunk = chunk
+        self.chunk_jitter = chunk_jitter
+        self.max_events_per_second = _event_rate(max_events_per_second)
+        self.achieved_cps = 0.0
+        self.rate_controller = rate_controller
+        self.pause_gc = pause_gc
+        self.plan_cache = plan_cache
+        self.metrics = metrics
+        self.sleep = time.sleep
+        self.profile_key = None
+        self._estimate_cache = {}
         
         self._paused = False
         self._cancelled = False
+        self._gc_held = False
         self._lock = threading.Lock()
         
         self.on_progress: Optional[Callable[[int, int], None]] = None
         self.on_complete: Optional[Callable[[], None]] = None
 
-    def _modifier_key(self):
-        return Key.cmd if IS_MAC else Key.ctrl
-
-    def _press_shortcut(self, *keys):
-        time.sleep(self.timing.get_formatting_delay())
-        for key in keys:
-            self.keyboard.press(key)
-        for key in reversed(keys):
-            self.keyboard.release(key)
-        time.sleep(self.timing.get_formatting_delay())
-
-    def _toggle_bold(self):
-        self._press_shortcut(self._modifier_key(), 'b')
-
-    def _toggle_italic(self):
-        self._press_shortcut(self._modifier_key(), 'i')
-
-    def _apply_heading_size(self, level):
-        decrease_times = 4 - level
-        for _ in range(decrease_times):
-            self._press_shortcut(self._modifier_key(), Key.shift, '.')
-            time.sleep(0.1)
-
-    def _get_adjacent_key(self, char):
-        lower = char.lower()
-        if lower in KEYBOARD_ADJACENT:
-            adjacent = random.choice(KEYBOARD_ADJACENT[lower])
-            return adjacent.upper() if char.isupper() else adjacent
-        return char
-
-    def _type_with_possible_error(self, char, prev_char):
-        if char.isalpha() and random.random() < self.error_rate:
-            wrong_char = self._get_adjacent_key(char)
-            self.keyboard.type(wrong_char)
-            time.sleep(self.timing.get_error_correction_delay())
-            self.keyboard.press(Key.backspace)
-            self.keyboard.release(Key.backspace)
-            time.sleep(self.timing.get_error_correction_delay())
-        
-        self.keyboard.type(char)
-        delay = self.timing.get_keystroke_delay(prev_char, char)
-        time.sleep(delay)
+    def apply_profile(self, profile):
+        if profile.key == self.profile_key:
+            return False
+        settings = profile.typer
+        max_events_per_second = _event_rate(settings.get('max_events_per_second', self.max_events_per_second))
+        self.error_rate = settings.get('error_rate', self.error_rate)
+        self.burst_min = settings.get('burst_min', self.burst_min)
+        self.burst_max = settings.get('burst_max', self.burst_max)
+        self.timing.wpm = settings.get('wpm', self.timing.wpm)
+        self.timing.think_pause_min = settings.get('think_pause_min', self.timing.think_pause_min)
+        self.timing.think_pause_max = settings.get('think_pause_max', self.timing.think_pause_max)
+        self.layout = get_layout(settings.get('layout', self.layout.name))
+        self.target = get_target(settings.get('target', self.target)).name
+        self.mode = settings.get('mode', self.mode)
+        self.chunk = settings.get('chunk', self.chunk)
+        self.chunk_jitter = settings.get('chunk_jitter', self.chunk_jitter)
+        self.max_events_per_second = max_events_per_second
+        self.timing.load_profile(profile.timing)
+        self.timing.seed = profile.seed
+        self.timing.rng.seed(profile.seed)
+        self.profile_key = profile.key
+        self._estimate_cache.clear()
+        return True
+
+    def _hold_gc(self):
+        if not self._gc_held:
+            hold_gc()
+            self._gc_held = True
+
+    def _release_gc(self):
+        if self._gc_held:
+            release_gc()
+            self._gc_held = False
 
     def _check_pause(self):
-        while self._paused and not self._cancelled:
-            time.sleep(0.1)
+        if self._paused and not self._cancelled:
+            held = self._gc_held
+            self._release_gc()
+            paused_at = time.perf_counter()
+            while self._paused and not self._cancelled:
+                time.sleep(0.1)
+            if self.metrics is not None:
+                self.metrics.paused(time.perf_counter() - paused_at)
+            if held:
+                self._hold_gc()
         return not self._cancelled
 
-    def _should_burst_pause(self, text_so_far):
-        sentence_enders = '.!?'
-        count = sum(1 for c in text_so_far if c in sentence_enders)
-        if not hasattr(self, '_last_burst_count'):
-            self._last_burst_count = 0
-            self._next_burst_at = random.randint(self.burst_min, self.burst_max)
-        
-        if count >= self._last_burst_count + self._next_burst_at:
-            self._last_burst_count = count
-            self._next_burst_at = random.randint(self.burst_min, self.burst_max)
+    def _sleep(self, delay, sleep, clock):
+        if delay < GC_RELEASE_DELAY or not self._gc_held:
+            sleep(delay)
+            return
+        deadline = clock() + delay
+        wait_gc()
+        try:
+            sleep(delay - GC_REARM_MARGIN)
+        finally:
+            resume_gc()
+        remaining = deadline - clock()
+        if remaining > 0:
+            sleep(remaining)
+
+    def _burst_due(self, sentence_count, force=False):
+        if force or sentence_count >= self._last_burst_count + self._next_burst_at:
+            self._last_burst_count = sentence_count
+            self._next_burst_at = self.rng.randint(self.burst_min, self.burst_max)
             return True
         return False
 
-    def type_markdown(self, markdown_text: str):
-        self._paused = False
-        self._cancelled = False
-        self._last_burst_count = 0
-        self._next_burst_at = random.randint(self.burst_min, self.burst_max)
+    def _new_planner(self):
         self.timing.reset()
+        self._last_burst_count = 0
+        self._next_burst_at = self.rng.randint(self.burst_min, self.burst_max)
         self.timing.start_new_burst()
-        
-        instructions = self.parser.parse(markdown_text)
-        total_chars = self.parser.get_plain_text_length(markdown_text)
-        chars_typed = 0
-        prev_char = ''
-        typed_text = ''
-        
-        for instruction in instructions:
+        return ChunkPlanner(self) if self.mode == MODE_CHUNKED else Planner(self)
+
+    def _plan_cache_key(self, markdown_text):
+        if self.plan_cache is None or self.timing.seed is None:
+            return None
+        return plan_key(self, markdown_text)
+
+    def plan(self, markdown_text: str) -> KeystrokePlan:
+        key = self._plan_cache_key(markdown_text)
+        if key is not None:
+            cached = self.plan_cache.get(key)
+            if cached is not None:
+                return cached
+        planner = self._new_planner()
+        if self.parser.is_plain(markdown_text):
+            plan = planner.build_plain(markdown_text)
+        else:
+            plan = planner.build(self.parser.parse(markdown_text))
+        if key is not None:
+            self.plan_cache.put(key, plan)
+        return plan
+
+    def plan_revision(self, previous_markdown: str, markdown_text: str) -> KeystrokePlan:
+        planner = RevisionPlanner(self, self._new_planner())
+        return planner.build(self.parser.parse(previous_markdown), self.parser.parse(markdown_text))
+
+    def plan_windows(self, windows):
+        planner = self._new_planner()
+        planner.carry_boundaries()
+        for text in windows:
+            planner.plan = KeystrokePlan()
+            if self.parser.is_plain(text):
+                yield planner.build_plain(text, final=False)
+            else:
+                yield planner.build(self.parser.parse(text), final=False)
+        planner.plan = KeystrokePlan()
+        yield planner.build([])
+
+    def _prepare_backend(self, plan):
+        prepare = getattr(self.backend, 'prepare', None)
+        if prepare is not None:
+            prepare(plan.characters())
+
+    def _execute_ops(self, plan, total_chars, sleep, clock):
+        backend = self.backend
+        controller = self.rate_controller
+        metrics = self.metrics
+        ops, args = plan.ops.tolist(), plan.args
+        delays, progress = plan.delays.tolist(), plan.progress.tolist()
+        error_ops = plan.error_ops.tolist() + [len(ops)]
+        self._prepare_backend(plan)
+        reported = errors = 0
+        for index in range(len(ops)):
             if not self._check_pause():
-                return
-            
-            if instruction.type == InstructionType.TEXT:
-                for char in instruction.content:
-                    if not self._check_pause():
-                        return
-                    
-                    if prev_char == ' ':
-                        word_pause = self.timing.get_word_pause()
-                        if word_pause > 0:
-                            time.sleep(word_pause)
-                    
-                    self._type_with_possible_error(char, prev_char)
-                    prev_char = char
-                    typed_text += char
-                    chars_typed += 1
-                    
-                    if self.on_progress:
-                        self.on_progress(chars_typed, total_chars)
-                    
-                    if self._should_burst_pause(typed_text):
-                        pause_time = self.timing.get_think_pause()
-                        time.sleep(pause_time)
-                        self.timing.start_new_burst()
-            
-            elif instruction.type == InstructionType.BOLD_START:
-                self._toggle_bold()
-            elif instruction.type == InstructionType.BOLD_END:
-                self._toggle_bold()
-            elif instruction.type == InstructionType.ITALIC_START:
-                self._toggle_italic()
-            elif instruction.type == InstructionType.ITALIC_END:
-                self._toggle_italic()
-            elif instruction.type == InstructionType.HEADING_START:
-                self._apply_heading_size(instruction.heading_level)
-            elif instruction.type == InstructionType.HEADING_END:
-                pass
-            elif instruction.type == InstructionType.NEWLINE:
-                if not self._check_pause():
-                    return
-                self.keyboard.press(Key.enter)
-                self.keyboard.release(Key.enter)
-                chars_typed += 1
-                prev_char = '\n'
-                typed_text += '\n'
-                time.sleep(self.timing.get_keystroke_delay('\n', '\n'))
+                return False
+            op = ops[index]
+            delay = delays[index]
+            if controller is not None:
+                delay = controller.wait_before(delay, op == OP_CHORD)
+            if delay > 0:
+                self._sleep(delay, sleep, clock)
+            if controller is not None or metrics is not None:
+                injected_at = clock()
+            if metrics is not None:
+                metrics.keystroke(delay, injected_at)
+                if index == error_ops[errors]:
+                    metrics.errors += 1
+                    errors += 1
+            if op == OP_TYPE:
+                backend.type(args[index])
+            elif op == OP_KEY:
+                backend.tap(args[index])
+            else:
+                backend.chord(args[index])
+            if controller is not None:
+                controller.observe(clock() - injected_at)
+            if progress[index] != reported:
+                reported = progress[index]
+                if metrics is not None:
+                    metrics.chars = reported
                 if self.on_progress:
-                    self.on_progress(chars_typed, total_chars)
-        
+                    self.on_progress(reported, total_chars)
+        return True
+
+    def slow_characters(self, text):
+        positions = self.layout.positions
+        return sorted(char for char in set(text) if char not in positions and not char.isspace())
+
+    def _finish(self, typed_chars, elapsed):
+        self.achieved_cps = typed_chars / elapsed if elapsed > 0 else 0.0
         if self.on_complete:
             self.on_complete()
 
+    def use_calibration(self, calibration):
+        self.sleep = PreciseSleeper(calibration)
+        self.timing.sleep_overhead = self.sleep.expected_overshoot
+        self._estimate_cache.clear()
+
+    def execute(self, plan: KeystrokePlan, sleep=None, clock=time.perf_counter):
+        return self.execute_windows([plan], plan.total_chars, sleep, clock)
+
+    def execute_windows(self, plans, total_chars, sleep=None, clock=time.perf_counter):
+        sleep = sleep or self.sleep
+        if self.rate_controller is not None:
+            self.rate_controller.reset()
+        typed_chars = 0
+        started = clock()
+        if self.metrics is not None:
+            self.metrics.start_session(self.timing.wpm, started)
+        completed = False
+        try:
+            if self.pause_gc:
+                self._hold_gc()
+            for plan in plans:
+                if not self._execute_ops(plan, total_chars, sleep, clock):
+                    return False
+                typed_chars = plan.total_chars
+            completed = True
+        finally:
+            self._release_gc()
+            if self.metrics is not None:
+                self.metrics.end_session(completed)
+        self._finish(typed_chars, clock() - started)
+        return True
+
+    def type_document(self, source, window_chars=DOCUMENT_WINDOW_CHARS,
+                      sleep=None, clock=time.perf_counter):
+        self.reset_controls()
+        with open_document(source) as document:
+            total_chars = document.count_chars(self.parser, window_chars)
+            plans = self.plan_windows(document.windows(window_chars))
+            return self.execute_windows(plans, total_chars, sleep, clock)
+
+    async def execute_async(self, plan: KeystrokePlan):
+        loop = asyncio.get_running_loop()
+        backend = self.backend
+        controller = self.rate_controller
+        if controller is not None:
+            controller.reset()
+        ops, args, delays, progress = plan.ops, plan.args, plan.delays, plan.progress
+        error_ops = list(plan.error_ops) + [len(ops)]
+        total_chars = plan.total_chars
+        metrics = self.metrics
+        self._prepare_backend(plan)
+        reported = errors = 0
+        started = deadline = loop.time()
+        if metrics is not None:
+            metrics.start_session(self.timing.wpm, started)
+        completed = False
+        try:
+            if self.pause_gc:
+                self._hold_gc()
+            for index in range(len(ops)):
+                if self._paused and not self._cancelled:
+                    held = self._gc_held
+                    self._release_gc()
+                    paused_at = loop.time()
+                    while self._paused and not self._cancelled:
+                        await asyncio.sleep(0.1)
+                    deadline = loop.time()
+                    if metrics is not None:
+                        metrics.paused(deadline - paused_at)
+                    if held:
+                        self._hold_gc()
+                if self._cancelled:
+                    return
+                op = ops[index]
+                delay = delays[index]
+                if controller is not None:
+                    delay = controller.wait_before(delay, op == OP_CHORD)
+                deadline += delay
+                wait = deadline - loop.time() - self.timing.sleep_overhead
+                if wait >= GC_RELEASE_DELAY and self._gc_held:
+                    wait_gc()
+                    try:
+                        await asyncio.sleep(wait - GC_REARM_MARGIN)
+                    finally:
+                        resume_gc()
+                    wait = deadline - loop.time() - self.timing.sleep_overhead
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                injected_at = loop.time()
+                if metrics is not None:
+                    metrics.keystroke(delay, injected_at)
+                    if index == error_ops[errors]:
+                        metrics.errors += 1
+                        errors += 1
+                if op == OP_TYPE:
+                    backend.type(args[index])
+                elif op == OP_KEY:
+                    backend.tap(args[index])
+                else:
+                    backend.chord(args[index])
+                if controller is not None:
+                    controller.observe(loop.time() - injected_at)
+                if progress[index] != reported:
+                    reported = progress[index]
+                    if metrics is not None:
+                        metrics.chars = reported
+                    yield reported, total_chars
+            completed = True
+        finally:
+            self._release_gc()
+            if metrics is not None:
+                metrics.end_session(completed)
+        self._finish(total_chars, loop.time() - started)
+
+    async def type_markdown_async(self, markdown_text: str):
+        self.reset_controls()
+        plan = self.plan(markdown_text)
+        async for update in self.execute_async(plan):
+            yield update
+
+    def type_markdown(self, markdown_text: str):
+        self.reset_controls()
+        plan = self.plan(markdown_text)
+        self.execute(plan)
+
+    def type_revision(self, previous_markdown: str, markdown_text: str):
+        self.reset_controls()
+        return self.execute(self.plan_revision(previous_markdown, markdown_text))
+
+    def reset_controls(self):
+        with self._lock:
+            self._paused = False
+            self._cancelled = False
+
     def pause(self):
         with self._lock:
             self._paused = True
@@ -175,6 +424,18 @@ class Typer:
         return self._paused
 
     def estimate_time(self, markdown_text: str):
-        total_chars = self.parser.get_plain_text_length(markdown_text)
-        return self.timing.estimate_total_time(total_chars, self.error_rate)
+        cached = self._estimate_cache.get(markdown_text)
+        if cached is not None:
+            return cached
+        key = self._plan_cache_key(markdown_text)
+        plan = self.plan_cache.get(key) if key is not None else None
+        if plan is not None:
+            estimate = plan.duration() + self.timing.sleep_overhead * plan.total_chars
+        else:
+            total_chars = self.parser.get_plain_text_length(markdown_text)
+            estimate = self.timing.estimate_total_time(total_chars, self.error_rate)
+        if len(self._estimate_cache) >= 32:
+            self._estimate_cache.clear()
+        self._estimate_cache[markdown_text] = estimate
+        return estimate
 
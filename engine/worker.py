@@ -0,0 +1,171 @@
+import multiprocessing
+import threading
+import queue
+from typing import Callable, Optional
+
+MSG_TYPE = "type"
+MSG_PAUSE = "pause"
+MSG_RESUME = "resume"
+MSG_CANCEL = "cancel"
+MSG_QUIT = "quit"
+MSG_PROGRESS = "progress"
+MSG_DONE = "done"
+
+BACKEND_PYNPUT = "pynput"
+BACKEND_RECORDING = "recording"
+
+def _serve(conn, backend_name, rate_control, calibration, cache_plans):
+    from engine.typer import Typer
+    from engine.backends import RecordingBackend
+    from engine.rate import AdaptiveRateController
+    from engine.plancache import PlanCache
+
+    recording = backend_name == BACKEND_RECORDING
+    typer = Typer(backend=RecordingBackend() if recording else None,
+                  rate_controller=AdaptiveRateController() if rate_control else None,
+                  plan_cache=PlanCache() if cache_plans else None)
+    if calibration is not None:
+        typer.use_calibration(calibration)
+    typer.on_progress = lambda current, total: conn.send((MSG_PROGRESS, current, total))
+    jobs = queue.Queue()
+
+    def listen():
+        while True:
+            try:
+                message = conn.recv()
+            except (EOFError, OSError):
+                message = (MSG_QUIT,)
+            kind = message[0]
+            if kind == MSG_TYPE:
+                typer.reset_controls()
+                jobs.put(message)
+            elif kind == MSG_PAUSE:
+                typer.pause()
+            elif kind == MSG_RESUME:
+                typer.resume()
+            elif kind == MSG_CANCEL:
+                typer.cancel()
+            elif kind == MSG_QUIT:
+                typer.cancel()
+                jobs.put(message)
+                return
+
+    threading.Thread(target=listen, daemon=True).start()
+    while True:
+        message = jobs.get()
+        if message[0] == MSG_QUIT:
+            break
+        _, text, profile = message
+        if recording:
+            typer.backend = RecordingBackend()
+        try:
+            if profile is not None:
+                typer.apply_profile(profile)
+            completed, error = typer.execute(typer.plan(text)), None
+        except Exception as e:
+            completed, error = False, f"{type(e).__name__}: {e}"
+        conn.send((MSG_DONE, completed, typer.achieved_cps, typer.backend.events if recording else None, error))
+    conn.close()
+
+class ProcessTyper:
+    def __init__(self, backend=BACKEND_PYNPUT, rate_control=True, calibration=None, cache_plans=False):
+        from engine.typer import Typer
+        from engine.backends import RecordingBackend
+        from engine.plancache import PlanCache
+
+        self.local = Typer(backend=RecordingBackend(), plan_cache=PlanCache() if cache_plans else None)
+        if calibration is not None:
+            self.local.use_calibration(calibration)
+        self.profile = None
+        self.achieved_cps = 0.0
+        self.events = None
+        self.error = None
+        self.on_progress: Optional[Callable[[int, int], None]] = None
+        self.on_complete: Optional[Callable[[], None]] = None
+        self._paused = False
+        self._completed = False
+        self._alive = True
+        self._done = threading.Event()
+        self._send_lock = threading.Lock()
+
+        context = multiprocessing.get_context("spawn")
+        self._conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_serve, daemon=True,
+                                       args=(child_conn, backend, rate_control, calibration, cache_plans))
+        self.process.start()
+        child_conn.close()
+        threading.Thread(target=self._listen, daemon=True).start()
+
+    def _send(self, *message):
+        with self._send_lock:
+            try:
+                self._conn.send(message)
+                return True
+            except (OSError, ValueError):
+                return False
+
+    def _listen(self):
+        while True:
+            try:
+                message = self._conn.recv()
+            except (EOFError, OSError):
+                self._alive = False
+                self._done.set()
+                return
+            if message[0] == MSG_PROGRESS:
+                if self.on_progress:
+                    self.on_progress(message[1], message[2])
+            elif message[0] == MSG_DONE:
+                _, self._completed, self.achieved_cps, self.events, self.error = message
+                if self._completed and self.on_complete:
+                    self.on_complete()
+                self._done.set()
+
+    def apply_profile(self, profile):
+        changed = self.local.apply_profile(profile)
+        self.profile = profile
+        return changed
+
+    def estimate_time(self, markdown_text: str):
+        return self.local.estimate_time(markdown_text)
+
+    def slow_characters(self, text):
+        return self.local.slow_characters(text)
+
+    def is_alive(self):
+        return self._alive and self.process.is_alive()
+
+    def type_markdown(self, markdown_text: str):
+        self._paused = False
+        self._completed = False
+        self.error = None
+        self._done.clear()
+        if not self.is_alive() or not self._send(MSG_TYPE, markdown_text, self.profile):
+            self.error = "typing process is not running"
+            return False
+        self._done.wait()
+        if not self._alive and self.error is None:
+            self.error = "typing process exited"
+        return self._completed
+
+    def pause(self):
+        self._paused = True
+        self._send(MSG_PAUSE)
+
+    def resume(self):
+        self._paused = False
+        self._send(MSG_RESUME)
+
+    def cancel(self):
+        self._paused = False
+        self._send(MSG_CANCEL)
+
+    def is_paused(self):
+        return self._paused
+
+    def close(self):
+        self._send(MSG_QUIT)
+        self.process.join(timeout=2)
+        if self.process.is_alive():
+            self.process.terminate()
+        self._conn.close()
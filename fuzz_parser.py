@@ -0,0 +1,117 @@
+import argparse
+import json
+import math
+import os
+import random
+import time
+
+from engine.markdown_parser import MarkdownParser
+
+CASES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'parser_cases.json')
+ATOMS = ('*', '**', '_', '__', '~~', '`', '[', ']', '(', ')', '](', '\\', 'a', 'b ', ' ', '\n',
+         '# ', '> ', '- ', '1. ')
+PREFIXES = ('', '# ', '> ', '- ', '1. ', '**', '*', '_', '`', '[', '~~')
+SUFFIXES = ('', '**', '*', '_', '`', ']', '](u)', '~~', '\n')
+SIZES = (200, 400, 800, 1600, 3200)
+EXPONENT_LIMIT = 1.3
+TIME_BUDGET = 0.25
+
+def family_text(family, size):
+    prefix, unit, suffix = family
+    return prefix + unit * max(1, (size - len(prefix) - len(suffix)) // len(unit)) + suffix
+
+def parse_time(parse, text, runs=3):
+    best = float('inf')
+    for _ in range(runs):
+        started = time.perf_counter()
+        parse(text)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def growth_exponent(parse, family, sizes=SIZES, measure=parse_time, budget=TIME_BUDGET):
+    points = []
+    for size in sizes:
+        text = family_text(family, size)
+        elapsed = measure(parse, text)
+        points.append((math.log(len(text)), math.log(max(elapsed, 1e-9))))
+        if elapsed > budget and len(points) >= 3:
+            break
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    spread = sum((x - mean_x) ** 2 for x, _ in points)
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / spread if spread else 0.0
+
+def random_family(rng):
+    unit = ''.join(rng.choice(ATOMS) for _ in range(rng.randint(1, 4)))
+    return rng.choice(PREFIXES), unit, rng.choice(SUFFIXES)
+
+def _shrinks(family):
+    for part, text in enumerate(family):
+        for index in range(len(text)):
+            smaller = text[:index] + text[index + 1:]
+            if part == 1 and not smaller:
+                continue
+            yield family[:part] + (smaller,) + family[part + 1:]
+
+def minimize(parse, family, limit=EXPONENT_LIMIT, **kwargs):
+    shrunk = True
+    while shrunk:
+        shrunk = False
+        for candidate in _shrinks(family):
+            if growth_exponent(parse, candidate, **kwargs) > limit:
+                family = candidate
+                shrunk = True
+                break
+    return family
+
+def load_cases(path=CASES_PATH):
+    try:
+        with open(path) as f:
+            return {tuple(case['family']): case['exponent'] for case in json.load(f)}
+    except FileNotFoundError:
+        return {}
+
+def save_cases(cases, path=CASES_PATH):
+    with open(path, 'w') as f:
+        json.dump([{'family': list(family), 'exponent': round(exponent, 2)} for family, exponent in cases.items()],
+                  f, indent=1)
+        f.write('\n')
+
+def fuzz(parse, families=200, seed=0, limit=EXPONENT_LIMIT, **kwargs):
+    rng = random.Random(seed)
+    found = {}
+    for _ in range(families):
+        family = random_family(rng)
+        if growth_exponent(parse, family, **kwargs) <= limit:
+            continue
+        family = minimize(parse, family, limit, **kwargs)
+        if family not in found and growth_exponent(parse, family, **kwargs) > limit:
+            found[family] = growth_exponent(parse, family, **kwargs)
+            print(f"super-linear: {family!r}  exponent {found[family]:.2f}")
+    return found
+
+def main():
+    parser = argparse.ArgumentParser(description="Search for markdown inputs that parse in super-linear time")
+    parser.add_argument("--families", type=int, default=200, help="random input families to try")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--limit", type=float, default=EXPONENT_LIMIT, help="largest acceptable growth exponent")
+    parser.add_argument("--retime", action="store_true",
+                        help="re-record every saved case's exponent against the current parser")
+    args = parser.parse_args()
+    parse = MarkdownParser().parse
+    cases = load_cases()
+    if args.retime:
+        cases = {family: growth_exponent(parse, family) for family in cases}
+        save_cases(cases)
+        for family, exponent in cases.items():
+            print(f"{family!r}  exponent {exponent:.2f}")
+        return
+    found = fuzz(parse, args.families, args.seed, args.limit)
+    new = {family: exponent for family, exponent in found.items() if family not in cases}
+    if new:
+        cases.update(new)
+        save_cases(cases)
+    print(f"{len(found)} super-linear families, {len(new)} new; {len(cases)} cases in {CASES_PATH}")
+
+if __name__ == "__main__":
+    main()
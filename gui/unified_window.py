@@ -1,6 +1,6 @@
+import threading
 import customtkinter as ctk
 from typing import Callable, Optional
-import pyperclip
 
 from config import (
     DEFAULT_WPM, DEFAULT_ERROR_RATE,
@@ -11,6 +11,17 @@ from config import (
 
 ctk.set_appearance_mode("dark")
 
+def slider_settings(wpm, errors, pause, burst):
+    burst_max = int(burst)
+    return {
+        'wpm': int(wpm),
+        'error_rate': errors / 100,
+        'burst_min': max(1, burst_max - 2),
+        'burst_max': burst_max,
+        'think_pause_min': max(0.5, pause - 1.0),
+        'think_pause_max': pause
+    }
+
 class UnifiedWindow(ctk.CTk):
     STATE_IDLE = "idle"
     STATE_EXPANDED = "expanded"
@@ -62,7 +73,7 @@ class UnifiedWindow(ctk.CTk):
         
         self._create_widgets()
         self._bind_events()
-        self._load_clipboard()
+        self.after(0, self._load_clipboard)
         
         self._keep_on_top()
 
@@ -334,15 +345,24 @@ class UnifiedWindow(ctk.CTk):
         self.geometry(f"+{x}+{y}")
 
     def _load_clipboard(self):
+        threading.Thread(target=self._read_clipboard, daemon=True).start()
+
+    def _read_clipboard(self):
         try:
+            import pyperclip
             clipboard = pyperclip.paste()
-            if clipboard and clipboard.strip():
-                self.text_input.delete("0.0", "end")
-                self.text_input.insert("0.0", clipboard)
-                self._clipboard_loaded = True
-                self._update_start_button()
         except:
-            pass
+            return
+        if clipboard and clipboard.strip():
+            self.after(0, lambda: self._apply_clipboard(clipboard))
+
+    def _apply_clipboard(self, clipboard):
+        if self._get_text_content().strip():
+            return
+        self.text_input.delete("0.0", "end")
+        self.text_input.insert("0.0", clipboard)
+        self._clipboard_loaded = True
+        self._update_start_button()
 
     def _on_text_focus(self, event):
         pass
@@ -495,18 +515,21 @@ class UnifiedWindow(ctk.CTk):
         self.destroy()
 
     def get_settings(self):
-        burst_max = int(self.burst_slider.get())
-        burst_min = max(1, burst_max - 2)
-        pause_val = self.pause_slider.get()
-        
-        return {
-            'wpm': int(self.speed_slider.get()),
-            'error_rate': self.errors_slider.get() / 100,
-            'burst_min': burst_min,
-            'burst_max': burst_max,
-            'think_pause_min': max(0.5, pause_val - 1.0),
-            'think_pause_max': pause_val
-        }
+        return slider_settings(self.speed_slider.get(), self.errors_slider.get(),
+                               self.pause_slider.get(), self.burst_slider.get())
+
+    def set_settings(self, settings):
+        sliders = [
+            (self.speed_slider, self._on_wpm_change, settings.get('wpm'), " wpm"),
+            (self.errors_slider, self._on_error_change,
+             round(settings['error_rate'] * 100) if 'error_rate' in settings else None, "%"),
+            (self.pause_slider, self._on_pause_change, settings.get('think_pause_max'), "s"),
+            (self.burst_slider, self._on_burst_change, settings.get('burst_max'), " sent"),
+        ]
+        for slider, command, value, suffix in sliders:
+            if value is not None:
+                slider.set(value)
+                command(slider.get(), suffix)
 
     def update_progress(self, current: int, total: int, remaining_seconds: float = 0):
         if total == 0:
@@ -1,27 +1,20 @@
 import sys
+import argparse
 import time
 import threading
-import subprocess
-import platform
-import os
 
-if platform.system() == "Darwin":
-    try:
-        from ApplicationServices import AXIsProcessTrusted
-    except ImportError:
-        AXIsProcessTrusted = None
-
-from pynput import keyboard
-
-from config import HOTKEY_COMBO, COUNTDOWN_SECONDS, IS_MAC
+from config import HOTKEY_COMBO, COUNTDOWN_SECONDS, IS_MAC, DAEMON_SOCKET_PATH, METRICS_PORT
 from gui.unified_window import UnifiedWindow
-from engine.typer import Typer
+from engine.profiles import ProfileStore
+from engine.targets import TARGETS
 
 def check_accessibility_permissions():
     if not IS_MAC:
         return True
     
-    if AXIsProcessTrusted is None:
+    try:
+        from ApplicationServices import AXIsProcessTrusted
+    except ImportError:
         return True
     
     try:
@@ -34,6 +27,7 @@ def open_accessibility_settings():
         return
     
     try:
+        import subprocess
         subprocess.run([
             "open", "x-apple.systempreferences:com.apple.preference.security?Privacy_Accessibility"
         ], check=False)
@@ -45,6 +39,7 @@ def open_input_monitoring_settings():
         return
     
     try:
+        import subprocess
         subprocess.run([
             "open", "x-apple.systempreferences:com.apple.preference.security?Privacy_ListenEvent"
         ], check=False)
@@ -52,30 +47,62 @@ def open_input_monitoring_settings():
         pass
 
 class TextTyperApp:
-    def __init__(self):
+    def __init__(self, profile_name=None, isolate=False, metrics=None, profiles=None, window_class=UnifiedWindow):
+        self.profiles = profiles or ProfileStore()
+        self.isolate = isolate
+        self.metrics = metrics
+        self.calibration = None
+        if profile_name:
+            self.profiles.set_active(profile_name)
         self.typer = None
+        self._worker_lock = threading.Lock()
         self.typing_thread = None
+        self.hotkey_listener = None
         self.total_chars = 0
         self.start_time = 0
         self._countdown_cancelled = False
+        self._progress_step = -1
         
-        self.window = UnifiedWindow(
+        self.window = window_class(
             on_start=self._on_start_typing,
             on_pause=self._on_pause,
             on_resume=self._on_resume,
             on_stop=self._on_stop
         )
+        self.window.set_settings(self.profiles.active().typer)
+        self._shown_settings = self.window.get_settings()
         
-        self.window.after(300, self._check_permissions)
+        self.window.after(0, lambda: threading.Thread(target=self._warm_up, daemon=True).start())
+
+    def _warm_up(self):
         self._setup_hotkey()
+        self._check_permissions()
+        import engine.typer
+        import engine.rate
+        from engine.clock import load_calibration
+        try:
+            self.calibration = load_calibration()
+        except OSError as e:
+            print(f"Warning: Could not calibrate sleep timing: {e}")
+        if self.isolate:
+            self._process_typer()
+
+    def _process_typer(self):
+        with self._worker_lock:
+            if self.typer is None or not self.typer.is_alive():
+                from engine.worker import ProcessTyper
+                if self.typer is not None:
+                    self.typer.close()
+                self.typer = ProcessTyper(calibration=self.calibration, cache_plans=True)
+            return self.typer
 
     def _check_permissions(self):
         if IS_MAC and not check_accessibility_permissions():
-            self.window.show_permission_dialog(
+            self.window.after(0, lambda: self.window.show_permission_dialog(
                 on_open_accessibility=open_accessibility_settings,
                 on_open_input_monitoring=open_input_monitoring_settings,
                 on_quit=self._quit_app
-            )
+            ))
 
     def _quit_app(self):
         self.cleanup()
@@ -84,6 +111,7 @@ class TextTyperApp:
 
     def _setup_hotkey(self):
         try:
+            from pynput import keyboard
             self.hotkey_listener = keyboard.GlobalHotKeys({
                 HOTKEY_COMBO: self._trigger_start
             })
@@ -95,16 +123,22 @@ class TextTyperApp:
         self.window.after(0, self.window.trigger_start)
 
     def _on_start_typing(self, text, settings):
+        from engine.typer import Typer
+        from engine.rate import AdaptiveRateController
+        from engine.plancache import PlanCache
         self._countdown_cancelled = False
         
-        self.typer = Typer(
-            wpm=settings['wpm'],
-            error_rate=settings['error_rate'],
-            burst_min=settings['burst_min'],
-            burst_max=settings['burst_max'],
-            think_pause_min=settings['think_pause_min'],
-            think_pause_max=settings['think_pause_max']
-        )
+        changed = {key: value for key, value in settings.items() if value != self._shown_settings.get(key)}
+        self._shown_settings = settings
+        profile = self.profiles.update(self.profiles.active().name, typer=changed)
+        if self.isolate:
+            self._process_typer()
+        elif self.typer is None or (self.typing_thread and self.typing_thread.is_alive()):
+            self.typer = Typer(rate_controller=AdaptiveRateController(), plan_cache=PlanCache(),
+                               metrics=self.metrics)
+            if self.calibration:
+                self.typer.use_calibration(self.calibration)
+        self.typer.apply_profile(profile)
         self.typer.on_progress = self._on_typing_progress
         self.typer.on_complete = self._on_typing_complete
         
@@ -112,6 +146,9 @@ class TextTyperApp:
         parser = MarkdownParser()
         self.total_chars = parser.get_plain_text_length(text)
         self.estimated_time = self.typer.estimate_time(text)
+        slow = self.typer.slow_characters(text)
+        if slow:
+            print(f"Warning: {len(slow)} characters are not on the keyboard layout and will type slowly: {''.join(slow[:20])}")
         
         self._run_countdown(text)
 
@@ -127,15 +164,24 @@ class TextTyperApp:
                 return
                 
             self.start_time = time.time()
+            self._progress_step = -1
             self.window.after(0, self.window.hide_countdown)
             self.window.after(0, lambda: self.window.update_progress(0, self.total_chars, self.estimated_time))
             
-            self.typing_thread = threading.Thread(target=self.typer.type_markdown, args=(text,))
+            self.typing_thread = threading.Thread(target=self._type, args=(self.typer, text))
             self.typing_thread.start()
         
         threading.Thread(target=countdown, daemon=True).start()
 
+    def _type(self, typer, text):
+        if not typer.type_markdown(text) and getattr(typer, 'error', None):
+            print(f"Warning: typing failed: {typer.error}")
+
     def _on_typing_progress(self, current, total):
+        step = current * 200 // total if total else current
+        if step == self._progress_step:
+            return
+        self._progress_step = step
         elapsed = time.time() - self.start_time
         if current > 0:
             rate = current / elapsed
@@ -166,20 +212,131 @@ class TextTyperApp:
 
     def cleanup(self):
         try:
-            self.hotkey_listener.stop()
+            if self.hotkey_listener:
+                self.hotkey_listener.stop()
         except:
             pass
         if self.typer:
             self.typer.cancel()
+            if self.isolate:
+                self.typer.close()
 
-def main():
-    app = TextTyperApp()
+def record_keystrokes(log_path):
+    from engine.recorder import KeystrokeRecorder
+    recorder = KeystrokeRecorder(log_path)
+    recorder.start()
+    print(f"Recording keystrokes to {log_path} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        recorder.stop()
+    print(f"Recorded {recorder.keystrokes} keystrokes")
+
+def train_profile(log_path, profile_path):
+    from engine.trainer import ProfileTrainer, save_timing_profile
+    profile = ProfileTrainer().train_file(log_path)
+    save_timing_profile(profile, profile_path)
+    print(f"Trained on {profile['keystrokes']} keystrokes "
+          f"({profile['wpm']:.0f} wpm, {profile['error_rate'] * 100:.1f}% errors) -> {profile_path}")
+
+def run_daemon(socket_path, backend_name, profile_name=None, metrics=None):
+    import asyncio
+    from engine.typer import Typer
+    from engine.rate import AdaptiveRateController
+    from engine.backends import RecordingBackend
+    from engine.daemon import TypingDaemon
+    from engine.plancache import PlanCache
+    store = ProfileStore()
+    if profile_name:
+        store.set_active(profile_name)
+    backend = RecordingBackend() if backend_name == "recording" else None
+    from engine.clock import load_calibration
+    typer = Typer(backend=backend, rate_controller=AdaptiveRateController(), plan_cache=PlanCache(),
+                  metrics=metrics)
     try:
-        app.run()
+        typer.use_calibration(load_calibration())
+    except OSError as e:
+        print(f"Warning: Could not calibrate sleep timing: {e}")
+    print(f"TextTyper daemon listening on {socket_path}")
+    try:
+        asyncio.run(TypingDaemon(typer, store).serve_forever(socket_path))
     except KeyboardInterrupt:
         pass
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="TextTyper")
+    parser.add_argument("--record", metavar="LOG", help="record your own keystroke timings to LOG")
+    parser.add_argument("--train", nargs=2, metavar=("LOG", "PROFILE"),
+                        help="fit a timing profile from a keystroke log")
+    parser.add_argument("--profile", metavar="NAME", help="use (and remember) the named settings profile")
+    parser.add_argument("--import-timing", metavar="PROFILE",
+                        help="store a trained timing profile in the selected settings profile")
+    parser.add_argument("--target", choices=sorted(TARGETS),
+                        help="application to type into (sets its formatting shortcuts in the profile)")
+    parser.add_argument("--daemon", nargs="?", const=DAEMON_SOCKET_PATH, metavar="SOCKET",
+                        help="run headless, taking typing jobs over a local socket")
+    parser.add_argument("--isolate", action="store_true",
+                        help="type from a separate process so window activity cannot delay keystrokes")
+    parser.add_argument("--backend", choices=("pynput", "recording"), default="pynput",
+                        help="keyboard backend for daemon mode")
+    parser.add_argument("--metrics-port", nargs="?", type=int, const=METRICS_PORT, metavar="PORT",
+                        help="serve Prometheus metrics on localhost:PORT/metrics")
+    parser.add_argument("--metrics-file", metavar="PATH",
+                        help="write Prometheus metrics to PATH every few seconds")
+    return parser.parse_args(argv)
+
+def start_metrics(args):
+    if args.metrics_port is None and not args.metrics_file:
+        return None, []
+    from engine.metrics import TypingMetrics, MetricsServer, TextFileExporter
+    metrics = TypingMetrics()
+    exporters = []
+    if args.metrics_port is not None:
+        exporters.append(MetricsServer(metrics, port=args.metrics_port).start())
+    if args.metrics_file:
+        exporters.append(TextFileExporter(metrics, args.metrics_file).start())
+    return metrics, exporters
+
+def main():
+    args = parse_args()
+    if args.record:
+        record_keystrokes(args.record)
+        return
+    if args.train:
+        train_profile(*args.train)
+        return
+    if args.import_timing:
+        from engine.trainer import load_timing_profile, typer_settings
+        store = ProfileStore()
+        name = args.profile or store.active().name
+        timing = load_timing_profile(args.import_timing)
+        store.update(name, typer=typer_settings(timing), timing=timing)
+        print(f"Imported {args.import_timing} into profile '{name}'")
+        return
+    if args.target:
+        store = ProfileStore()
+        store.update(args.profile or store.active().name, typer={'target': args.target})
+    metrics, exporters = start_metrics(args)
+    try:
+        if args.daemon:
+            run_daemon(args.daemon, args.backend, args.profile, metrics)
+            return
+
+        if metrics is not None and args.isolate:
+            print("Warning: metrics are not collected from the isolated typing process")
+        app = TextTyperApp(profile_name=args.profile, isolate=args.isolate, metrics=metrics)
+        try:
+            app.run()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            app.cleanup()
     finally:
-        app.cleanup()
+        for exporter in exporters:
+            exporter.close()
 
 if __name__ == "__main__":
     main()
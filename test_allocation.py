@@ -0,0 +1,105 @@
+import gc
+import tracemalloc
+from array import array
+
+from engine.typer import Typer, hold_gc, release_gc
+
+TEXT = "Steady state typing should not allocate. **Bold** and _italic_ too!\n" * 40
+
+class NullBackend:
+    def type(self, text):
+        pass
+
+    def tap(self, key):
+        pass
+
+    def chord(self, keys):
+        pass
+
+def test_keystroke_loop_has_no_net_allocations():
+    typer = Typer(backend=NullBackend(), error_rate=0.05, seed=3)
+    plan = typer.plan(TEXT)
+    samples = array('q', bytes(16 * (len(plan) + 1)))
+    count = array('q', [0])
+
+    def probe(seconds):
+        samples[count[0]] = tracemalloc.get_traced_memory()[0]
+        count[0] += 1
+
+    tracemalloc.start()
+    try:
+        typer.execute(plan, sleep=probe)
+    finally:
+        tracemalloc.stop()
+    steady = samples[300:count[0]]
+    assert count[0] > 1000
+    assert max(steady) - min(steady) < 256
+    assert steady[-1] - steady[0] <= 0
+
+def test_gc_is_frozen_and_paused_only_while_typing():
+    states = []
+    typer = Typer(backend=NullBackend(), error_rate=0.0, seed=3)
+    plan = typer.plan("a b")
+    typer.execute(plan, sleep=lambda seconds: states.append((gc.isenabled(), gc.get_freeze_count() > 0)))
+    assert set(states) == {(False, True)}
+    assert gc.isenabled() and gc.get_freeze_count() == 0
+
+    typer.pause_gc = False
+    states.clear()
+    typer.execute(plan, sleep=lambda seconds: states.append(gc.isenabled()))
+    assert set(states) == {True}
+
+def test_gc_runs_during_long_delays():
+    from engine.planner import KeystrokePlan, OP_TYPE
+    plan = KeystrokePlan()
+    plan.add(OP_TYPE, 'a', 0.2, 1)
+    plan.add(OP_TYPE, 'b', 2.0, 2)
+    plan.total_chars = 2
+    states = []
+    Typer(backend=NullBackend()).execute(
+        plan, sleep=lambda seconds: states.append((seconds, gc.isenabled(), gc.get_freeze_count() > 0)))
+    assert [enabled for _, enabled, _ in states] == [False, True, False]
+    assert all(frozen for _, _, frozen in states)
+    assert states[1][0] == 1.9
+    assert gc.isenabled() and gc.get_freeze_count() == 0
+
+def test_long_delays_do_not_collect_the_whole_heap(monkeypatch):
+    from engine.planner import KeystrokePlan, OP_TYPE
+    plan = KeystrokePlan()
+    for index in range(20):
+        plan.add(OP_TYPE, 'a', 2.0, index + 1)
+    plan.total_chars = 20
+    collections = []
+    real_collect = gc.collect
+    monkeypatch.setattr(gc, 'collect', lambda *args: collections.append(args) or real_collect(*args))
+    Typer(backend=NullBackend()).execute(plan, sleep=lambda seconds: None)
+    assert len(collections) == 1
+
+def test_one_session_waiting_keeps_the_gc_paused_for_another():
+    from engine.planner import KeystrokePlan, OP_TYPE
+    plan = KeystrokePlan()
+    plan.add(OP_TYPE, 'a', 2.0, 1)
+    plan.total_chars = 1
+    states = []
+    hold_gc()
+    try:
+        Typer(backend=NullBackend()).execute(plan, sleep=lambda seconds: states.append(gc.isenabled()))
+    finally:
+        release_gc()
+    assert set(states) == {False}
+    assert gc.isenabled() and gc.get_freeze_count() == 0
+
+def test_nested_sessions_keep_the_gc_paused():
+    inner = Typer(backend=NullBackend(), error_rate=0.0, seed=3)
+    inner_plan = inner.plan("a b")
+    states = []
+
+    def sleep(seconds):
+        if not states:
+            inner.execute(inner_plan, sleep=lambda seconds: None)
+        states.append(gc.isenabled())
+
+    outer = Typer(backend=NullBackend(), error_rate=0.0, seed=3)
+    outer.execute(outer.plan("a b"), sleep=sleep)
+    assert set(states) == {False}
+    assert gc.isenabled() and gc.get_freeze_count() == 0
@@ -0,0 +1,82 @@
+import asyncio
+
+from engine.typer import Typer
+from engine.backends import RecordingBackend
+
+TEXT = "Hi. **Go** on!"
+
+def make_typer(seed=1):
+    return Typer(backend=RecordingBackend(), wpm=400, error_rate=0.0, seed=seed,
+                 think_pause_min=0.05, think_pause_max=0.1)
+
+def test_progress_is_an_async_iterator_over_planned_deadlines():
+    typer = make_typer()
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        plan = typer.plan(TEXT)
+        started = loop.time()
+        updates = [update async for update in typer.execute_async(plan)]
+        return plan, updates, loop.time() - started
+
+    plan, updates, elapsed = asyncio.run(run())
+    assert [current for current, _ in updates] == list(range(1, plan.total_chars + 1))
+    assert updates[-1] == (plan.total_chars, plan.total_chars)
+    assert typer.backend.text == "Hi. Go on!"
+    assert plan.duration() * 0.95 <= elapsed < plan.duration() + 0.5
+
+def test_task_cancellation_stops_typing():
+    typer = make_typer()
+
+    async def consume():
+        async for _ in typer.type_markdown_async(TEXT * 20):
+            pass
+
+    async def run():
+        task = asyncio.ensure_future(consume())
+        await asyncio.sleep(0.2)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        typed = len(typer.backend.events)
+        await asyncio.sleep(0.2)
+        return typed
+
+    typed = asyncio.run(run())
+    assert 0 < typed == len(typer.backend.events)
+
+def test_many_sessions_share_one_loop():
+    typers = [make_typer(seed) for seed in range(30)]
+
+    async def session(typer):
+        plan = typer.plan(TEXT)
+        async for _ in typer.execute_async(plan):
+            pass
+        return plan.duration()
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        durations = await asyncio.gather(*[session(typer) for typer in typers])
+        return durations, loop.time() - started
+
+    durations, elapsed = asyncio.run(run())
+    assert elapsed < max(durations) + 0.5 < sum(durations)
+    assert all(typer.backend.text == "Hi. Go on!" for typer in typers)
+
+def test_async_sessions_finish_like_sync_ones():
+    import gc
+    typer = make_typer()
+    completed = []
+    typer.on_complete = lambda: completed.append(gc.isenabled())
+
+    async def run():
+        async for _ in typer.type_markdown_async(TEXT):
+            assert not gc.isenabled()
+
+    asyncio.run(run())
+    assert completed == [True]
+    assert typer.achieved_cps > 0
+    assert gc.isenabled() and gc.get_freeze_count() == 0
@@ -0,0 +1,93 @@
+import pytest
+
+pytest.importorskip("pynput.keyboard", exc_type=ImportError)
+from pynput.keyboard import Key, KeyCode
+from pynput.keyboard._base import Controller
+
+from engine.backends import PynputBackend, RecordingBackend
+from engine.typer import Typer
+
+class FakeController(Controller):
+    def __init__(self, invalid=''):
+        super().__init__()
+        self.invalid = invalid
+        self.events = []
+
+    def _handle(self, key, is_press):
+        if key.char and key.char in self.invalid:
+            raise self.InvalidKeyException(key)
+        self.events.append((key, is_press))
+
+def test_cached_typing_matches_controller_type():
+    text = "Héllo, wörld — ça va?\n\tΩ≈ 😀"
+    reference = FakeController()
+    reference.type(text)
+    backend = PynputBackend(FakeController())
+    backend.type(text)
+    backend.type(text)
+    assert backend.controller.events == reference.events * 2
+
+def test_modifiers_and_dead_keys_match_controller_type():
+    def held_shift(controller, type_text):
+        controller.press(Key.shift)
+        type_text("ab")
+        controller.release(Key.shift)
+        return controller.events
+
+    def dead_key(controller, type_text):
+        controller.tap(KeyCode.from_dead('~'))
+        type_text("nx")
+        return controller.events
+
+    for session in (held_shift, dead_key):
+        reference = FakeController()
+        backend = PynputBackend(FakeController())
+        assert session(backend.controller, backend.type) == session(reference, reference.type)
+    assert reference.events[0] == (KeyCode.from_char('ñ'), True)
+
+class KeysymController(FakeController):
+    def __init__(self):
+        super().__init__()
+        self.lookups = []
+
+    def _key_to_keysym(self, key):
+        self.lookups.append(key.char)
+        return ord(key.char)
+
+    def _handle(self, key, is_press):
+        self._key_to_keysym(key) if key.vk is None else key.vk
+        super()._handle(key, is_press)
+
+def test_platform_keysyms_resolve_once():
+    backend = PynputBackend(KeysymController())
+    backend.prepare(set("ab"))
+    backend.type("abba\nab")
+    assert sorted(backend.controller.lookups) == ['a', 'b']
+
+def test_distinct_characters_resolve_once():
+    backend = PynputBackend(FakeController())
+    calls = []
+    resolve = backend._key_code.from_char
+    backend._key_code = type('Counting', (), {'from_char': staticmethod(lambda c: calls.append(c) or resolve(c))})
+    backend.prepare(set("café"))
+    backend.type("café café éé")
+    assert sorted(calls) == sorted(set("café "))
+
+def test_untypable_characters_raise_like_controller():
+    backend = PynputBackend(FakeController(invalid='é'))
+    with pytest.raises(Controller.InvalidCharacterException) as raised:
+        backend.type("caé")
+    assert raised.value.args == (2, 'é')
+
+def test_slow_characters_are_those_off_the_layout():
+    typer = Typer(backend=RecordingBackend(), seed=1)
+    assert typer.slow_characters("naïve café — ok\n\t!") == ['é', 'ï', '—']
+    assert Typer(backend=RecordingBackend(), layout="azerty").slow_characters("café") == []
+
+def test_execution_prepares_the_plan_characters():
+    backend = PynputBackend(FakeController())
+    typer = Typer(backend=backend, seed=2, error_rate=0.0, mode="chunked")
+    plan = typer.plan("Crème **brûlée**")
+    assert set("Crème brûlée") <= plan.characters()
+    assert typer.execute(plan, sleep=lambda s: None)
+    assert set(backend._chars) >= plan.characters()
@@ -0,0 +1,36 @@
+from engine.typer import Typer
+from engine.backends import RecordingBackend
+from engine.boundaries import BoundaryIndex, boundary_index, BOUNDARY_CLAUSE, BOUNDARY_SENTENCE, BOUNDARY_PARAGRAPH
+
+def marks(text):
+    return [(text[offset], kind) for offset, kind in sorted(boundary_index(text).items())]
+
+def test_sentence_ends_skip_abbreviations_decimals_and_urls():
+    assert marks("Use e.g. this. Pi is 3.14 at example.com today! Mr. Smith agrees? yes.") == [
+        ('.', BOUNDARY_SENTENCE), ('!', BOUNDARY_SENTENCE), ('?', BOUNDARY_SENTENCE), ('.', BOUNDARY_SENTENCE)]
+    assert marks("It ends at approx. three. Then U.S. law.") == [('.', BOUNDARY_SENTENCE), ('.', BOUNDARY_SENTENCE)]
+
+def test_ellipses_and_clauses():
+    assert marks("Wait... then, go; now... Then stop") == [
+        ('.', BOUNDARY_CLAUSE), (',', BOUNDARY_CLAUSE), (';', BOUNDARY_CLAUSE), ('.', BOUNDARY_SENTENCE)]
+    assert marks('He said "hi." Then') == [('"', BOUNDARY_SENTENCE)]
+
+def test_paragraphs_replace_the_sentence_before_them():
+    assert marks("Title\nOne.\n\nTwo!\n \n\nThree") == [
+        ('\n', BOUNDARY_CLAUSE), ('\n', BOUNDARY_PARAGRAPH), ('\n', BOUNDARY_PARAGRAPH)]
+    assert boundary_index("\n\nStart") == {}
+
+def test_planner_places_think_pauses_from_the_index():
+    typer = Typer(backend=RecordingBackend(), seed=1, error_rate=0.0, burst_min=1, burst_max=1,
+                  think_pause_min=10.0, think_pause_max=10.0)
+    plan = typer.plan("Use e.g. this one. Pi is 3.14 today.\n\nNext part, done")
+    paused = [arg for arg, delay in zip(plan.args, plan.delays) if delay >= 10.0]
+    assert paused == [' ', 'N']
+
+def test_streamed_index_matches_the_whole_text():
+    text = "Wait... then go.\nNext!\n\n \nA b. C d...\n\n\nEnd"
+    for cut in range(1, len(text)):
+        index = BoundaryIndex()
+        first = index.feed(text[:cut], final=False)
+        settled = {offset: kind for offset, kind in first.items() if offset < index.settled}
+        assert {**settled, **index.feed(text[cut:])} == boundary_index(text)
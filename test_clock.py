@@ -0,0 +1,85 @@
+import json
+import time
+
+from engine.backends import VirtualClock
+from engine.clock import measure_sleep, load_calibration, is_stale, PreciseSleeper
+from engine.typer import Typer
+from engine.backends import RecordingBackend
+
+def oversleeping_clock(overshoot):
+    clock = VirtualClock()
+    return clock, lambda seconds: clock.sleep(seconds + overshoot)
+
+def test_measure_sleep_reports_overshoot():
+    clock, sleep = oversleeping_clock(0.0015)
+    calibration = measure_sleep(samples=5, requests=(0.001, 0.01), sleep=sleep, clock=clock)
+    assert abs(calibration['overshoot_median'] - 0.0015) < 1e-9
+    assert abs(calibration['granularity'] - 0.0025) < 1e-9
+    assert not is_stale(calibration)
+
+def test_calibration_is_cached_until_stale(tmp_path):
+    path = str(tmp_path / "calibration.json")
+    calls = []
+
+    def measure():
+        calls.append(1)
+        clock, sleep = oversleeping_clock(0.001)
+        return measure_sleep(samples=2, sleep=sleep, clock=clock)
+
+    first = load_calibration(path, measure=measure)
+    assert load_calibration(path, measure=measure) == first
+    assert len(calls) == 1
+
+    with open(path, "w") as f:
+        json.dump(dict(first, measured_at=time.time() - 3600), f)
+    load_calibration(path, max_age=60, measure=measure)
+    with open(path, "w") as f:
+        json.dump(dict(first, machine="elsewhere"), f)
+    load_calibration(path, measure=measure)
+    assert len(calls) == 3
+
+def test_precise_sleeper_sleeps_short_then_spins():
+    clock = VirtualClock()
+    slept = []
+
+    def sleep(seconds):
+        slept.append(seconds)
+        clock.sleep(seconds)
+
+    def ticking_clock():
+        clock.now += 0.0001
+        return clock.now
+
+    sleeper = PreciseSleeper({'overshoot_median': 0.004, 'overshoot_p95': 0.009},
+                             sleep=sleep, clock=ticking_clock, max_spin=0.002)
+    assert sleeper.spin_threshold == 0.002
+    assert abs(sleeper.expected_overshoot - 0.002) < 1e-12
+    sleeper(0.05)
+    assert abs(slept[0] - 0.048) < 1e-12
+    assert 0.05 <= clock.now < 0.0505
+    sleeper(0.001)
+    assert len(slept) == 1
+
+def test_calibration_feeds_the_estimator():
+    typer = Typer(backend=RecordingBackend())
+    before = typer.estimate_time("x" * 1000)
+    typer.use_calibration({'overshoot_median': 0.004, 'overshoot_p95': 0.009})
+    assert abs(typer.estimate_time("x" * 1000) - before - 1000 * 0.002) < 1e-9
+    assert isinstance(typer.sleep, PreciseSleeper)
+
+def test_daemon_starts_without_a_writable_calibration(monkeypatch):
+    import engine.clock
+    import engine.daemon
+    from main import run_daemon
+
+    def unwritable(*args, **kwargs):
+        raise PermissionError("read-only home")
+
+    async def serve(self, path):
+        served.append(self.typer.sleep)
+
+    served = []
+    monkeypatch.setattr(engine.clock, 'load_calibration', unwritable)
+    monkeypatch.setattr(engine.daemon.TypingDaemon, 'serve_forever', serve)
+    run_daemon("unused.sock", "recording")
+    assert served == [time.sleep]
@@ -0,0 +1,168 @@
+import asyncio
+import json
+import os
+import time
+
+from engine.typer import Typer
+from engine.backends import RecordingBackend
+from engine.profiles import ProfileStore
+from engine.daemon import TypingDaemon, send_request, STATE_DONE, STATE_CANCELLED, STATE_PAUSED
+
+def short_sleep(seconds):
+    time.sleep(min(seconds, 0.002))
+
+def with_daemon(tmp_path, scenario):
+    backend = RecordingBackend()
+    typer = Typer(backend=backend)
+    daemon = TypingDaemon(typer, ProfileStore(str(tmp_path / "profiles.json")), sleep=short_sleep)
+    path = str(tmp_path / "daemon.sock")
+
+    async def run():
+        server = await daemon.start(path)
+        try:
+            return await scenario(path)
+        finally:
+            server.close()
+            await daemon.stop()
+
+    return asyncio.run(run()), backend
+
+async def wait_for(path, job, states, min_current=0):
+    while True:
+        status = await send_request(path, cmd='status', job=job)
+        if status['state'] in states and status['current'] >= min_current:
+            return status
+        await asyncio.sleep(0.01)
+
+def test_jobs_from_concurrent_clients_run_in_order(tmp_path):
+    async def scenario(path):
+        replies = await asyncio.gather(*[
+            send_request(path, cmd='submit', text=f"job {n}\n", settings={'error_rate': 0.0}, seed=n)
+            for n in range(5)
+        ])
+        assert all(reply['ok'] for reply in replies)
+        return [await wait_for(path, reply['job'], (STATE_DONE,)) for reply in replies]
+
+    statuses, backend = with_daemon(tmp_path, scenario)
+    assert all(status['current'] == status['total'] == 6 for status in statuses)
+    assert sorted(backend.text.split('\n')[:-1]) == [f"job {n}" for n in range(5)]
+
+def test_pause_resume_and_cancel(tmp_path):
+    async def scenario(path):
+        first = await send_request(path, cmd='submit', text="a fairly long line of text " * 20,
+                                   settings={'error_rate': 0.0, 'wpm': 400})
+        queued = await send_request(path, cmd='submit', text="never typed")
+        await wait_for(path, first['job'], ('typing',), min_current=1)
+        paused = await send_request(path, cmd='pause', job=first['job'])
+        assert paused['state'] == STATE_PAUSED
+        before = paused['current']
+        await asyncio.sleep(0.3)
+        assert (await send_request(path, cmd='status', job=first['job']))['current'] <= before + 1
+        assert (await send_request(path, cmd='cancel', job=queued['job']))['state'] == STATE_CANCELLED
+        await send_request(path, cmd='resume', job=first['job'])
+        await wait_for(path, first['job'], ('typing',), min_current=before + 5)
+        await send_request(path, cmd='cancel', job=first['job'])
+        return await wait_for(path, first['job'], (STATE_DONE, STATE_CANCELLED)), \
+            await send_request(path, cmd='status')
+
+    (first, listing), backend = with_daemon(tmp_path, scenario)
+    assert first['state'] == STATE_CANCELLED
+    assert 0 < first['current'] < first['total']
+    assert "never" not in backend.text
+    assert [job['state'] for job in listing['jobs']] == [STATE_CANCELLED, STATE_CANCELLED]
+
+def test_bad_requests_get_errors(tmp_path):
+    async def scenario(path):
+        return [await send_request(path, cmd='launch'),
+                await send_request(path, cmd='submit'),
+                await send_request(path, cmd='pause', job=99)]
+
+    replies, _ = with_daemon(tmp_path, scenario)
+    assert [reply['ok'] for reply in replies] == [False, False, False]
+    assert "unknown job" in replies[2]['error']
+
+def test_file_jobs_are_typed_in_windows(tmp_path):
+    document = tmp_path / "notes.md"
+    document.write_text("# Title\n" + "- point **one**\n" * 30)
+
+    async def scenario(path):
+        reply = await send_request(path, cmd='submit', path=str(document), settings={'error_rate': 0.0})
+        missing = await send_request(path, cmd='submit', path=str(tmp_path / "missing.md"))
+        return await wait_for(path, reply['job'], (STATE_DONE,)), missing
+
+    (status, missing), backend = with_daemon(tmp_path, scenario)
+    assert status['current'] == status['total'] == len(backend.text)
+    assert backend.text.startswith("Title\npoint one\n")
+    assert not missing['ok']
+
+def test_revision_jobs_send_only_the_edits(tmp_path):
+    async def scenario(path):
+        first = await send_request(path, cmd='submit', text="Intro.\nBody text.", settings={'error_rate': 0.0})
+        await wait_for(path, first['job'], (STATE_DONE,))
+        revised = await send_request(path, cmd='submit', text="Intro.\nBody text, revised.",
+                                     previous="Intro.\nBody text.", settings={'error_rate': 0.0})
+        bad = await send_request(path, cmd='submit', text="x", previous=3)
+        return await wait_for(path, revised['job'], (STATE_DONE,)), bad
+
+    (status, bad), backend = with_daemon(tmp_path, scenario)
+    assert status['current'] == status['total'] == len(", revised")
+    assert not bad['ok']
+
+def test_malformed_job_ids_get_error_replies(tmp_path):
+    async def scenario(path):
+        return [await send_request(path, cmd='status', job=job) for job in ([1], {'a': 1}, "1", True)]
+
+    replies, _ = with_daemon(tmp_path, scenario)
+    assert all(not reply['ok'] and 'integer' in reply['error'] for reply in replies)
+
+def test_finished_jobs_are_pruned(tmp_path, monkeypatch):
+    import engine.daemon
+    monkeypatch.setattr(engine.daemon, 'DAEMON_MAX_FINISHED_JOBS', 3)
+
+    async def scenario(path):
+        replies = [await send_request(path, cmd='submit', text=f"job {n}", settings={'error_rate': 0.0})
+                   for n in range(6)]
+        await wait_for(path, replies[-1]['job'], (STATE_DONE,))
+        return await send_request(path, cmd='status')
+
+    status, _ = with_daemon(tmp_path, scenario)
+    assert [job['job'] for job in status['jobs']] == [4, 5, 6]
+
+def test_submit_validates_settings(tmp_path):
+    async def scenario(path):
+        bad = [{'wpm': "fast"}, {'wpm': 0}, {'error_rate': 2}, {'burst_max': 2.5}, {'mode': "turbo"},
+               {'burst_min': 5, 'burst_max': 2}, {'colour': "red"}, [1]]
+        replies = [await send_request(path, cmd='submit', text="x", settings=settings) for settings in bad]
+        replies.append(await send_request(path, cmd='submit', text="x", seed="7"))
+        good = await send_request(path, cmd='submit', text="ok", settings={'wpm': 120, 'mode': 'chunked'})
+        return replies, await wait_for(path, good['job'], (STATE_DONE,))
+
+    (replies, good), backend = with_daemon(tmp_path, scenario)
+    assert not any(reply['ok'] for reply in replies)
+    assert good['total'] == 2 and backend.text == "ok"
+
+def test_tcp_requests_need_the_token(tmp_path):
+    token_path = str(tmp_path / "daemon.token")
+    daemon = TypingDaemon(Typer(backend=RecordingBackend()), ProfileStore(str(tmp_path / "profiles.json")),
+                          sleep=short_sleep)
+
+    async def run():
+        server = await daemon.start(None, port=0, token_path=token_path)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(b'{"cmd": "submit", "text": "intruder"}\n')
+            await writer.drain()
+            rejected = json.loads(await reader.readline())
+            writer.close()
+            accepted = await send_request(None, port=port, token_path=token_path, cmd='status')
+            return rejected, accepted
+        finally:
+            server.close()
+            await daemon.stop()
+
+    rejected, accepted = asyncio.run(run())
+    assert not rejected['ok'] and 'token' in rejected['error']
+    assert accepted['ok']
+    if os.name == 'posix':
+        assert os.stat(token_path).st_mode & 0o777 == 0o600
@@ -0,0 +1,96 @@
+import io
+import tracemalloc
+
+from engine.typer import Typer
+from engine.backends import RecordingBackend, CountingBackend
+from engine.documents import iter_windows, open_document, MappedDocument
+from engine.planner import MODE_CHUNKED, CHUNK_LINE
+
+DOC = ("# Notes\nPlain line one. Another sentence!\n- item **bold**\n- item two\n\n"
+       "> quoted _text_\nclosing line with `code`.\n") * 6
+
+def test_windows_split_on_line_boundaries():
+    windows = list(iter_windows(io.StringIO(DOC), 50))
+    assert ''.join(windows) == DOC
+    assert all(window.endswith('\n') for window in windows)
+    assert max(len(window) for window in windows) < 50 + 40
+
+def test_windowed_typing_matches_single_plan(tmp_path):
+    path = tmp_path / "doc.md"
+    path.write_text(DOC)
+    whole = Typer(backend=RecordingBackend(), error_rate=0.05, seed=9)
+    plan = whole.plan(DOC)
+    whole.execute(plan, sleep=lambda seconds: None)
+
+    windowed = Typer(backend=RecordingBackend(), error_rate=0.05, seed=9)
+    updates = []
+    windowed.on_progress = lambda current, total: updates.append((current, total))
+    assert windowed.type_document(str(path), window_chars=40, sleep=lambda seconds: None)
+
+    strip = lambda events: [event[:2] for event in events]
+    assert strip(windowed.backend.events) == strip(whole.backend.events)
+    assert updates[-1] == (plan.total_chars, plan.total_chars)
+
+def test_paragraph_breaks_across_windows_keep_their_pauses():
+    doc = 'One.\n\nTwo.\n\n' * 20
+    whole = Typer(backend=RecordingBackend(), error_rate=0.0, seed=3).plan(doc)
+    for window_chars in (1, 7, 20):
+        typer = Typer(backend=RecordingBackend(), error_rate=0.0, seed=3)
+        plans = list(typer.plan_windows(iter_windows(io.StringIO(doc), window_chars)))
+        assert [delay for plan in plans for delay in plan.delays] == list(whole.delays)
+
+def test_unseekable_streams_report_unknown_total():
+    class Pipe(io.StringIO):
+        def seekable(self):
+            return False
+
+    typer = Typer(backend=RecordingBackend(), error_rate=0.0, mode=MODE_CHUNKED, chunk=CHUNK_LINE)
+    totals = set()
+    typer.on_progress = lambda current, total: totals.add(total)
+    assert typer.type_document(Pipe("one\ntwo **three**\n"), sleep=lambda seconds: None)
+    assert typer.backend.text == "one\ntwo three\n"
+    assert totals == {0}
+
+def test_memory_stays_flat_as_documents_grow():
+    def peak(lines):
+        stream = io.StringIO("A line of plain prose for the memory check, nothing more.\n" * lines)
+        typer = Typer(backend=CountingBackend(), mode=MODE_CHUNKED, chunk=CHUNK_LINE)
+        tracemalloc.start()
+        typer.type_document(stream, window_chars=4096, sleep=lambda seconds: None)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return peak
+
+    assert peak(40000) < 2 * peak(4000)
+
+def test_mapped_files_window_on_newline_offsets(tmp_path):
+    path = tmp_path / "mapped.md"
+    text = "naïve café line\r\n" * 40 + "última **línea**"
+    path.write_bytes(text.encode("utf-8"))
+    with open_document(str(path)) as document:
+        assert isinstance(document, MappedDocument)
+        offsets = list(document.line_windows(64))
+        windows = list(document.windows(64))
+    assert offsets[0][0] == 0 and offsets[-1][1] == path.stat().st_size
+    assert all(end == start for (_, end), (start, _) in zip(offsets, offsets[1:]))
+    assert ''.join(windows) == text.replace("\r\n", "\n")
+
+    typer = Typer(backend=RecordingBackend(), error_rate=0.0, seed=2)
+    assert typer.type_document(str(path), window_chars=64, sleep=lambda seconds: None)
+    assert typer.backend.text == text.replace("\r\n", "\n").replace("**", "")
+
+def test_empty_files_fall_back_to_streams(tmp_path):
+    path = tmp_path / "empty.md"
+    path.write_text("")
+    with open_document(str(path)) as document:
+        assert list(document.windows()) == []
+
+def test_mapped_windows_stay_bounded_without_line_feeds(tmp_path):
+    for name, text in (("mac.md", "old mac line, café\r" * 200), ("one.md", "ünïcode wörds " * 200)):
+        path = tmp_path / name
+        path.write_bytes(text.encode("utf-8"))
+        with open_document(str(path)) as document:
+            offsets = list(document.line_windows(64))
+            windows = list(document.windows(64))
+        assert max(end - start for start, end in offsets) <= 128
+        assert ''.join(windows) == text.replace("\r", "\n")
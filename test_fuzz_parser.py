@@ -0,0 +1,42 @@
+from engine.markdown_parser import MarkdownParser
+from fuzz_parser import family_text, fuzz, growth_exponent, load_cases, minimize, save_cases
+
+REGRESSION_MARGIN = 0.3
+
+def linear(parse, text):
+    return len(text) * 1e-6
+
+def quadratic(parse, text):
+    return len(text) ** 2 * 1e-9
+
+def quadratic_on_bracket(parse, text):
+    return quadratic(parse, text) if '[' in text else linear(parse, text)
+
+def test_family_text_repeats_unit_to_size():
+    assert family_text(('# ', 'ab', '\n'), 11) == '# abababab\n'
+    assert family_text(('', 'abc', ''), 1) == 'abc'
+
+def test_growth_exponent_fits_log_log_slope():
+    assert abs(growth_exponent(None, ('', 'a', ''), measure=linear) - 1) < 0.05
+    assert abs(growth_exponent(None, ('', 'a', ''), measure=quadratic) - 2) < 0.05
+
+def test_minimize_keeps_only_the_slow_part():
+    family = ('**', 'a[b', '](u)')
+    assert minimize(None, family, measure=quadratic_on_bracket) == ('', '[', '')
+
+def test_fuzz_finds_and_saves_cases(tmp_path):
+    found = fuzz(None, families=30, seed=1, measure=quadratic_on_bracket)
+    assert found
+    for family in found:
+        assert len(''.join(family)) <= 2 and '[' in ''.join(family)
+    path = tmp_path / 'cases.json'
+    save_cases(found, path)
+    assert load_cases(path) == {family: round(exponent, 2) for family, exponent in found.items()}
+    assert load_cases(tmp_path / 'missing.json') == {}
+
+def test_recorded_cases_have_not_regressed():
+    parse = MarkdownParser().parse
+    cases = load_cases()
+    assert cases
+    for family, recorded in cases.items():
+        assert growth_exponent(parse, family) <= recorded + REGRESSION_MARGIN, family
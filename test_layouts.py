@@ -0,0 +1,44 @@
+from collections import Counter
+
+from engine.layouts import (
+    AliasTable, get_layout, LAYOUT_ROWS,
+    ERROR_ADJACENT, ERROR_DOUBLE, ERROR_TRANSPOSE
+)
+
+def grid(n):
+    return [(i + 0.5) / n for i in range(n)]
+
+def test_alias_table_reproduces_weights():
+    table = AliasTable(['a', 'b', 'c', 'd'], [1, 2, 3, 4])
+    counts = Counter(table.sample(u) for u in grid(10000))
+    for item, weight in zip('abcd', [1, 2, 3, 4]):
+        assert abs(counts[item] / 10000 - weight / 10) < 0.002
+
+def test_qwerty_neighbours_cover_letters_digits_and_shifted_symbols():
+    layout = get_layout("qwerty")
+    neighbours = {n for n, _ in layout.neighbours['s']}
+    assert {'a', 'w', 'e', 'd', 'z', 'x'} <= neighbours
+    assert {n for n, _ in layout.neighbours['S']} >= {'A', 'W', 'E', 'D', 'Z', 'X'}
+    assert '@' in {n for n, _ in layout.neighbours['!']}
+    assert '2' in {n for n, _ in layout.neighbours['1']}
+    assert ' ' not in layout
+
+def test_other_layouts():
+    azerty = get_layout("azerty")
+    assert {'z', 'q'} <= {n for n, _ in azerty.neighbours['a']}
+    dvorak = get_layout("dvorak")
+    assert {'o', "'"} <= {n for n, _ in dvorak.neighbours['a']}
+    assert set(LAYOUT_ROWS) == {"qwerty", "azerty", "dvorak"}
+
+def test_error_tables_mix_error_kinds():
+    layout = get_layout("qwerty")
+    kinds = Counter(layout.sample_error('g', u)[0] for u in grid(10000))
+    assert abs(kinds[ERROR_DOUBLE] / 10000 - 0.12) < 0.01
+    assert abs(kinds[ERROR_TRANSPOSE] / 10000 - 0.13) < 0.01
+    assert abs(kinds[ERROR_ADJACENT] / 10000 - 0.75) < 0.01
+
+def test_adjacent_key_keeps_case_and_unknown_chars():
+    layout = get_layout("qwerty")
+    assert all(layout.is_shifted(layout.adjacent_key('Q', u)) for u in grid(50))
+    assert layout.adjacent_key('é', 0.3) == 'é'
+    assert get_layout("qwerty") is layout
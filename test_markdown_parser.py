@@ -0,0 +1,93 @@
+from engine.markdown_parser import MarkdownParser, InstructionType as T, LIST_BULLET, LIST_NUMBERED
+from engine.typer import Typer
+from engine.backends import RecordingBackend
+from engine.planner import OP_CHORD, OP_KEY, OP_TYPE
+from engine.targets import GOOGLE_DOCS
+
+DOCS = GOOGLE_DOCS.on_actions()
+DOCS_OFF = GOOGLE_DOCS.off_actions()
+
+def kinds(text):
+    return [(i.type, i.content) for i in MarkdownParser().parse(text)]
+
+def test_existing_constructs_are_unchanged():
+    assert kinds("**a** *b* __c__ _d_") == [
+        (T.BOLD_START, ''), (T.TEXT, 'a'), (T.BOLD_END, ''), (T.TEXT, ' '),
+        (T.ITALIC_START, ''), (T.TEXT, 'b'), (T.ITALIC_END, ''), (T.TEXT, ' '),
+        (T.BOLD_START, ''), (T.TEXT, 'c'), (T.BOLD_END, ''), (T.TEXT, ' '),
+        (T.ITALIC_START, ''), (T.TEXT, 'd'), (T.ITALIC_END, ''),
+    ]
+    assert kinds("## Title")[0][0] == T.HEADING_START
+
+def test_lists_and_quotes():
+    assert kinds("- one\n2. two") == [
+        (T.LIST_ITEM_START, LIST_BULLET), (T.TEXT, 'one'), (T.LIST_ITEM_END, LIST_BULLET),
+        (T.NEWLINE, ''),
+        (T.LIST_ITEM_START, LIST_NUMBERED), (T.TEXT, 'two'), (T.LIST_ITEM_END, LIST_NUMBERED),
+    ]
+    assert kinds("> - quoted item") == [
+        (T.QUOTE_START, ''), (T.LIST_ITEM_START, LIST_BULLET), (T.TEXT, 'quoted item'),
+        (T.LIST_ITEM_END, LIST_BULLET), (T.QUOTE_END, ''),
+    ]
+    assert kinds("*not a list*")[0] == (T.ITALIC_START, '')
+    assert kinds("> > deep") == [(T.QUOTE_START, ''), (T.TEXT, 'deep'), (T.QUOTE_END, '')]
+    assert kinds(">" * 3000) == [(T.QUOTE_START, ''), (T.QUOTE_END, '')]
+
+def test_inline_code_is_literal():
+    assert kinds("run `a*b*c` now") == [
+        (T.TEXT, 'run '), (T.CODE_START, ''), (T.TEXT, 'a*b*c'), (T.CODE_END, ''), (T.TEXT, ' now'),
+    ]
+
+def test_links_and_strikethrough():
+    assert kinds("[the **site**](https://x.io/a_b) ~~old~~") == [
+        (T.LINK_START, 'https://x.io/a_b'), (T.TEXT, 'the '), (T.BOLD_START, ''), (T.TEXT, 'site'),
+        (T.BOLD_END, ''), (T.LINK_END, 'https://x.io/a_b'), (T.TEXT, ' '),
+        (T.STRIKE_START, ''), (T.TEXT, 'old'), (T.STRIKE_END, ''),
+    ]
+    assert MarkdownParser().get_plain_text_length("[site](https://x.io)") == 4
+    assert kinds("see [1](u)") == [(T.TEXT, 'see '), (T.LINK_START, 'u'), (T.TEXT, '1'), (T.LINK_END, 'u')]
+    assert kinds("[" * 5000 + "[a](u)")[-3:] == [(T.LINK_START, 'u'), (T.TEXT, 'a'), (T.LINK_END, 'u')]
+
+def plan_for(text):
+    typer = Typer(backend=RecordingBackend(), error_rate=0.0, seed=1)
+    return typer.plan(text)
+
+def chords(plan):
+    return [arg for op, arg in zip(plan.ops, plan.args) if op == OP_CHORD]
+
+def test_blocks_map_to_shortcuts():
+    plan = plan_for("- a\n- b\nplain\n> quote\nafter")
+    assert chords(plan) == [DOCS['bullet'], DOCS_OFF['bullet'], DOCS['quote'], DOCS_OFF['quote']]
+
+def test_strike_and_code_spans():
+    plan = plan_for("~~a~~ ~~b~~ `c`")
+    assert chords(plan).count(DOCS['strike']) == 4
+
+def test_link_selects_anchor_and_opens_link_dialog():
+    plan = plan_for("go [here](http://a.b) now")
+    assert chords(plan) == [('shift', 'left')] * 4 + [DOCS['link']]
+    typed = ''.join(arg for op, arg in zip(plan.ops, plan.args) if op == OP_TYPE)
+    assert typed == "go herehttp://a.b now"
+    assert [arg for op, arg in zip(plan.ops, plan.args) if op == OP_KEY] == ['enter', 'right']
+
+def test_plain_detection_is_conservative():
+    parser = MarkdownParser()
+    assert parser.is_plain("Just prose, with 3.5 numbers - and dashes.\n\nline 2 #tag")
+    for text in ("a *b*", "x_y", "~~s~~", "`c`", "[l](u)", "# h", "> q", "  - i", "1. n", "ok\n2) n"):
+        assert not parser.is_plain(text)
+    samples = ["- dash", "-dash", "1.5 m", "a # b", "\t+ plus", "12)x", "x > y", "#no space"]
+    for text in samples:
+        if parser.is_plain(text):
+            assert kinds(text) == [(T.TEXT, text)]
+
+def test_plain_fast_path_plans_like_the_parser():
+    text = "First line. Second sentence!\n\nThird line?\n"
+    fast = Typer(backend=RecordingBackend(), error_rate=0.1, seed=4)
+    slow = Typer(backend=RecordingBackend(), error_rate=0.1, seed=4)
+    slow.parser.is_plain = lambda text: False
+    plan, reference = fast.plan(text), slow.plan(text)
+    assert fast.parser.is_plain(text)
+    assert list(plan.ops) == list(reference.ops)
+    assert plan.args == reference.args
+    assert list(plan.delays) == list(reference.delays)
+    assert plan.total_chars == reference.total_chars == len(text)
@@ -0,0 +1,88 @@
+import asyncio
+import urllib.request
+
+from engine.typer import Typer
+from engine.backends import RecordingBackend, VirtualClock
+from engine.metrics import TypingMetrics, MetricsServer, TextFileExporter, render
+
+TEXT = "The quick brown fox jumps over the lazy dog. " * 4
+
+def samples(text):
+    values = {}
+    for line in text.splitlines():
+        if line and not line.startswith('#'):
+            name, value = line.rsplit(' ', 1)
+            values[name] = float(value)
+    return values
+
+def typed_session(metrics, **kwargs):
+    clock = VirtualClock()
+    typer = Typer(backend=RecordingBackend(clock=clock), seed=4, error_rate=0.1, wpm=60,
+                  metrics=metrics, **kwargs)
+    plan = typer.plan(TEXT)
+    assert typer.execute(plan, sleep=clock.sleep, clock=clock)
+    return plan
+
+def test_session_counters_and_rates():
+    metrics = TypingMetrics()
+    plan = typed_session(metrics)
+    values = samples(render(metrics))
+    assert values['texttyper_keystrokes_total'] == len(plan)
+    assert values['texttyper_characters_total'] == len(TEXT)
+    assert 0 < values['texttyper_errors_injected_total'] == len(plan.error_ops) < plan.args.count('backspace')
+    assert values['texttyper_sessions_total{outcome="completed"}'] == 1
+    assert values['texttyper_typing'] == 0
+    assert values['texttyper_target_wpm'] == 60
+    assert values['texttyper_achieved_wpm'] == len(TEXT) / 5 / (plan.duration() - plan.delays[0]) * 60
+    assert values['texttyper_scheduler_lateness_seconds_count'] == len(plan)
+    assert values['texttyper_scheduler_lateness_seconds_bucket{le="0.0005"}'] == len(plan)
+    typed_session(metrics)
+    values = samples(render(metrics))
+    assert values['texttyper_keystrokes_total'] == 2 * len(plan)
+    assert values['texttyper_sessions_total{outcome="completed"}'] == 2
+
+def test_lateness_and_cancellation_are_recorded():
+    metrics = TypingMetrics()
+    clock = VirtualClock()
+    typer = Typer(backend=RecordingBackend(clock=clock), seed=4, metrics=metrics)
+    plan = typer.plan(TEXT)
+
+    def late_sleep(seconds):
+        clock.sleep(seconds + 0.003)
+        if metrics.keystrokes == 10:
+            typer.cancel()
+
+    assert not typer.execute(plan, sleep=late_sleep, clock=clock)
+    values = samples(render(metrics))
+    assert values['texttyper_keystrokes_total'] == 11
+    assert values['texttyper_sessions_total{outcome="cancelled"}'] == 1
+    assert values['texttyper_scheduler_lateness_seconds_bucket{le="0.002"}'] == 1
+    assert values['texttyper_scheduler_lateness_seconds_bucket{le="0.005"}'] == 11
+
+def test_async_sessions_are_measured():
+    metrics = TypingMetrics()
+    typer = Typer(backend=RecordingBackend(), seed=4, wpm=3000, error_rate=0.0, metrics=metrics)
+
+    async def run():
+        return [update async for update in typer.type_markdown_async("async text")]
+
+    assert asyncio.run(run())[-1] == (10, 10)
+    values = samples(render(metrics))
+    assert values['texttyper_characters_total'] == 10
+    assert values['texttyper_sessions_total{outcome="completed"}'] == 1
+
+def test_http_endpoint_and_text_file(tmp_path):
+    metrics = TypingMetrics()
+    typed_session(metrics)
+    server = MetricsServer(metrics, port=0).start()
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics") as response:
+            assert response.headers['Content-Type'].startswith("text/plain; version=0.0.4")
+            scraped = response.read().decode()
+    finally:
+        server.close()
+    exporter = TextFileExporter(metrics, str(tmp_path / "texttyper.prom"), interval=60)
+    exporter.start()
+    exporter.close()
+    assert (tmp_path / "texttyper.prom").read_text() == scraped == render(metrics)
+    assert "# TYPE texttyper_scheduler_lateness_seconds histogram" in scraped
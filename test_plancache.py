@@ -0,0 +1,81 @@
+import os
+
+from engine.typer import Typer
+from engine.backends import RecordingBackend
+from engine.plancache import PlanCache, MappedPlan, plan_key
+
+TEXT = "# Notes\nSome **bold** and *italic* text, café — naïve.\n- item one\n- item two"
+
+def make_typer(cache, **kwargs):
+    kwargs.setdefault('seed', 9)
+    return Typer(backend=RecordingBackend(), plan_cache=cache, **kwargs)
+
+def replay(typer, plan):
+    typer.backend = RecordingBackend()
+    assert typer.execute(plan, sleep=lambda s: None)
+    return [event[:2] for event in typer.backend.events]
+
+def test_cached_plans_replay_identically(tmp_path):
+    cache = PlanCache(str(tmp_path))
+    typer = make_typer(cache)
+    planned = typer.plan(TEXT)
+    cached = make_typer(cache).plan(TEXT)
+    assert isinstance(cached, MappedPlan) and not isinstance(planned, MappedPlan)
+    assert list(cached.ops) == list(planned.ops)
+    assert cached.args == planned.args
+    assert list(cached.delays) == list(planned.delays)
+    assert list(cached.progress) == list(planned.progress)
+    assert cached.total_chars == planned.total_chars
+    assert replay(typer, cached) == replay(typer, planned)
+
+def test_keys_cover_text_settings_and_seed(tmp_path):
+    cache = PlanCache(str(tmp_path))
+    base = plan_key(make_typer(cache), TEXT)
+    assert plan_key(make_typer(cache), TEXT + ".") != base
+    assert plan_key(make_typer(cache, seed=10), TEXT) != base
+    assert plan_key(make_typer(cache, wpm=61), TEXT) != base
+    assert plan_key(make_typer(cache, target="word"), TEXT) != base
+    make_typer(cache, seed=None).plan(TEXT)
+    assert cache.entries() == []
+
+def test_estimates_use_cached_plans(tmp_path):
+    cache = PlanCache(str(tmp_path))
+    plan = make_typer(cache).plan(TEXT)
+    assert make_typer(cache).estimate_time(TEXT) == plan.duration()
+    assert make_typer(None).estimate_time(TEXT) != plan.duration()
+
+def test_least_recently_used_plans_are_evicted(tmp_path):
+    cache = PlanCache(str(tmp_path))
+    typer = make_typer(cache)
+    texts = [f"{TEXT} {n}" for n in range(3)]
+    for age, text in enumerate(texts):
+        typer.plan(text)
+        os.utime(cache._file(plan_key(typer, text)), (1000 + age, 1000 + age))
+    assert cache.get(plan_key(typer, texts[0])) is not None
+    size = os.path.getsize(cache._file(plan_key(typer, texts[0])))
+    cache.max_bytes = 3 * size
+    typer.plan(TEXT)
+    remaining = {path for _, _, path in cache.entries()}
+    assert cache._file(plan_key(typer, texts[1])) not in remaining
+    assert cache._file(plan_key(typer, texts[0])) in remaining
+    assert len(remaining) == 3
+
+def test_damaged_entries_are_misses(tmp_path):
+    cache = PlanCache(str(tmp_path))
+    typer = make_typer(cache)
+    typer.plan(TEXT)
+    path = cache._file(plan_key(typer, TEXT))
+    with open(path, 'r+b') as f:
+        f.truncate(os.path.getsize(path) - 1)
+    assert cache.get(plan_key(typer, TEXT)) is None
+    assert not isinstance(typer.plan(TEXT), MappedPlan)
+    assert isinstance(typer.plan(TEXT), MappedPlan)
+
+def test_unwritable_caches_are_silent_misses(tmp_path):
+    blocker = tmp_path / "home"
+    blocker.write_text("not a directory")
+    cache = PlanCache(str(blocker / "plans"))
+    typer = make_typer(cache)
+    assert replay(typer, typer.plan(TEXT)) == replay(make_typer(None), make_typer(None).plan(TEXT))
+    assert cache.get(plan_key(typer, TEXT)) is None
+    cache.evict()
@@ -0,0 +1,150 @@
+import pytest
+
+from engine.typer import Typer
+from engine.backends import RecordingBackend
+from engine.planner import OP_TYPE, OP_KEY, OP_CHORD, MODE_CHUNKED, CHUNK_LINE
+from engine.profiles import Profile
+
+TEXT = ("The quick brown fox jumps over the lazy dog. **Bold words** and *italic ones* here!\n" * 20
+        + "# Heading\nThe end.")
+
+def no_sleep(seconds):
+    pass
+
+def plain_text(typer, text):
+    return ''.join(
+        i.content if i.type.value == 'text' else '\n' if i.type.value == 'newline' else ''
+        for i in typer.parser.parse(text)
+    )
+
+def run(error_rate, seed):
+    backend = RecordingBackend()
+    typer = Typer(error_rate=error_rate, seed=seed, backend=backend)
+    plan = typer.plan(TEXT)
+    typer.execute(plan, sleep=no_sleep)
+    return typer, plan, backend
+
+def test_episodes_always_leave_the_intended_text():
+    for seed in range(10):
+        typer, plan, backend = run(0.15, seed)
+        assert backend.text == plain_text(typer, TEXT)
+
+def test_episodes_overrun_and_backspace_runs():
+    typer, plan, backend = run(0.2, 3)
+    runs = []
+    current = 0
+    for kind, arg, _ in backend.events:
+        if kind == 'tap' and arg == 'backspace':
+            current += 1
+        elif current:
+            runs.append(current)
+            current = 0
+    assert runs
+    assert max(runs) >= 2
+    assert max(runs) <= 5
+
+def test_plan_progress_and_duration():
+    typer, plan, backend = run(0.05, 1)
+    assert plan.total_chars == typer.parser.get_plain_text_length(TEXT)
+    assert list(plan.progress) == sorted(plan.progress)
+    assert plan.progress[-1] == plan.total_chars
+    assert abs(plan.duration() - sum(plan.delays)) < 1e-9
+    assert set(plan.ops) == {OP_TYPE, OP_KEY, OP_CHORD}
+
+def test_error_free_plan_has_no_backspaces():
+    typer, plan, backend = run(0.0, 2)
+    assert 'backspace' not in plan.args
+    typed = [arg for op, arg in zip(plan.ops, plan.args) if op == OP_TYPE]
+    assert ''.join(typed) == plain_text(typer, TEXT).replace('\n', '')
+
+def test_progress_callbacks_and_cancel():
+    backend = RecordingBackend()
+    typer = Typer(error_rate=0.0, seed=4, backend=backend)
+    seen = []
+    def on_progress(current, total):
+        seen.append(current)
+        if current == 10:
+            typer.cancel()
+    typer.on_progress = on_progress
+    assert not typer.execute(typer.plan("hello world and more"), sleep=no_sleep)
+    assert seen == list(range(1, 11))
+    assert backend.text == "hello worl"
+
+def test_chunked_mode_sends_words_and_respects_event_rate():
+    backend = RecordingBackend()
+    typer = Typer(backend=backend, mode=MODE_CHUNKED, max_events_per_second=500, error_rate=0.5)
+    plan = typer.plan(TEXT)
+    typer.execute(plan, sleep=no_sleep)
+    assert backend.text == plain_text(typer, TEXT)
+    typed = [arg for op, arg in zip(plan.ops, plan.args) if op == OP_TYPE]
+    assert 'quick ' in typed
+    assert 'backspace' not in plan.args
+    events = sum(1 if op == OP_KEY else len(arg) for op, arg in zip(plan.ops, plan.args))
+    last = 1 if plan.ops[-1] == OP_KEY else len(plan.args[-1])
+    assert plan.duration() >= (events - last) / 500 - 1e-9
+    assert ('cmd', 'b') in plan.args or ('ctrl', 'b') in plan.args
+
+def test_chunked_line_mode_with_jitter_reports_throughput():
+    backend = RecordingBackend()
+    typer = Typer(backend=backend, mode=MODE_CHUNKED, chunk=CHUNK_LINE,
+                  chunk_jitter=0.001, max_events_per_second=5000, seed=2)
+    text = "first line of text\nsecond line of text\nthird"
+    plan = typer.plan(text)
+    assert [arg for op, arg in zip(plan.ops, plan.args) if op == OP_TYPE] == [
+        "first line of text", "second line of text", "third"]
+    typer.execute(plan)
+    assert backend.text == text
+    assert 0 < typer.achieved_cps <= 5000
+
+def chords_for(text):
+    typer = Typer(backend=RecordingBackend(), error_rate=0.0, seed=1)
+    plan = typer.plan(text)
+    return plan, [(index, arg) for index, (op, arg) in enumerate(zip(plan.ops, plan.args)) if op == OP_CHORD]
+
+def test_adjacent_spans_share_formatting_state():
+    plan, chords = chords_for("**a** **b**")
+    assert len(chords) == 2
+    plan, chords = chords_for("**a****b** and *c* *d*")
+    assert len(chords) == 4
+
+def test_nested_toggles_are_batched():
+    plan, chords = chords_for("x **_a_** y")
+    assert len(chords) == 4
+    first, second = chords[0][0], chords[1][0]
+    assert second == first + 1
+    assert plan.delays[second] < 0.1
+
+def test_heading_size_is_reset_and_coalesced():
+    plan, chords = chords_for("# Title\nbody")
+    keys = [arg[-1] for _, arg in chords]
+    assert keys == ['.', '.', '.', ',', ',', ',']
+    plan, chords = chords_for("# One\n# Two\nbody")
+    assert len(chords) == 6
+
+def test_formatting_is_closed_at_end_of_document():
+    plan, chords = chords_for("plain **bold**")
+    assert len(chords) == 2
+    assert plan.ops[-1] == OP_CHORD
+
+def test_replanning_with_a_seed_is_reproducible():
+    typer = Typer(error_rate=0.1, seed=8, backend=RecordingBackend())
+    first, second = typer.plan(TEXT), typer.plan(TEXT)
+    assert list(first.delays) == list(second.delays)
+    assert first.args == second.args
+
+def test_non_positive_event_rates_are_rejected():
+    with pytest.raises(ValueError, match="max_events_per_second"):
+        Typer(backend=RecordingBackend(), max_events_per_second=0)
+    typer = Typer(backend=RecordingBackend())
+    with pytest.raises(ValueError, match="max_events_per_second"):
+        typer.apply_profile(Profile("bad", typer={'max_events_per_second': -5}))
+    assert typer.max_events_per_second > 0
+
+def test_error_episodes_are_marked_at_their_first_wrong_key():
+    typer = Typer(error_rate=0.1, seed=8, backend=RecordingBackend())
+    plan = typer.plan(TEXT)
+    runs = sum(1 for index, arg in enumerate(plan.args)
+               if arg == 'backspace' and plan.args[index - 1] != 'backspace')
+    assert len(plan.error_ops) == runs > 0
+    assert list(plan.error_ops) == sorted(plan.error_ops)
+    assert all(plan.ops[index] == OP_TYPE for index in plan.error_ops)
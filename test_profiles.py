@@ -0,0 +1,95 @@
+from engine.profiles import ProfileStore, Profile
+from engine.typer import Typer
+from engine.backends import RecordingBackend
+
+def test_store_persists_profiles_to_one_file(tmp_path):
+    path = tmp_path / "profiles.json"
+    store = ProfileStore(str(path))
+    store.update("fast", typer={'wpm': 180}, seed=42)
+    store.set_active("fast")
+
+    reloaded = ProfileStore(str(path))
+    assert reloaded._profiles is None
+    assert reloaded.active().name == "fast"
+    assert reloaded.active().typer['wpm'] == 180
+    assert reloaded.active().seed == 42
+    assert reloaded.names() == ["fast"]
+
+def test_revision_only_changes_on_real_updates(tmp_path):
+    store = ProfileStore(str(tmp_path / "profiles.json"))
+    profile = store.update("default", typer={'wpm': 90})
+    revision = profile.revision
+    store.update("default", typer={'wpm': 90})
+    assert profile.revision == revision
+    store.update("default", timing={'bigram_factors': {'th': 0.7}})
+    assert profile.revision == revision + 1
+
+def test_recreated_profiles_are_reapplied(tmp_path):
+    typer = Typer(backend=RecordingBackend())
+    store = ProfileStore(str(tmp_path / "profiles.json"))
+    assert typer.apply_profile(store.update("work", typer={'wpm': 90}))
+    store.delete("work")
+    recreated = store.update("work", typer={'wpm': 150})
+    assert typer.apply_profile(recreated)
+    assert typer.timing.wpm == 150
+    other = ProfileStore(str(tmp_path / "other.json")).update("work", typer={'wpm': 150})
+    assert not typer.apply_profile(other)
+
+def test_typer_switches_profiles_without_rebuilding():
+    typer = Typer(backend=RecordingBackend())
+    timing = typer.timing
+    slow = Profile("slow", typer={'wpm': 40, 'error_rate': 0.0}, seed=1)
+    fast = Profile("fast", typer={'wpm': 200}, timing={'bigram_factors': {'th': 0.5}})
+
+    assert typer.apply_profile(slow)
+    slow_estimate = typer.estimate_time("hello world. " * 20)
+    assert not typer.apply_profile(slow)
+    assert typer.estimate_time("hello world. " * 20) == slow_estimate
+
+    assert typer.apply_profile(fast)
+    assert typer.timing is timing
+    assert typer.timing.bigram_factors == {'th': 0.5}
+    assert typer.estimate_time("hello world. " * 20) < slow_estimate
+
+def test_seeded_profile_is_reproducible():
+    typer = Typer(backend=RecordingBackend())
+    typer.apply_profile(Profile("seeded", seed=5))
+    first = [typer.timing.get_keystroke_delay('a', 'b') for _ in range(20)]
+    typer.timing.reset()
+    second = [typer.timing.get_keystroke_delay('a', 'b') for _ in range(20)]
+    assert first == second
+
+def test_starting_a_run_keeps_imported_settings(tmp_path):
+    from main import TextTyperApp
+    from gui.unified_window import slider_settings
+    from engine.trainer import typer_settings
+
+    class SliderWindow:
+        def __init__(self, **callbacks):
+            self.sliders = (60, 3, 3.0, 4)
+
+        def after(self, delay, callback):
+            pass
+
+        def set_settings(self, settings):
+            self.sliders = (settings['wpm'], round(settings['error_rate'] * 100),
+                            settings['think_pause_max'], settings['burst_max'])
+
+        def get_settings(self):
+            return slider_settings(*self.sliders)
+
+    store = ProfileStore(str(tmp_path / "profiles.json"))
+    timing = {'wpm': 71.6, 'error_rate': 0.031, 'burst_mean': 260.0, 'burst_std': 40.0}
+    store.update("default", typer=dict(typer_settings(timing), think_pause_min=0.8), timing=timing)
+    fitted = dict(store.active().typer)
+
+    app = TextTyperApp(profiles=store, window_class=SliderWindow)
+    app.typer = Typer(backend=RecordingBackend())
+    app._on_start_typing("hello", app.window.get_settings())
+    app._on_stop()
+    assert ProfileStore(str(tmp_path / "profiles.json")).active().typer == fitted
+
+    app.window.sliders = (90,) + app.window.sliders[1:]
+    app._on_start_typing("hello", app.window.get_settings())
+    app._on_stop()
+    assert ProfileStore(str(tmp_path / "profiles.json")).active().typer == dict(fitted, wpm=90)
@@ -0,0 +1,46 @@
+from engine.typer import Typer
+from engine.backends import SlowConsumerBackend, VirtualClock
+from engine.rate import AdaptiveRateController
+
+TEXT = "Some **bold** words and *italic* words in a sentence. " * 20
+
+def run(make_controller, service_rate=200):
+    clock = VirtualClock()
+    backend = SlowConsumerBackend(service_rate=service_rate, capacity=20, clock=clock, sleep=clock.sleep)
+    controller = make_controller(backend)
+    typer = Typer(backend=backend, mode="chunked", max_events_per_second=1000,
+                  rate_controller=controller)
+    typer.execute(typer.plan(TEXT), sleep=clock.sleep, clock=clock)
+    assert backend.text == TEXT.replace('*', '')
+    return backend, controller
+
+def test_slow_consumer_misplaces_chords_without_control():
+    backend, _ = run(lambda backend: None)
+    assert backend.misplaced_chords == 80
+
+def test_latency_feedback_reduces_misplaced_chords():
+    backend, controller = run(lambda backend: AdaptiveRateController())
+    assert backend.misplaced_chords < 60
+    assert controller.settle_count > 0
+
+def test_probe_feedback_settles_before_every_chord():
+    backend, controller = run(lambda backend: AdaptiveRateController(probe=backend.backlog_seconds))
+    assert backend.misplaced_chords == 0
+
+def test_fast_consumer_is_not_slowed():
+    backend, controller = run(lambda backend: AdaptiveRateController(probe=backend.backlog_seconds),
+                              service_rate=100000)
+    assert controller.slowdown == 1.0
+    assert controller.settle_count == 0
+
+def test_controller_recovers_after_latency_drops():
+    controller = AdaptiveRateController()
+    for _ in range(20):
+        controller.observe(0.05)
+    assert controller.slowdown > 2
+    assert controller.wait_before(0.01) > 0.02
+    assert controller.wait_before(3.0) == 3.0
+    for _ in range(300):
+        controller.observe(0.0)
+    assert controller.slowdown == 1.0
+    assert controller.wait_before(0.01) == 0.01
@@ -0,0 +1,166 @@
+import random
+
+import pytest
+
+from config import DOCUMENT_END_KEYS, PARAGRAPH_UP_KEYS, SELECT_ALL_KEYS
+from engine.typer import Typer
+from engine.backends import RecordingBackend
+from engine.planner import OP_TYPE
+
+class EditorBackend(RecordingBackend):
+    def __init__(self):
+        super().__init__()
+        self.paragraphs = ['']
+        self.row = self.col = 0
+        self.selected_all = False
+
+    @property
+    def document(self):
+        return '\n'.join(self.paragraphs)
+
+    def _insert(self, char):
+        line = self.paragraphs[self.row]
+        if char == '\n':
+            self.paragraphs[self.row:self.row + 1] = [line[:self.col], line[self.col:]]
+            self.row, self.col = self.row + 1, 0
+        else:
+            self.paragraphs[self.row] = line[:self.col] + char + line[self.col:]
+            self.col += 1
+
+    def type(self, text):
+        super().type(text)
+        for char in text:
+            self._insert(char)
+
+    def tap(self, key):
+        super().tap(key)
+        if self.selected_all and key in ('delete', 'backspace'):
+            self.paragraphs, self.row, self.col = [''], 0, 0
+        elif key == 'enter':
+            self._insert('\n')
+        elif key == 'backspace':
+            self.tap('left')
+            self.tap('delete')
+        elif key == 'delete':
+            line = self.paragraphs[self.row]
+            if self.col < len(line):
+                self.paragraphs[self.row] = line[:self.col] + line[self.col + 1:]
+            elif self.row + 1 < len(self.paragraphs):
+                self.paragraphs[self.row:self.row + 2] = [line + self.paragraphs[self.row + 1]]
+        elif key == 'left':
+            if self.col:
+                self.col -= 1
+            elif self.row:
+                self.row -= 1
+                self.col = len(self.paragraphs[self.row])
+        elif key == 'right':
+            if self.col < len(self.paragraphs[self.row]):
+                self.col += 1
+            elif self.row + 1 < len(self.paragraphs):
+                self.row, self.col = self.row + 1, 0
+        elif key == 'up' and self.row:
+            self.row -= 1
+            self.col = min(self.col, len(self.paragraphs[self.row]))
+        self.selected_all = False
+
+    def chord(self, keys):
+        super().chord(keys)
+        self.selected_all = tuple(keys) == SELECT_ALL_KEYS
+        if tuple(keys) == DOCUMENT_END_KEYS:
+            self.row = len(self.paragraphs) - 1
+            self.col = len(self.paragraphs[self.row])
+        elif tuple(keys) == PARAGRAPH_UP_KEYS:
+            if self.col:
+                self.col = 0
+            elif self.row:
+                self.row -= 1
+
+def typed(target, markdown, previous=None, mode="human"):
+    typer = Typer(backend=EditorBackend(), seed=3, error_rate=0.05, target=target, mode=mode)
+    if previous is not None:
+        assert typer.execute(typer.plan(previous), sleep=lambda s: None)
+        assert typer.execute(typer.plan_revision(previous, markdown), sleep=lambda s: None)
+    else:
+        assert typer.execute(typer.plan(markdown), sleep=lambda s: None)
+    return typer.backend.document
+
+ORIGINAL = """# Release notes
+The parser is **much faster** now, and *plain* text skips it.
+
+- first item
+- second item
+> quoted remark
+Last line."""
+
+REVISIONS = [
+    ORIGINAL.replace("much faster", "much, much faster"),
+    ORIGINAL.replace("first item", "first item, revised").replace("Last line.", "Final line!"),
+    ORIGINAL.replace("\n\n", "\nA new paragraph.\n\n"),
+    ORIGINAL.replace("- second item\n", ""),
+    "Intro line.\n" + ORIGINAL,
+    ORIGINAL.replace("# Release notes\n", ""),
+    ORIGINAL + "\nAppended *line*.",
+    ORIGINAL.replace("*plain*", "plain"),
+    "Completely different.",
+    ORIGINAL,
+]
+
+@pytest.mark.parametrize("mode", ["human", "chunked"])
+@pytest.mark.parametrize("target", ["plain", "gdocs", "word"])
+@pytest.mark.parametrize("revised", REVISIONS)
+def test_revision_leaves_the_same_text_as_retyping(target, revised, mode):
+    assert typed(target, revised, previous=ORIGINAL, mode=mode) == typed(target, revised, mode=mode)
+
+def test_revision_of_literal_markup_target():
+    revised = ORIGINAL.replace("**much faster**", "**far faster**").replace("Last line.", "Last *line*.")
+    assert typed("slack", revised, previous=ORIGINAL) == typed("slack", revised)
+
+WORDS = ["alpha", "beta", "gamma", "delta", "x", "it's", "end."]
+STYLES = ("**{}**", "*{}*", "`{}`", "~~{}~~")
+BLOCKS = ("- ", "> ", "# ", "1. ")
+
+def random_paragraph(rng):
+    words = [rng.choice(STYLES).format(word) if rng.random() < 0.4 else word
+             for word in rng.choices(WORDS, k=rng.randint(0, 4))]
+    return (rng.choice(BLOCKS) if rng.random() < 0.4 else "") + " ".join(words)
+
+def random_revision(rng):
+    paragraphs = [random_paragraph(rng) for _ in range(rng.randint(1, 4))]
+    previous = "\n".join(paragraphs)
+    for _ in range(rng.randint(1, 3)):
+        index = rng.randrange(len(paragraphs))
+        edit = rng.random()
+        if edit < 0.3:
+            paragraphs[index] = random_paragraph(rng)
+        elif edit < 0.5:
+            paragraphs.insert(index, random_paragraph(rng))
+        elif edit < 0.7 and len(paragraphs) > 1:
+            del paragraphs[index]
+        else:
+            words = paragraphs[index].split(" ")
+            words[rng.randrange(len(words))] = rng.choice(WORDS)
+            paragraphs[index] = " ".join(words)
+    return previous, "\n".join(paragraphs)
+
+@pytest.mark.parametrize("target", ["plain", "gdocs", "word", "slack"])
+def test_random_revisions_leave_the_same_text_as_retyping(target):
+    rng = random.Random(target)
+    for _ in range(60):
+        previous, revised = random_revision(rng)
+        assert typed(target, revised, previous=previous) == typed(target, revised), (previous, revised)
+
+def test_small_revision_of_a_long_document_is_a_small_plan():
+    paragraphs = [f"Paragraph {i} says something **useful** about item {i}." for i in range(400)]
+    previous = "\n".join(paragraphs)
+    paragraphs[200] = paragraphs[200].replace("useful", "very useful")
+    paragraphs[350] = paragraphs[350].replace("item", "entry")
+    typer = Typer(backend=RecordingBackend(), seed=5, error_rate=0.0)
+    full = typer.plan("\n".join(paragraphs))
+    revision = typer.plan_revision(previous, "\n".join(paragraphs))
+    assert len(revision) * 20 < len(full)
+    assert revision.duration() * 20 < full.duration()
+    assert ''.join(arg for op, arg in zip(revision.ops, revision.args) if op == OP_TYPE) == "entryvery "
+
+def test_identical_documents_need_no_keystrokes():
+    typer = Typer(backend=RecordingBackend(), seed=1)
+    assert len(typer.plan_revision(ORIGINAL, ORIGINAL)) == 0
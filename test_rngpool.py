@@ -0,0 +1,27 @@
+from statistics import NormalDist, fmean, pstdev
+
+from engine.rngpool import PooledRandom
+
+def test_pooled_normals_match_the_standard_normal():
+    rng = PooledRandom(4, block=1000)
+    samples = sorted(rng.next_normal() for _ in range(50000))
+    assert abs(fmean(samples)) < 0.02
+    assert abs(pstdev(samples) - 1.0) < 0.02
+    normal = NormalDist()
+    for q in (0.01, 0.1, 0.5, 0.9, 0.99):
+        assert abs(samples[int(q * len(samples))] - normal.inv_cdf(q)) < 0.05
+
+def test_pools_are_reproducible_and_reset_on_seed():
+    first = PooledRandom(7, block=64)
+    draws = [(first.next_uniform(), first.gauss(1.0, 0.25)) for _ in range(200)]
+    second = PooledRandom(7, block=64)
+    assert [(second.next_uniform(), second.gauss(1.0, 0.25)) for _ in range(200)] == draws
+    second.seed(7)
+    assert [(second.next_uniform(), second.gauss(1.0, 0.25)) for _ in range(200)] == draws
+    assert 0.9 < fmean(g for _, g in draws) < 1.1
+
+def test_pooled_random_is_a_drop_in_generator():
+    rng = PooledRandom(1)
+    assert 2 <= rng.randint(2, 4) <= 4
+    assert 0.0 <= rng.uniform(0.0, 0.5) <= 0.5
+    assert rng.lognormvariate(0.0, 0.1) > 0
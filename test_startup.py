@@ -0,0 +1,15 @@
+import os
+import subprocess
+import sys
+
+from benchmarks import STARTUP_MODULE, STARTUP_DEFERRED
+
+def test_first_window_path_defers_heavy_imports():
+    result = subprocess.run([sys.executable, '-c', f'import sys, {STARTUP_MODULE}; print("\\n".join(sys.modules))'],
+                            capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    modules = result.stdout.split()
+    assert 'gui.unified_window' in modules
+    deferred = [name for name in modules
+                if any(name == module or name.startswith(module + '.') for module in STARTUP_DEFERRED)]
+    assert deferred == []
@@ -0,0 +1,45 @@
+import pytest
+
+from engine.typer import Typer
+from engine.backends import RecordingBackend, VirtualClock
+from engine.planner import OP_CHORD
+from engine.targets import WORD, get_target
+
+def run(text, target):
+    backend = RecordingBackend()
+    typer = Typer(backend=backend, error_rate=0.0, seed=3, target=target)
+    plan = typer.plan(text)
+    clock = VirtualClock()
+    typer.execute(plan, sleep=clock.sleep, clock=clock)
+    return plan, backend
+
+SAMPLE = "# Title\n**bold** and _it_ [link](http://a.b)\n- one\n- two\n> quoted"
+
+def test_plain_target_strips_formatting_and_its_pauses():
+    plain, backend = run(SAMPLE, "plain")
+    docs, _ = run(SAMPLE, "gdocs")
+    assert OP_CHORD not in plain.ops
+    assert backend.text == "Title\nbold and it link (http://a.b)\none\ntwo\nquoted"
+    assert plain.duration() < docs.duration()
+
+def test_slack_target_types_markdown_through():
+    plan, backend = run(SAMPLE, "slack")
+    assert OP_CHORD not in plan.ops
+    assert backend.text == "Title\n*bold* and _it_ link (http://a.b)\n- one\n- two\n> quoted"
+    assert plan.total_chars == len("Title\nbold and it link\none\ntwo\nquoted")
+
+def test_slack_markers_hug_their_text():
+    _, backend = run("**a** **b** - > `x y`", "slack")
+    assert backend.text == "*a* *b* - > `x y`"
+
+def test_word_target_uses_word_shortcuts():
+    plan, _ = run("- a\nb **c**", "word")
+    chords = [arg for op, arg in zip(plan.ops, plan.args) if op == OP_CHORD]
+    on, off = WORD.on_actions(), WORD.off_actions()
+    assert chords == [on['bullet'], off['bullet'], on['bold'], off['bold']]
+
+def test_unknown_target_is_rejected():
+    with pytest.raises(ValueError):
+        get_target("notepad++")
+    with pytest.raises(ValueError):
+        Typer(backend=RecordingBackend(), target="notepad++")
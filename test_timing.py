@@ -133,8 +133,10 @@ def plot_results():
 def test_burst_pattern():
     print("\n=== Testing Burst Pattern ===")
     from engine.typer import Typer
+    from engine.backends import RecordingBackend
+    from engine.boundaries import boundary_index, BOUNDARY_SENTENCE
     
-    typer = Typer(wpm=60, burst_min=2, burst_max=3, think_pause_min=2.0, think_pause_max=4.0)
+    typer = Typer(backend=RecordingBackend(), wpm=60, burst_min=2, burst_max=3, think_pause_min=2.0, think_pause_max=4.0)
     
     test_text = "First sentence here. Second sentence now. Third one coming. Fourth in line. Fifth appears. Sixth shows up. Seventh arrives. Eighth is here."
     
@@ -144,16 +146,21 @@ def test_burst_pattern():
     print(f"Burst settings: {typer.burst_min}-{typer.burst_max} sentences")
     print(f"Think pause: {typer.timing.think_pause_min}-{typer.timing.think_pause_max}s")
     
+    boundaries = boundary_index(test_text)
+    assert sorted(boundaries.values()) == [BOUNDARY_SENTENCE] * 8
+    
     sentence_count = 0
-    for i, char in enumerate(test_text):
-        if char in '.!?':
-            sentence_count += 1
-            should_pause = typer._should_burst_pause(test_text[:i+1])
-            if should_pause:
-                pause = typer.timing.get_think_pause()
-                print(f"  Sentence {sentence_count}: PAUSE for {pause:.2f}s")
-            else:
-                print(f"  Sentence {sentence_count}: continue typing")
+    pauses = 0
+    for offset in sorted(boundaries):
+        sentence_count += 1
+        should_pause = typer._burst_due(sentence_count)
+        if should_pause:
+            pauses += 1
+            pause = typer.timing.get_think_pause()
+            print(f"  Sentence {sentence_count}: PAUSE for {pause:.2f}s")
+        else:
+            print(f"  Sentence {sentence_count}: continue typing")
+    assert 3 <= pauses <= 4
 
 if __name__ == "__main__":
     test_burst_pattern()
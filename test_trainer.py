@@ -0,0 +1,102 @@
+import os
+import random
+
+from engine.recorder import (
+    KeystrokeLogWriter, KeystrokeRecorder, iter_log_chunks, log_size,
+    SESSION_BREAK, KEY_BACKSPACE
+)
+from engine.trainer import ProfileTrainer, LogHistogram, save_timing_profile, load_timing_profile, typer_settings
+from engine.timing import TimingEngine
+
+def write_synthetic_log(path, words=400, seed=7):
+    rng = random.Random(seed)
+    writer = KeystrokeLogWriter(path)
+    writer.append(ord('t'), SESSION_BREAK)
+    text = "the quick brown fox jumps over the lazy dog. " * (words // 9)
+    for i, char in enumerate(text[1:], 1):
+        if char == 'h' and text[i - 1] == 't':
+            delta = 0.06
+        else:
+            delta = rng.uniform(0.11, 0.13)
+        if char == '.':
+            writer.append(ord(char), int(delta * 1_000_000))
+            writer.append(ord(' '), int(rng.uniform(1.5, 2.5) * 1_000_000))
+            continue
+        if i % 50 == 0:
+            writer.append(ord('x'), int(delta * 1_000_000))
+            writer.append(KEY_BACKSPACE, int(0.2 * 1_000_000))
+        writer.append(ord(char), int(delta * 1_000_000))
+    writer.close()
+    return text
+
+def test_log_roundtrip_in_chunks(tmp_path):
+    path = tmp_path / "keys.log"
+    write_synthetic_log(path)
+    chunks = list(iter_log_chunks(path, chunk_records=100))
+    assert all(len(chunk) <= 100 for chunk in chunks)
+    assert sum(len(chunk) for chunk in chunks) == log_size(path)
+    assert chunks[0][0] == (SESSION_BREAK, ord('t'))
+
+def test_trainer_fits_bigrams_pauses_and_errors(tmp_path):
+    path = tmp_path / "keys.log"
+    write_synthetic_log(path)
+    profile = ProfileTrainer(min_bigram_count=5).train_file(path, chunk_records=64)
+
+    assert profile['bigram_factors']['th'] < 0.7
+    assert 0.9 < profile['bigram_factors']['ui'] < 1.2
+    quantiles = profile['think_pause_quantiles']
+    assert len(quantiles) == 11
+    assert 1.3 < quantiles[5] < 2.7
+    assert 0.0 < profile['error_rate'] < 0.05
+    assert 30 < profile['burst_mean'] < 60
+
+    settings = typer_settings(profile)
+    assert 90 < settings['wpm'] < 120
+    assert 0.0 < settings['error_rate'] < profile['error_rate']
+    assert settings['burst_min'] == 1 and settings['burst_max'] >= 1
+
+def test_chunk_size_does_not_change_profile(tmp_path):
+    path = tmp_path / "keys.log"
+    write_synthetic_log(path)
+    small = ProfileTrainer().train_file(path, chunk_records=7)
+    large = ProfileTrainer().train_file(path, chunk_records=100000)
+    assert small == large
+
+def test_recorder_appends_sessions(tmp_path):
+    path = tmp_path / "keys.log"
+    for _ in range(2):
+        recorder = KeystrokeRecorder(path)
+        for i, char in enumerate("abc"):
+            recorder.record(ord(char), timestamp=10.0 + i * 0.1)
+        recorder.stop()
+    records = [r for chunk in iter_log_chunks(path) for r in chunk]
+    assert len(records) == 6
+    assert records[0][0] == SESSION_BREAK and records[3][0] == SESSION_BREAK
+    assert abs(records[1][0] - 100_000) < 10
+    if os.name == 'posix':
+        assert os.stat(path).st_mode & 0o777 == 0o600
+
+def test_histogram_quantiles_are_monotonic():
+    hist = LogHistogram(1.0, 30.0)
+    for i in range(1000):
+        hist.add(1.0 + (i % 100) / 10)
+    quantiles = hist.quantiles([0.1, 0.5, 0.9])
+    assert quantiles == sorted(quantiles)
+    assert 5.0 < quantiles[1] < 7.0
+
+def test_timing_engine_uses_profile(tmp_path):
+    profile_path = tmp_path / "profile.json"
+    save_timing_profile({
+        'format': 1,
+        'bigram_factors': {'ab': 0.5},
+        'think_pause_quantiles': [2.0, 2.5, 3.0],
+    }, profile_path)
+    timing = TimingEngine(wpm=60, seed=3)
+    timing.load_profile(load_timing_profile(profile_path))
+    for _ in range(100):
+        assert 2.0 <= timing.get_think_pause() <= 3.0
+
+    fast = sum(timing.get_keystroke_delay('a', 'b') for _ in range(300))
+    timing.reset()
+    slow = sum(timing.get_keystroke_delay('c', 'd') for _ in range(300))
+    assert fast < slow * 0.7
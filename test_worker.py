@@ -0,0 +1,74 @@
+import threading
+import time
+
+import pytest
+
+from engine.worker import ProcessTyper, BACKEND_RECORDING
+from engine.profiles import Profile
+
+def test_child_process_types_and_reports_progress():
+    typer = ProcessTyper(backend=BACKEND_RECORDING, rate_control=False)
+    try:
+        typer.apply_profile(Profile("fast", typer={'wpm': 400, 'error_rate': 0.0}, seed=5))
+        updates, completions = [], []
+        typer.on_progress = lambda current, total: updates.append((current, total))
+        typer.on_complete = lambda: completions.append(True)
+        assert typer.type_markdown("Hi **there**")
+        assert updates[-1] == (8, 8)
+        assert completions == [True]
+        assert ''.join(event[1] for event in typer.events if event[0] == 'type') == "Hi there"
+        assert typer.achieved_cps > 0
+    finally:
+        typer.close()
+    assert not typer.process.is_alive()
+
+def test_child_process_pauses_and_cancels():
+    typer = ProcessTyper(backend=BACKEND_RECORDING, rate_control=False)
+    try:
+        typer.apply_profile(Profile("fast", typer={'wpm': 400, 'error_rate': 0.0}, seed=5))
+        updates = []
+        typer.on_progress = lambda current, total: updates.append(current)
+        result = []
+        thread = threading.Thread(target=lambda: result.append(typer.type_markdown("word " * 200)))
+        thread.start()
+        while not updates:
+            time.sleep(0.01)
+        typer.pause()
+        time.sleep(0.1)
+        paused_at = len(updates)
+        time.sleep(0.3)
+        assert len(updates) <= paused_at + 1
+        typer.cancel()
+        thread.join(timeout=5)
+        assert result == [False]
+        assert updates[-1] < 1000
+    finally:
+        typer.close()
+
+def test_failed_jobs_report_errors_and_dead_children_fail_fast():
+    typer = ProcessTyper(backend=BACKEND_RECORDING, rate_control=False)
+    good = Profile("fast", typer={'wpm': 400, 'error_rate': 0.0, 'mode': 'human', 'max_events_per_second': 1000},
+                   seed=5)
+    try:
+        typer.apply_profile(good)
+        assert typer.type_markdown("one")
+        broken = Profile("broken", typer={'mode': 'chunked', 'max_events_per_second': 0})
+        with pytest.raises(ValueError, match="max_events_per_second must be positive"):
+            typer.apply_profile(broken)
+        assert typer.profile is good
+        typer.profile = broken
+        assert not typer.type_markdown("two")
+        assert "ValueError: max_events_per_second must be positive" in typer.error
+        typer.apply_profile(good)
+        assert typer.type_markdown("three")
+
+        typer.process.terminate()
+        typer.process.join(timeout=5)
+        result = []
+        thread = threading.Thread(target=lambda: result.append(typer.type_markdown("four")))
+        thread.start()
+        thread.join(timeout=5)
+        assert result == [False]
+        assert not typer.is_alive()
+    finally:
+        typer.close()